@@ -1,20 +1,352 @@
+import argparse
 import pandas as pd
 from scrapers.google_maps_scraper import GoogleMapsScraper
+from utils.driver_pool import DriverPool
+from utils.metrics import get_metrics, metric_labels
+from utils.place_index import PlaceIndex
+from utils.rate_limiter import DEFAULT_LIMITS, HostRateLimiter, parse_limit, set_rate_limiter
+from utils.arrow_output import ParquetResultSink
+from utils.change_set import CHANGE_COLUMNS, ChangeSet
+from utils.cleaning import clean_results
+from utils.geo_tiles import Tile, city_tiles, merge_tiles
+from utils.result_sink import CsvResultSink
+from utils.retry import RetryPolicies, RetryPolicy, get_retry_policies, parse_policy, set_retry_policies
+from utils.run_journal import DONE, EMPTY, FAILED, RunJournal
+from utils.snapshot_store import SnapshotStore
 import time
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, as_completed, wait
+from multiprocessing.util import Finalize
 from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
 import os
 
-def batch_scrape_bakeries(input_file: str = "in.csv") -> None:
+# Schema of the combined output file
+BATCH_COLUMNS = GoogleMapsScraper.COLUMNS + ["Source City", "Scrape Date"]
+
+# Schema of the delta-mode change-set file
+CHANGES_COLUMNS = CHANGE_COLUMNS + ["Source City"]
+
+# Query for a whole city; also the change-set scope shared by the city's tiles
+CITY_QUERY = "Bakeries in {city}"
+
+# Tiles search this query within their own viewport, so the city name is left out
+TILE_QUERY = "Bakeries"
+
+# Per-process driver pool, snapshot settings and place index used by parallel workers
+_worker_pool: Optional[DriverPool] = None
+_worker_snapshots: Optional[SnapshotStore] = None
+_worker_replay = False
+_worker_index: Optional[PlaceIndex] = None
+_worker_delta = False
+
+
+def _init_worker(
+    rate_limiter: HostRateLimiter,
+    snapshot_store: Optional[SnapshotStore],
+    replay: bool,
+    index_path: Optional[str] = None,
+    index_max_age: float = 7,
+    delta: bool = False,
+    retry_policies: Optional[RetryPolicies] = None
+) -> None:
+    """Give each worker process its own browser, quit when the process exits."""
+    global _worker_pool, _worker_snapshots, _worker_replay, _worker_index, _worker_delta
+    # Share the parent's token buckets so limits hold across all workers
+    set_rate_limiter(rate_limiter)
+    if retry_policies is not None:
+        set_retry_policies(retry_policies)
+    _worker_pool = DriverPool(GoogleMapsScraper.create_driver, size=1)
+    _worker_snapshots = snapshot_store
+    _worker_replay = replay
+    _worker_delta = delta
+    Finalize(None, _worker_pool.close, exitpriority=10)
+
+    # SQLite connections cannot be shared across processes; each worker opens its own
+    if index_path:
+        _worker_index = PlaceIndex(index_path, index_max_age)
+        Finalize(None, _worker_index.close, exitpriority=10)
+
+
+def scrape_city(
+    city: str,
+    driver_pool: Optional[DriverPool] = None,
+    snapshot_store: Optional[SnapshotStore] = None,
+    replay: bool = False,
+    place_index: Optional[PlaceIndex] = None,
+    delta: bool = False
+) -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame]]:
+    """
+    Scrape bakeries for a single city.
+
+    Args:
+        city: City name from the input file
+        driver_pool: Pool to borrow the browser from
+        snapshot_store: Store to record page snapshots into, or replay from
+        replay: Re-extract from recorded snapshots instead of scraping live
+        place_index: Cross-run index of known places whose details are reused
+        delta: Compare with the place index and return the change-set
+
+    Returns:
+        Results tagged with source city and scrape date (None if empty), and
+        the city's change-set in delta mode (None otherwise)
+    """
+    # Initialize scraper
+    scraper = GoogleMapsScraper(
+        driver_pool=driver_pool, snapshot_store=snapshot_store, place_index=place_index, delta=delta and not replay
+    )
+
+    # Construct search query
+    search_query = CITY_QUERY.format(city=city)
+
+    # Scrape data, timing every stage under this city
+    with metric_labels(city=city), get_metrics().span("city"):
+        if replay:
+            print(f"Replaying snapshots for: {search_query}")
+            df = scraper.replay(search_query)
+        else:
+            print(f"Scraping data for: {search_query}")
+            df = scraper.scrape(search_query)
+
+    changes = scraper.changes
+    if changes is not None:
+        changes['Source City'] = city
+
+    if df is None or df.empty:
+        return None, changes
+
+    # Add city column and timestamp
+    df['Source City'] = city
+    df['Scrape Date'] = pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
+    return df, changes
+
+
+def _scrape_city_worker(
+    city: str
+) -> Tuple[str, Optional[pd.DataFrame], Optional[pd.DataFrame], Optional[str], Dict]:
+    """Process pool entry point; returns errors instead of raising them, plus the city's timings."""
+    try:
+        df, changes = scrape_city(city, _worker_pool, _worker_snapshots, _worker_replay, _worker_index, _worker_delta)
+        error = None
+    except Exception as e:
+        df, changes, error = None, None, str(e)
+    return city, df, changes, error, get_metrics().drain()
+
+
+def scrape_tile(
+    city: str,
+    tile: Tile,
+    driver_pool: Optional[DriverPool] = None,
+    snapshot_store: Optional[SnapshotStore] = None,
+    place_index: Optional[PlaceIndex] = None,
+    delta: bool = False,
+    skip_keys: Optional[Set[str]] = None
+) -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame], Set[str], bool]:
+    """
+    Scrape bakeries within one map tile of a city.
+
+    In delta mode the tile shares the city's change-set scope, which
+    scrape_city_tiled closes once every tile is in.
+
+    Args:
+        skip_keys: Place keys already collected by other tiles of the city
+
+    Returns:
+        Results (None if empty), the tile's added and changed places in
+        delta mode, the keys of the places it returned, and whether the
+        tile's feed hit the result cap
+    """
+    scraper = GoogleMapsScraper(
+        driver_pool=driver_pool, snapshot_store=snapshot_store, place_index=place_index, delta=delta
+    )
+    viewport = tile.viewport()
+    with metric_labels(city=city, tile=scraper.viewport_key(TILE_QUERY, viewport)), get_metrics().span("tile"):
+        print(f"Scraping tile {scraper.viewport_key(TILE_QUERY, viewport)} of {city}")
+        df = scraper.scrape(
+            TILE_QUERY, viewport=viewport, change_scope=CITY_QUERY.format(city=city), skip_keys=skip_keys
+        )
+    return (None if df is None or df.empty else df), scraper.changes, scraper.place_keys, scraper.saturated
+
+
+def _scrape_tile_worker(
+    city: str,
+    tile: Tile,
+    skip_keys: Set[str],
+    attempt: int = 1
+) -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame], Set[str], bool, Optional[str], Dict]:
+    """Process pool entry point for a tile; returns errors instead of raising them."""
+    try:
+        if attempt > 1:
+            time.sleep(get_retry_policies().delay("tile", attempt - 1))
+        df, changes, keys, saturated = scrape_tile(
+            city, tile, _worker_pool, _worker_snapshots, _worker_index, _worker_delta, skip_keys
+        )
+        error = None
+    except Exception as e:
+        df, changes, keys, saturated, error = None, None, set(), False, str(e)
+    return df, changes, keys, saturated, error, get_metrics().drain()
+
+
+def scrape_city_tiled(
+    city: str,
+    lat: float,
+    lng: float,
+    population: float,
+    executor: Executor,
+    place_index: Optional[PlaceIndex] = None
+) -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame]]:
+    """
+    Scrape a city tile by tile, splitting tiles whose feed hit the result cap.
+
+    Tiles run in parallel on ``executor``; a capped tile is replaced by its
+    four quadrants until tiles are small enough, and the results of all
+    tiles are merged with duplicates removed. Tiles started after others
+    finished skip the places already collected, so a split tile's quadrants
+    do not open the same detail panels again. A failed tile is re-run under
+    the 'tile' retry policy.
+
+    Args:
+        city: City name from the input file
+        lat: City centre latitude
+        lng: City centre longitude
+        population: City population, used to size the initial grid
+        executor: Process pool set up with _init_worker
+        place_index: Index to close the city's change-set in, in delta mode;
+            places seen by any tile are never reported as removed
+
+    Returns:
+        Merged results tagged with source city and scrape date (None if
+        empty), and the city's change-set in delta mode
+
+    Raises:
+        RuntimeError: If a tile still failed after its retries; the city
+            is then left incomplete, for the batch's retry pass
+    """
+    tiles = city_tiles(lat, lng, population)
+    print(f"Split {city} into {len(tiles)} tiles of {tiles[0].span_km:.1f} km")
+    change_set = None
+    if place_index is not None:
+        change_set = ChangeSet(
+            place_index, GoogleMapsScraper.SOURCE, CITY_QUERY.format(city=city),
+            GoogleMapsScraper.DELTA_FIELDS, GoogleMapsScraper.NAME_FIELD
+        )
+
+    # Keys of the places collected so far, handed to every tile started from now on
+    collected: Set[str] = set()
+    attempts = get_retry_policies().get("tile").attempts
+    pending: Dict = {}
+
+    def submit(tile: Tile, attempt: int = 1) -> None:
+        pending[executor.submit(_scrape_tile_worker, city, tile, set(collected), attempt)] = (tile, attempt)
+
+    for tile in tiles:
+        submit(tile)
+    frames, errors = [], []
+    scraped = subdivided = retried = 0
+    truncated = False
+
+    while pending:
+        finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in finished:
+            tile, attempt = pending.pop(future)
+            try:
+                df, changes, keys, saturated, error, worker_metrics = future.result()
+                get_metrics().merge(worker_metrics)
+            except Exception as e:
+                df, changes, keys, saturated, error = None, None, set(), False, str(e)
+
+            if error is not None:
+                print(f"Error scraping tile {tile.viewport()} of {city} (attempt {attempt}/{attempts}): {error}")
+                if attempt < attempts:
+                    retried += 1
+                    submit(tile, attempt + 1)
+                else:
+                    errors.append(error)
+                continue
+            scraped += 1
+            frames.append(df)
+            collected.update(keys)
+            if change_set is not None and changes is not None:
+                change_set.merge(changes, keys)
+            if saturated:
+                if tile.can_subdivide():
+                    subdivided += 1
+                    for child in tile.subdivide():
+                        submit(child)
+                else:
+                    truncated = True
+
+    print(f"Scraped {scraped} tiles of {city} ({subdivided} split for hitting the result cap, "
+          f"{retried} re-run, {len(errors)} failed)")
+    if errors:
+        # The city's results and change-set would be missing whole tiles, so it is not done
+        raise RuntimeError(f"{len(errors)} of {scraped + len(errors)} tiles failed, e.g. {errors[0]}")
+
+    changes = None
+    if change_set is not None:
+        # A tile still capped at the smallest size did not list all of its places
+        changes = change_set.finish(complete=bool(collected) and not truncated)
+        changes['Source City'] = city
+
+    df = merge_tiles(frames)
+    if df.empty:
+        return None, changes
+
+    df['Source City'] = city
+    df['Scrape Date'] = pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
+    return df, changes
+
+
+def batch_scrape_bakeries(
+    input_file: str = "in.csv",
+    workers: int = 1,
+    rate_limits: Optional[Dict[str, Tuple[float, float]]] = None,
+    resume: Optional[str] = None,
+    output_format: str = "csv",
+    snapshot_dir: Optional[str] = None,
+    replay: bool = False,
+    index_path: Optional[str] = None,
+    index_max_age: float = 7,
+    delta: bool = False,
+    tiles: bool = False,
+    retry_policies: Optional[Dict[str, RetryPolicy]] = None
+) -> None:
     """
     Scrape bakery data for multiple cities from CSV file and combine results.
-    
+
     Args:
         input_file: Path to CSV file containing city names (defaults to 'in.csv')
+        workers: Number of worker processes, each driving its own browser
+        rate_limits: Per-host (requests per second, burst) overriding the defaults
+        resume: Journal of an earlier run; its completed cities are skipped
+            and its failed cities retried
+        output_format: 'csv' for one combined CSV, or 'parquet' for a typed
+            dataset partitioned by source, city and date
+        snapshot_dir: Record page snapshots here (or replay from here)
+        replay: Re-extract every city from recorded snapshots, without a browser
+        index_path: SQLite place index shared across runs; places fetched
+            within ``index_max_age`` days skip the detail panel
+        index_max_age: Days after which an indexed place is fetched again
+        delta: Only open panels of new or changed places and write the
+            added, changed and removed places to changes_<timestamp>.csv
+        tiles: Split each city into map tiles from its lat/lng/population
+            columns, scraping tiles in parallel to get past the result cap
+        retry_policies: Retry policies by operation overriding the defaults;
+            the 'city' policy sets how often failed cities are re-run at the end
     """
+    if delta and not index_path:
+        print("Delta mode needs --index DB to compare against")
+        return
+    if tiles and replay:
+        print("Tiled runs cannot be replayed; replay a single tile's query instead")
+        return
+
     # Read cities from CSV
     try:
         cities_df = pd.read_csv(input_file)
         cities = cities_df['city'].dropna().unique()  # Using 'city' column from your CSV
+        if tiles:
+            # Tiling needs each city's centre, and its population as a density hint
+            city_rows = cities_df.drop_duplicates('city').set_index('city')[['lat', 'lng', 'population']]
     except Exception as e:
         print(f"Error reading input file: {str(e)}")
         return
@@ -22,74 +354,269 @@ def batch_scrape_bakeries(input_file: str = "in.csv") -> None:
     # Create output directory
     output_dir = Path("scraped_results")
     output_dir.mkdir(exist_ok=True)
-    
-    all_results = []
-    failed_cities = []
-    
-    # Process each city
-    total_cities = len(cities)
-    for i, city in enumerate(cities, 1):
-        print(f"\nProcessing {i}/{total_cities}: {city}")
-        
-        try:
-            # Initialize scraper
-            scraper = GoogleMapsScraper()
-            
-            # Construct search query
-            search_query = f"Bakeries in {city}"
-            
-            # Scrape data
-            print(f"Scraping data for: {search_query}")
-            df = scraper.scrape(search_query)
-            
-            if df is not None and not df.empty:
-                # Add city column and timestamp
-                df['Source City'] = city
-                df['Scrape Date'] = pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
-                
+
+    # Every city outcome is journaled so an interrupted run can be resumed
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    if resume:
+        journal = RunJournal(resume)
+        print(f"Resuming run from {journal.path}")
+    else:
+        journal = RunJournal(output_dir / f"run_{timestamp}.jsonl")
+    print(f"Run journal: {journal.path} (resume with --resume {journal.path})")
+
+    # Results stream into the combined output as cities finish, one city in memory at a time
+    if output_format == "parquet":
+        # Partitioned by the run's start date, so cities re-written on resume replace their files
+        sink = ParquetResultSink(output_dir / "parquet", "google_maps", date=journal.run_date)
+    else:
+        sink = CsvResultSink(output_dir / f"all_bakeries_{timestamp}.csv", BATCH_COLUMNS)
+
+    # Delta runs also write the places added, changed or removed since the last run
+    change_sink = CsvResultSink(output_dir / f"changes_{timestamp}.csv", CHANGES_COLUMNS) if delta else None
+
+    skipped = [city for city in cities if journal.is_complete(city)]
+    if skipped:
+        print(f"Skipping {len(skipped)} cities completed in an earlier attempt")
+        for city_file in journal.completed_files():
+            sink.write(clean_results(pd.read_csv(city_file), "google_maps"))
+    cities = [city for city in cities if not journal.is_complete(city)]
+
+    # Snapshots let extraction changes be re-run offline against recorded pages
+    snapshot_store = SnapshotStore(snapshot_dir) if snapshot_dir else None
+    if replay and snapshot_store is None:
+        print("Replay needs --snapshots DIR")
+        return
+    if snapshot_store is not None and not replay:
+        print(f"Evicted {snapshot_store.evict()} expired snapshots")
+
+    # Requests to each site are paced by one limiter shared with every worker
+    rate_limiter = HostRateLimiter(rate_limits)
+    set_rate_limiter(rate_limiter)
+
+    # Stage timings from this process and every worker end up in one report
+    metrics = get_metrics()
+
+    # Backoff policies are configured here and handed to every worker
+    retry = RetryPolicies(retry_policies)
+    set_retry_policies(retry)
+
+    def run_pass(pass_cities: List[str]) -> List[str]:
+        """Scrape ``pass_cities`` with fresh browsers; return the cities that failed."""
+        failed = []
+        pass_total = len(pass_cities)
+
+        def handle_result(
+            i: int,
+            city: str,
+            df: Optional[pd.DataFrame],
+            changes: Optional[pd.DataFrame],
+            error: Optional[str]
+        ) -> None:
+            """Save a finished city's results or record it as failed."""
+            print(f"\nFinished {i}/{pass_total}: {city}")
+            if change_sink is not None and changes is not None:
+                change_sink.write(changes)
+            if error is not None:
+                print(f"Error processing {city}: {error}")
+                journal.record(city, FAILED, error=error)
+                failed.append(city)
+            elif df is not None:
                 # Save individual city results
-                city_file = output_dir / f"bakeries_{city.replace(' ', '_')}.csv"
-                df.to_csv(city_file, index=False)
+                with metric_labels(city=city), metrics.span("write"):
+                    city_file = output_dir / f"bakeries_{city.replace(' ', '_')}.csv"
+                    df.to_csv(city_file, index=False)
+                    sink.write(df)
                 print(f"Saved results for {city}: {len(df)} bakeries")
-                
-                # Add to combined results
-                all_results.append(df)
+                journal.record(city, DONE, output_file=city_file, rows=len(df))
             else:
                 print(f"No results found for {city}")
-                failed_cities.append(city)
-                
-        except Exception as e:
-            print(f"Error processing {city}: {str(e)}")
-            failed_cities.append(city)
-        
-        # Add delay between cities to avoid rate limiting
-        time.sleep(5)
-        
-    # Combine all results
-    if all_results:
-        combined_df = pd.concat(all_results, ignore_index=True)
-        
-        # Save combined results with timestamp
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
-        combined_file = output_dir / f"all_bakeries_{timestamp}.csv"
-        combined_df.to_csv(combined_file, index=False)
-        
+                journal.record(city, EMPTY)
+
+        if tiles:
+            # Cities run one after another; each city's tiles share the worker processes
+            print(f"Scraping {pass_total} cities tile by tile with {workers} workers")
+            # Delta runs close each city's change-set here, after all of its tiles
+            place_index = PlaceIndex(index_path, index_max_age) if delta else None
+            try:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=(rate_limiter, snapshot_store, replay,
+                                                   index_path, index_max_age, delta, retry)) as executor:
+                    for i, city in enumerate(pass_cities, 1):
+                        print(f"\nProcessing {i}/{pass_total}: {city}")
+                        row = city_rows.loc[city]
+                        try:
+                            with metric_labels(city=city), metrics.span("city"):
+                                df, changes = scrape_city_tiled(
+                                    city, float(row['lat']), float(row['lng']), float(row['population']),
+                                    executor, place_index
+                                )
+                            error = None
+                        except Exception as e:
+                            df, changes, error = None, None, str(e)
+                        handle_result(i, city, df, changes, error)
+            finally:
+                if place_index is not None:
+                    place_index.close()
+        elif workers > 1:
+            # Each worker process owns one browser; cities are handed out as workers free up
+            print(f"Scraping {pass_total} cities with {workers} workers")
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(rate_limiter, snapshot_store, replay,
+                                               index_path, index_max_age, delta, retry)) as executor:
+                futures = {executor.submit(_scrape_city_worker, city): city for city in pass_cities}
+                for i, future in enumerate(as_completed(futures), 1):
+                    try:
+                        city, df, changes, error, worker_metrics = future.result()
+                        metrics.merge(worker_metrics)
+                    except Exception as e:
+                        city, df, changes, error = futures[future], None, None, str(e)
+                    handle_result(i, city, df, changes, error)
+        else:
+            # One warmed browser is reused for every city instead of a cold start each
+            driver_pool = DriverPool(GoogleMapsScraper.create_driver, size=1)
+            place_index = PlaceIndex(index_path, index_max_age) if index_path else None
+
+            # Process each city; the browser and index are closed even if the run is interrupted
+            try:
+                for i, city in enumerate(pass_cities, 1):
+                    print(f"\nProcessing {i}/{pass_total}: {city}")
+                    try:
+                        df, changes = scrape_city(city, driver_pool, snapshot_store, replay, place_index, delta)
+                        error = None
+                    except Exception as e:
+                        df, changes, error = None, None, str(e)
+                    handle_result(i, city, df, changes, error)
+            finally:
+                driver_pool.close()
+                if place_index is not None:
+                    place_index.close()
+        return failed
+
+    # Failed cities are deferred to the end of the run and re-run with fresh browsers,
+    # after a backoff that gives a blocked or flaky site time to recover
+    deferred = run_pass(list(cities))
+    attempts = retry.get("city").attempts
+    for attempt in range(1, attempts):
+        if not deferred:
+            break
+        delay = retry.delay("city", attempt)
+        print(f"\nRetrying {len(deferred)} failed cities in {delay:.0f}s (attempt {attempt + 1}/{attempts})")
+        time.sleep(delay)
+        deferred = run_pass(deferred)
+
+    # Per-stage timing histograms for tuning and latency alerts
+    metrics_file = metrics.write_json(output_dir / f"metrics_{timestamp}.json")
+    metrics.write_prometheus(output_dir / f"metrics_{timestamp}.prom")
+    print(f"Stage timings saved to: {metrics_file} (Prometheus format: {metrics_file.with_suffix('.prom')})")
+
+    if change_sink is not None:
+        if change_sink.rows:
+            print(f"Changes since the last run ({change_sink.rows}) saved to: {change_sink.finalize()}")
+        else:
+            change_sink.discard()
+            print("No changes since the last run")
+
+    # Outcomes across this and earlier attempts come from the journal
+    failed_cities = journal.unfinished_cities()
+    total_cities = len(journal.entries)
+    if sink.rows:
+        combined_file = sink.finalize()
+
         # Save failed cities list if any
         if failed_cities:
             failed_file = output_dir / f"failed_cities_{timestamp}.txt"
             with open(failed_file, 'w') as f:
                 f.write('\n'.join(failed_cities))
-        
+
         print(f"\nProcessing complete!")
         print(f"Total cities processed: {total_cities}")
         print(f"Successful cities: {total_cities - len(failed_cities)}")
         print(f"Failed cities: {len(failed_cities)}")
-        print(f"Total bakeries found: {len(combined_df)}")
+        print(f"Total bakeries found: {sink.rows}")
         print(f"Results saved to: {combined_file}")
         if failed_cities:
             print(f"Failed cities saved to: {failed_file}")
     else:
+        sink.discard()
         print("\nNo results found for any city")
 
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line options for batch runs."""
+    parser = argparse.ArgumentParser(description="Scrape Google Maps bakeries for every city in a CSV file.")
+    parser.add_argument("input_file", nargs="?", default="in.csv", help="CSV file with a 'city' column")
+    parser.add_argument(
+        "-w", "--workers", type=int, default=1,
+        help="Number of parallel worker processes, each with its own browser"
+    )
+    parser.add_argument(
+        "--rate", action="append", default=[], metavar="HOST=RPS[:BURST]",
+        help="Override a site's rate limit, e.g. google.com=1.5:5 (repeatable)"
+    )
+    parser.add_argument(
+        "--resume", metavar="JOURNAL",
+        help="Resume an interrupted run from its journal, retrying failed cities"
+    )
+    parser.add_argument(
+        "--format", choices=["csv", "parquet"], default="csv", dest="output_format",
+        help="Combined output: one CSV, or a Parquet dataset partitioned by source/city/date"
+    )
+    parser.add_argument(
+        "--snapshots", metavar="DIR", dest="snapshot_dir",
+        help="Record compressed HTML snapshots of result feeds and detail panels in DIR"
+    )
+    parser.add_argument(
+        "--replay", action="store_true",
+        help="Re-run extraction from the snapshots in --snapshots DIR without a browser"
+    )
+    parser.add_argument(
+        "--index", metavar="DB", dest="index_path",
+        help="SQLite index of places scraped by earlier runs; known places reuse their details"
+    )
+    parser.add_argument(
+        "--index-max-age", type=float, default=7, metavar="DAYS",
+        help="Re-fetch details of indexed places older than this (default: 7)"
+    )
+    parser.add_argument(
+        "--delta", action="store_true",
+        help="Only open new or changed places (needs --index) and write a change-set of "
+             "added, changed and removed places"
+    )
+    parser.add_argument(
+        "--tiles", action="store_true",
+        help="Split each city into map tiles using the lat, lng and population columns, "
+             "subdividing tiles that hit Google's ~120 result cap"
+    )
+    parser.add_argument(
+        "--retry", action="append", default=[], metavar="OP=ATTEMPTS[:INITIAL[:MAX]]",
+        help="Override a retry policy, e.g. search=5:2:30 or city=3 (repeatable); operations: "
+             "driver_start, search, details, navigation, city, tile"
+    )
+    return parser.parse_args()
+
+
+def _rate_limits_from_args(specs: List[str]) -> Optional[Dict[str, Tuple[float, float]]]:
+    """Merge command line rate overrides into the default limits."""
+    if not specs:
+        return None
+    limits = dict(DEFAULT_LIMITS)
+    limits.update(parse_limit(spec) for spec in specs)
+    return limits
+
+
 if __name__ == "__main__":
-    batch_scrape_bakeries()
\ No newline at end of file
+    args = parse_args()
+    batch_scrape_bakeries(
+        args.input_file,
+        workers=args.workers,
+        rate_limits=_rate_limits_from_args(args.rate),
+        resume=args.resume,
+        output_format=args.output_format,
+        snapshot_dir=args.snapshot_dir,
+        replay=args.replay,
+        index_path=args.index_path,
+        index_max_age=args.index_max_age,
+        delta=args.delta,
+        tiles=args.tiles,
+        retry_policies=dict(parse_policy(spec) for spec in args.retry) or None
+    )
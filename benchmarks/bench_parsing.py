@@ -0,0 +1,301 @@
+"""Offline benchmarks for the parsing and cleaning hot paths.
+
+Runs each scraper's extraction code against the committed HTML fixtures and
+the vectorized ``utils.cleaning`` functions, plus the row-wise cleaners they
+replaced, against realistic raw values, reporting throughput
+and peak memory allocated per run. Scraper methods are timed unwrapped, so
+the ``@timed`` metrics spans around them are not part of the measurement.
+
+Timings only mean something on the machine that took them, so the baseline
+is not committed: record one locally before a change, then compare after it.
+Regressions beyond the tolerance fail the run.
+
+    python -m benchmarks.bench_parsing --save-baseline  # record a local baseline
+    python -m benchmarks.bench_parsing                  # compare with it
+"""
+import argparse
+import inspect
+import json
+import random
+import re
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+from scrapers.google_maps_scraper import GoogleMapsScraper
+from scrapers.justdial_scraper import JustDialScraper
+from scrapers.zomato_scraper import ZomatoBakeryScraper
+from utils import cleaning
+
+BENCH_DIR = Path(__file__).parent
+FIXTURES_DIR = BENCH_DIR / "fixtures"
+BASELINE_FILE = BENCH_DIR / "baseline.json"
+
+# A benchmark case returns the function to time and how many items one call processes
+Case = Callable[[], Tuple[Callable[[], object], int]]
+
+
+def _fixture(name: str) -> str:
+    return (FIXTURES_DIR / name).read_text(encoding="utf-8")
+
+
+def _unwrapped(method: Callable) -> Callable:
+    """Strip the ``@timed``/``@retried`` wrappers so only the parsing code is timed."""
+    return inspect.unwrap(method)
+
+
+def _fragments(fixture: str, selector: str) -> List[str]:
+    """Split a fixture into the per-item HTML the scrapers receive."""
+    soup = BeautifulSoup(_fixture(fixture), "lxml")
+    return [str(tag) for tag in soup.select(selector)]
+
+
+def _raw_values() -> Dict[str, List[str]]:
+    """Raw strings in the shapes the sites return, including missing values."""
+    rng = random.Random(7)
+    size = 20000
+    return {
+        "rating": [rng.choice([f"{rng.uniform(1, 5):.1f}", "N/A", "NEW"]) for _ in range(size)],
+        "rating_count": [rng.choice([f"({rng.randint(1, 50000):,})", "N/A"]) for _ in range(size)],
+        "cost": [rng.choice([f"₹{rng.randint(1, 40) * 50:,} for two", "N/A"]) for _ in range(size)],
+        "justdial_rating": [rng.choice([f"{rng.uniform(1, 5):.1f}/5", "N/A"]) for _ in range(size)],
+        "phone": [f"+91 {rng.randint(70000, 99999)} {rng.randint(10000, 99999)}" for _ in range(size)],
+    }
+
+
+def google_basic_info() -> Tuple[Callable[[], object], int]:
+    scraper = GoogleMapsScraper()
+    extract = _unwrapped(GoogleMapsScraper._extract_basic_info)
+    cards = _fragments("google_maps_feed.html", "div.Nv2PK")
+    return lambda: [extract(scraper, BeautifulSoup(card, "lxml")) for card in cards], len(cards)
+
+
+def google_panel_info() -> Tuple[Callable[[], object], int]:
+    extract = _unwrapped(GoogleMapsScraper._extract_panel_info)
+    panels = _fragments("google_maps_panels.html", "div[role='main']")
+    return lambda: [extract(BeautifulSoup(panel, "lxml")) for panel in panels], len(panels)
+
+
+def justdial_store_details() -> Tuple[Callable[[], object], int]:
+    scraper = JustDialScraper()
+    extract = _unwrapped(JustDialScraper.extract_stores_from_html)
+    html = _fixture("justdial_page.html")
+    return lambda: extract(scraper, html), len(extract(scraper, html))
+
+
+def zomato_listing_info() -> Tuple[Callable[[], object], int]:
+    extract = _unwrapped(ZomatoBakeryScraper._parse_listings_html)
+    html = _fixture("zomato_listings.html")
+
+    def run():
+        # Fresh scraper each call so name dedup does not skip listings
+        return extract(ZomatoBakeryScraper("bench"), html)
+
+    return run, len(run())
+
+
+# Row-wise cleaners the scrapers applied value by value before utils.cleaning;
+# kept here only as the reference the vectorized cleaners are measured against
+
+
+def _google_rating(rating: str) -> Optional[float]:
+    try:
+        return float(rating)
+    except (ValueError, TypeError):
+        return None
+
+
+def _digits_count(count: str) -> Optional[int]:
+    """Rating count as all of its digits, as both Google Maps and JustDial did."""
+    try:
+        return int(''.join(filter(str.isdigit, count)))
+    except (ValueError, TypeError):
+        return None
+
+
+def _zomato_cost(cost: str) -> Optional[int]:
+    if pd.isna(cost) or cost == 'N/A':
+        return None
+    try:
+        cleaned = re.sub(r'[^\d,]', '', str(cost))
+        return int(cleaned.replace(',', ''))
+    except (ValueError, TypeError):
+        return None
+
+
+def _zomato_rating(rating: str) -> Optional[float]:
+    if pd.isna(rating) or rating == 'N/A':
+        return None
+    try:
+        return float(rating)
+    except ValueError:
+        return None
+
+
+def _zomato_price_category(cost: Optional[float]) -> str:
+    if pd.isna(cost):
+        return cleaning.PRICE_NOT_AVAILABLE
+    for min_cost, max_cost, category in cleaning.PRICE_RANGES:
+        if min_cost <= cost < max_cost:
+            return category
+    return cleaning.PRICE_NOT_AVAILABLE
+
+
+def _justdial_rating(rating: str) -> Optional[float]:
+    try:
+        return float(rating.replace('/5', '').strip())
+    except (ValueError, AttributeError):
+        return None
+
+
+def _cleaner(function: Callable, key: str) -> Case:
+    def case() -> Tuple[Callable[[], object], int]:
+        values = _raw_values()[key]
+        return lambda: [function(value) for value in values], len(values)
+    case.__name__ = function.__name__
+    return case
+
+
+def _vectorized(function: Callable, key: str) -> Case:
+    def case() -> Tuple[Callable[[], object], int]:
+        values = pd.Series(_raw_values()[key])
+        return lambda: function(values), len(values)
+    case.__name__ = function.__name__
+    return case
+
+
+def categorize_price() -> Tuple[Callable[[], object], int]:
+    costs = cleaning.clean_cost(pd.Series(_raw_values()["cost"]))
+    return lambda: cleaning.categorize_price(costs), len(costs)
+
+
+def zomato_categorize_price() -> Tuple[Callable[[], object], int]:
+    costs = [_zomato_cost(value) for value in _raw_values()["cost"]]
+    return lambda: [_zomato_price_category(cost) for cost in costs], len(costs)
+
+
+BENCHMARKS: Dict[str, Case] = {
+    "google_maps.extract_basic_info": google_basic_info,
+    "google_maps.extract_panel_info": google_panel_info,
+    "justdial.extract_store_details": justdial_store_details,
+    "zomato.extract_listing_info": zomato_listing_info,
+    "google_maps.clean_rating": _cleaner(_google_rating, "rating"),
+    "google_maps.clean_rating_count": _cleaner(_digits_count, "rating_count"),
+    "zomato.clean_cost": _cleaner(_zomato_cost, "cost"),
+    "zomato.clean_rating": _cleaner(_zomato_rating, "rating"),
+    "zomato.categorize_price": zomato_categorize_price,
+    "justdial.clean_rating": _cleaner(_justdial_rating, "justdial_rating"),
+    "justdial.clean_rating_count": _cleaner(_digits_count, "rating_count"),
+    "justdial.clean_phone": _cleaner(JustDialScraper._clean_phone, "phone"),
+    "cleaning.clean_rating": _vectorized(cleaning.clean_rating, "justdial_rating"),
+    "cleaning.clean_count": _vectorized(cleaning.clean_count, "rating_count"),
+    "cleaning.clean_cost": _vectorized(cleaning.clean_cost, "cost"),
+    "cleaning.clean_phone": _vectorized(cleaning.clean_phone, "phone"),
+    "cleaning.categorize_price": categorize_price,
+}
+
+
+def measure(function: Callable[[], object], items: int, min_time: float, repeat: int) -> Dict[str, float]:
+    """
+    Time a benchmark function and measure its peak allocations.
+
+    Args:
+        function: Zero-argument callable processing ``items`` items
+        items: Items processed per call
+        min_time: Minimum seconds per timing round
+        repeat: Timing rounds; the fastest is reported
+
+    Returns:
+        Dictionary with items_per_sec, usec_per_item and peak_kb
+    """
+    function()  # Warm up caches and imports
+
+    best = float("inf")
+    for _ in range(repeat):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            function()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = min(best, elapsed / calls)
+
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "items_per_sec": round(items / best, 1),
+        "usec_per_item": round(best / items * 1e6, 3),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float) -> List[str]:
+    """Return the names of benchmarks slower than the baseline by more than ``tolerance``."""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference and result["items_per_sec"] < reference["items_per_sec"] * (1 - tolerance):
+            regressions.append(name)
+    return regressions
+
+
+def main() -> int:
+    """Run the benchmarks and report results against the baseline."""
+    parser = argparse.ArgumentParser(description="Benchmark parsing and cleaning hot paths offline.")
+    parser.add_argument("-k", "--filter", default="", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Minimum seconds per timing round")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing rounds per benchmark")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before flagging a regression")
+    parser.add_argument("--save-baseline", action="store_true", help=f"Write results to {BASELINE_FILE.name} (not committed)")
+    parser.add_argument("--json", metavar="FILE", help="Also write results as JSON")
+    args = parser.parse_args()
+
+    baseline = json.loads(BASELINE_FILE.read_text()) if BASELINE_FILE.exists() else {}
+    results = {}
+
+    print(f"{'benchmark':36} {'items/s':>12} {'us/item':>10} {'peak KB':>10} {'vs base':>8}")
+    for name, case in BENCHMARKS.items():
+        if args.filter not in name:
+            continue
+        function, items = case()
+        result = measure(function, items, args.min_time, args.repeat)
+        results[name] = result
+
+        reference = baseline.get(name)
+        change = f"{result['items_per_sec'] / reference['items_per_sec'] - 1:+.0%}" if reference else "new"
+        print(
+            f"{name:36} {result['items_per_sec']:>12,.0f} {result['usec_per_item']:>10.2f} "
+            f"{result['peak_kb']:>10,.0f} {change:>8}"
+        )
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+    if args.save_baseline:
+        BASELINE_FILE.write_text(json.dumps({**baseline, **results}, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline saved to {BASELINE_FILE}")
+        return 0
+
+    if not baseline:
+        print(f"\nNo local baseline yet; run with --save-baseline to record one in {BASELINE_FILE}")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\nRegressions beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
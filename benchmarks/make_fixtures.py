@@ -0,0 +1,156 @@
+"""Generate the HTML fixtures used by the parsing benchmarks.
+
+The markup mirrors the structure the scrapers parse on Google Maps, Zomato
+and JustDial (class names, nesting and typical surrounding noise). Output is
+deterministic, so regenerating only changes the fixtures when this file does.
+
+    python -m benchmarks.make_fixtures
+"""
+import random
+from pathlib import Path
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+WORDS = [
+    "Bake", "House", "Cake", "Studio", "Oven", "Fresh", "Golden", "Crust",
+    "Sweet", "Corner", "Patisserie", "Bread", "Co", "Cafe", "Delight", "Royal",
+]
+AREAS = [
+    "Connaught Place", "Bandra West", "Koramangala", "Salt Lake", "Banjara Hills",
+    "Anna Nagar", "Kothrud", "Navrangpura", "Civil Lines", "Sector 18",
+]
+CATEGORIES = ["Bakery", "Cake shop", "Pastry shop", "Dessert shop", "Cafe"]
+
+
+def _name(rng: random.Random) -> str:
+    return " ".join(rng.sample(WORDS, rng.randint(2, 3)))
+
+
+def _google_card(rng: random.Random, index: int) -> str:
+    name = f"{_name(rng)} {index}"
+    rating = f"{rng.uniform(3.0, 5.0):.1f}"
+    count = f"({rng.randint(1, 25000):,})"
+    return f"""
+<div class="Nv2PK THOPZb CpccDe" jsaction="mouseover:pane.wfvdle{index}">
+  <a class="hfpxzc" aria-label="{name}" href="https://www.google.com/maps/place/{index}"></a>
+  <div class="bfdHYd Ppzolf OFBs3e">
+    <div class="rgMKMc"></div>
+    <div class="lI9IFe">
+      <div class="y7PRA">
+        <div class="Lui3Od T7Wufd">
+          <div class="Z8fK3b">
+            <div class="UaQhfb fontBodyMedium">
+              <div class="NrDZNb"><div class="qBF1Pd fontHeadlineSmall">{name}</div></div>
+              <div class="W4Efsd">
+                <div class="AJB7ye">
+                  <span class="e4rVHe fontBodyMedium">
+                    <span role="img" class="ZkP5Je" aria-label="{rating} stars">
+                      <span class="MW4etd" aria-hidden="true">{rating}</span>
+                      <span class="UY7F9" aria-hidden="true">{count}</span>
+                    </span>
+                  </span>
+                </div>
+              </div>
+              <div class="W4Efsd">
+                <div class="W4Efsd">
+                  <span><span>{rng.choice(CATEGORIES)}</span></span>
+                  <span><span aria-hidden="true">·</span><span>{rng.randint(1, 300)}, {rng.choice(AREAS)}</span></span>
+                </div>
+                <div class="W4Efsd">
+                  <span><span><span style="font-weight: 400; color: rgba(25,134,57,1.00);">Open</span>
+                  <span style="font-weight: 400;"> ⋅ Closes 10 pm</span></span></span>
+                </div>
+              </div>
+            </div>
+          </div>
+        </div>
+      </div>
+    </div>
+  </div>
+</div>"""
+
+
+def _google_panel(rng: random.Random) -> str:
+    rows = "".join(
+        f'<button class="CsEnBe" data-item-id="{item}"><div class="AeaXub">'
+        f'<div class="rogA2c"><div class="Io6YTe fontBodyMedium kR99db">{value}</div></div></div></button>'
+        for item, value in [
+            ("address", f"{rng.randint(1, 300)}, {rng.choice(AREAS)}, New Delhi, Delhi 110001"),
+            ("oloc", "8FWM+2X New Delhi"),
+            ("authority", "example.com"),
+            (f"phone:tel:0{rng.randint(1000000000, 9999999999)}", f"0{rng.randint(100, 999)} {rng.randint(1000000, 9999999)}"),
+        ]
+    )
+    return f"""<div role="main" aria-label="Bakery">
+  <div class="m6QErb DxyBCb kA9KIf dS8AEf XiKgde">
+    <h1 class="DUwDvf lfPIob">{_name(rng)}</h1>
+    <div class="m6QErb XiKgde" role="region">{rows}</div>
+  </div>
+</div>"""
+
+
+def _zomato_listing(rng: random.Random, index: int) -> str:
+    return f"""
+<div class="sc-evWYkj kBCXlp">
+  <a href="/city/restaurant-{index}" class="sc-hPeUyl kLNkEv">
+    <div class="sc-s1isp7-1 dUTpYN"><img alt="" src="data:," class="sc-s1isp7-5 fyZwWD"></div>
+  </a>
+  <div class="sc-gbGnuv bcfzTH">
+    <a href="/city/restaurant-{index}" class="sc-fFFvbw jMEkkN"><h4 class="sc-1hp8d8a-0 sc-jlZJtj hGIeUl">{_name(rng)} {index}</h4></a>
+    <div class="sc-1q7bklc-5 kHxpSk"><div class="sc-1q7bklc-2 kQSBcM">
+      <div class="sc-1q7bklc-1 cILgox">{rng.uniform(3.0, 4.9):.1f}</div>
+    </div></div>
+  </div>
+  <div class="sc-ebrWHo fDHEBk">
+    <p class="sc-1hez2tp-0 sc-hrWEMg uIMEk">{rng.choice(AREAS)}</p>
+    <p class="sc-1hez2tp-0 sc-hrWEMg KXcjT">&#8377;{rng.choice([150, 250, 300, 400, 600, 900, 1200, 1800]):,} for two</p>
+  </div>
+</div>"""
+
+
+def _justdial_store(rng: random.Random, index: int) -> str:
+    return f"""
+<div class="store-details">
+  <div class="col-sm-5 col-xs-8 sp-detail paddingR0">
+    <h2 class="store-name"><span class="lng_cont_name"><a class="nlogo lazy store-name" href="/x-{index}">{_name(rng)} {index}</a></span></h2>
+    <p class="newrtings">
+      <span class="green-box">{rng.uniform(3.0, 5.0):.1f}</span>
+      <span class="star_m"><span class="s10"></span><span class="s10"></span><span class="s10"></span></span>
+      <span class="rt_count lng_vote">{rng.randint(1, 5000)} Ratings</span>
+    </p>
+    <p class="contact-info"><span><a>+91 {rng.randint(7000000000, 9999999999)}</a></span></p>
+    <p class="address-info tme_adrssec">
+      <span class="cont_fl_addr">{rng.randint(1, 300)}, {rng.choice(AREAS)}, Delhi</span>
+    </p>
+  </div>
+</div>"""
+
+
+def _page(body: str) -> str:
+    return f"<!DOCTYPE html><html><head><title>Fixture</title></head><body>{body}</body></html>"
+
+
+def main() -> None:
+    """Write all benchmark fixtures."""
+    rng = random.Random(20250403)
+    FIXTURES_DIR.mkdir(exist_ok=True)
+
+    cards = "".join(_google_card(rng, i) for i in range(300))
+    (FIXTURES_DIR / "google_maps_feed.html").write_text(
+        _page(f'<div role="feed" aria-label="Results">{cards}</div>'), encoding="utf-8"
+    )
+    (FIXTURES_DIR / "google_maps_panels.html").write_text(
+        _page("".join(_google_panel(rng) for _ in range(100))), encoding="utf-8"
+    )
+    (FIXTURES_DIR / "zomato_listings.html").write_text(
+        _page("".join(_zomato_listing(rng, i) for i in range(300))), encoding="utf-8"
+    )
+    (FIXTURES_DIR / "justdial_page.html").write_text(
+        _page('<div class="jsx-results">' + "".join(_justdial_store(rng, i) for i in range(200)) + "</div>"),
+        encoding="utf-8"
+    )
+    print(f"Fixtures written to {FIXTURES_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,419 @@
+import argparse
+import os
+import socket
+import time
+from multiprocessing import Process
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+from batch_scraper import BATCH_COLUMNS, CHANGES_COLUMNS, _rate_limits_from_args, scrape_city
+from scrapers.google_maps_scraper import GoogleMapsScraper
+from utils.arrow_output import ParquetResultSink
+from utils.cleaning import clean_results
+from utils.driver_pool import DriverPool
+from utils.metrics import get_metrics
+from utils.place_index import PlaceIndex
+from utils.rate_limiter import HostRateLimiter, set_rate_limiter
+from utils.result_sink import CsvResultSink
+from utils.retry import RetryPolicies, RetryPolicy, get_retry_policies, parse_policy, set_retry_policies
+from utils.snapshot_store import SnapshotStore
+from utils.work_queue import DONE, FAILED, LEASED, QUEUED, LeaseKeeper, WorkQueue, open_queue
+
+# Seconds a lease stays valid without a heartbeat; a crashed worker's city is retried after this
+VISIBILITY_TIMEOUT = 300.0
+
+# Seconds between queue checks of idle workers and of the coordinator
+POLL_INTERVAL = 5.0
+
+
+def default_results_dir(queue_path: str) -> Path:
+    """Directory next to the queue file where workers write per-city results."""
+    path = Path(queue_path)
+    return path.with_name(f"{path.stem}_results")
+
+
+def _city_file(city: str, prefix: str) -> str:
+    return f"{prefix}_{city.replace(' ', '_').replace('/', '_')}.csv"
+
+
+def run_worker(
+    queue_path: str,
+    backend: Optional[str] = None,
+    results_dir: Optional[str] = None,
+    visibility_timeout: float = VISIBILITY_TIMEOUT,
+    poll_interval: float = POLL_INTERVAL,
+    snapshot_dir: Optional[str] = None,
+    replay: bool = False,
+    index_path: Optional[str] = None,
+    index_max_age: float = 7,
+    delta: bool = False,
+    shared_index: bool = False,
+    rate_limiter: Optional[HostRateLimiter] = None,
+    retry_policies: Optional[RetryPolicies] = None
+) -> None:
+    """
+    Lease cities from a shared queue and scrape them until the queue is drained.
+
+    Each city is scraped with one warmed browser while a heartbeat keeps
+    its lease alive. Results go to ``<city>.csv`` files in the shared
+    results directory, and only their file names are stored in the queue,
+    so nodes may mount the shared storage at different paths. Failed cities
+    are handed back with the 'city' retry backoff for any worker to retry.
+
+    Any worker may scrape any city, so delta mode needs one place index
+    shared by every node: with an index per node, each city would be
+    compared against whichever history its worker happens to hold.
+
+    Args:
+        queue_path: Queue file on shared storage
+        backend: Queue backend name (see open_queue)
+        results_dir: Shared directory for per-city results (default: next to the queue)
+        visibility_timeout: Seconds a lease survives without a heartbeat
+        poll_interval: Seconds to wait when no city is available
+        snapshot_dir: Record page snapshots here (or replay from here)
+        replay: Re-extract cities from recorded snapshots, without a browser
+        index_path: Place index; places fetched recently skip the detail panel
+        index_max_age: Days after which an indexed place is fetched again
+        delta: Also write each city's change-set (needs a shared index)
+        shared_index: ``index_path`` is on storage shared by all nodes; it is
+            opened without WAL, which is unsafe on network filesystems
+        rate_limiter: Limiter shared with other workers on this node
+        retry_policies: Retry policies to use instead of the defaults
+    """
+    if delta and not (index_path and shared_index):
+        raise ValueError("Distributed delta mode needs one place index shared by all nodes (shared_index)")
+    worker = f"{socket.gethostname()}-{os.getpid()}"
+    output_dir = Path(results_dir) if results_dir else default_results_dir(queue_path)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Rate limits hold per node; every node paces its own requests
+    set_rate_limiter(rate_limiter or HostRateLimiter())
+    if retry_policies is not None:
+        set_retry_policies(retry_policies)
+    retry = get_retry_policies()
+
+    queue = open_queue(queue_path, backend)
+    driver_pool = DriverPool(GoogleMapsScraper.create_driver, size=1)
+    snapshot_store = SnapshotStore(snapshot_dir) if snapshot_dir else None
+    place_index = PlaceIndex(index_path, index_max_age, wal=not shared_index) if index_path else None
+    print(f"Worker {worker} leasing cities from {queue_path}")
+
+    try:
+        while True:
+            item = queue.lease(worker, visibility_timeout)
+            if item is None:
+                counts = queue.counts()
+                # Leased cities may still come back if their worker dies, so wait them out
+                if sum(counts.values()) and not counts[QUEUED] + counts[LEASED]:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            city = item.payload["city"]
+            print(f"\n{worker} processing {city} (attempt {item.attempt})")
+            with LeaseKeeper(queue, item, visibility_timeout) as keeper:
+                try:
+                    df, changes = scrape_city(city, driver_pool, snapshot_store, replay, place_index, delta)
+                    error = None
+                except Exception as e:
+                    df, changes, error = None, None, str(e)
+            if keeper.lost:
+                print(f"Lease on {city} expired and was taken over; dropping this attempt")
+                continue
+            if error is not None:
+                print(f"Error processing {city}: {error}")
+                queue.fail(item, error, delay=retry.delay("city", item.attempt))
+                continue
+
+            result = {"worker": worker, "file": None, "rows": 0, "changes_file": None}
+            if df is not None:
+                result["file"] = _city_file(city, "bakeries")
+                df.to_csv(output_dir / result["file"], index=False)
+                result["rows"] = len(df)
+            if changes is not None:
+                result["changes_file"] = _city_file(city, "changes")
+                changes.to_csv(output_dir / result["changes_file"], index=False)
+            if queue.complete(item, result):
+                print(f"Saved results for {city}: {result['rows']} bakeries")
+            else:
+                print(f"Lease on {city} was lost before completing; another worker owns it")
+    finally:
+        driver_pool.close()
+        if place_index is not None:
+            place_index.close()
+        queue.close()
+        # Each worker reports its own stage timings next to the results
+        metrics_file = get_metrics().write_json(output_dir / f"metrics_{worker}.json")
+        print(f"Worker {worker} finished; stage timings saved to: {metrics_file}")
+
+
+def wait_for_queue(queue: WorkQueue, poll_interval: float = POLL_INTERVAL) -> Dict[str, int]:
+    """Print progress until no city is queued or leased; return the final counts."""
+    last = None
+    while True:
+        counts = queue.counts()
+        if counts != last:
+            print(
+                f"Queue: {counts[DONE]} done, {counts[FAILED]} failed, "
+                f"{counts[LEASED]} in progress, {counts[QUEUED]} queued"
+            )
+            last = counts
+        if not counts[QUEUED] + counts[LEASED]:
+            return counts
+        time.sleep(poll_interval)
+
+
+def gather_results(
+    queue: WorkQueue,
+    results_dir: Path,
+    output_dir: Path,
+    output_format: str = "csv"
+) -> Tuple[int, List[str]]:
+    """
+    Combine the per-city results of a drained queue into one output.
+
+    Returns:
+        Number of result rows written, and the failed cities
+    """
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    if output_format == "parquet":
+        sink = ParquetResultSink(output_dir / "parquet", "google_maps")
+    else:
+        sink = CsvResultSink(output_dir / f"all_bakeries_{timestamp}.csv", BATCH_COLUMNS)
+    change_sink = None
+
+    failed = []
+    for item in queue.items():
+        city = item["payload"]["city"]
+        if item["status"] != DONE:
+            print(f"Failed {city} after {item['attempts']} attempts: {item['error']}")
+            failed.append(city)
+            continue
+        result = item["result"]
+        if result["file"]:
+            sink.write(clean_results(pd.read_csv(results_dir / result["file"]), "google_maps"))
+        if result["changes_file"]:
+            if change_sink is None:
+                change_sink = CsvResultSink(output_dir / f"changes_{timestamp}.csv", CHANGES_COLUMNS)
+            change_sink.write(pd.read_csv(results_dir / result["changes_file"]))
+
+    if change_sink is not None:
+        if change_sink.rows:
+            print(f"Changes since the last run ({change_sink.rows}) saved to: {change_sink.finalize()}")
+        else:
+            change_sink.discard()
+
+    if failed:
+        failed_file = output_dir / f"failed_cities_{timestamp}.txt"
+        failed_file.write_text("\n".join(failed))
+        print(f"Failed cities saved to: {failed_file}")
+
+    rows = sink.rows
+    if rows:
+        print(f"Results saved to: {sink.finalize()}")
+    else:
+        sink.discard()
+    return rows, failed
+
+
+def coordinate(
+    input_file: str,
+    queue_path: str,
+    backend: Optional[str] = None,
+    results_dir: Optional[str] = None,
+    output_format: str = "csv",
+    max_attempts: int = 3,
+    local_workers: int = 0,
+    poll_interval: float = POLL_INTERVAL,
+    rate_limits: Optional[Dict[str, Tuple[float, float]]] = None,
+    retry_policies: Optional[Dict[str, RetryPolicy]] = None,
+    **worker_options
+) -> None:
+    """
+    Publish every city of the input file to a shared queue and gather the results.
+
+    Workers on any node (``distributed_scraper.py work``) lease cities from
+    the queue. Re-running the coordinator against the same queue resumes:
+    finished cities are kept and failed ones are queued again.
+
+    Args:
+        input_file: CSV file with a 'city' column
+        queue_path: Queue file on shared storage
+        backend: Queue backend name (see open_queue)
+        results_dir: Shared directory workers write per-city results to
+        output_format: 'csv' for one combined CSV, or 'parquet' for a typed dataset
+        max_attempts: Leases a city may use before it is given up
+        local_workers: Worker processes to start on this machine
+        poll_interval: Seconds between progress checks
+        rate_limits: Per-host limits shared by the local workers
+        retry_policies: Retry policies for the local workers
+        **worker_options: Further run_worker() options for the local workers
+    """
+    try:
+        cities = pd.read_csv(input_file)['city'].dropna().unique()
+    except Exception as e:
+        print(f"Error reading input file: {str(e)}")
+        return
+
+    queue = open_queue(queue_path, backend)
+    queued = queue.publish({city: {"city": city} for city in cities}, max_attempts)
+    print(f"Queued {queued} of {len(cities)} cities in {queue_path}")
+
+    # Local workers share one limiter, like the batch runner's worker processes
+    rate_limiter = HostRateLimiter(rate_limits)
+    workers = [
+        Process(
+            target=run_worker,
+            args=(queue_path, backend, results_dir),
+            kwargs=dict(
+                worker_options,
+                poll_interval=poll_interval,
+                rate_limiter=rate_limiter,
+                retry_policies=RetryPolicies(retry_policies)
+            )
+        )
+        for _ in range(local_workers)
+    ]
+    for process in workers:
+        process.start()
+
+    try:
+        counts = wait_for_queue(queue, poll_interval)
+    finally:
+        for process in workers:
+            process.join()
+
+    output_dir = Path("scraped_results")
+    output_dir.mkdir(exist_ok=True)
+    rows, failed = gather_results(
+        queue, Path(results_dir) if results_dir else default_results_dir(queue_path), output_dir, output_format
+    )
+    queue.close()
+
+    print(f"\nProcessing complete!")
+    print(f"Total cities processed: {sum(counts.values())}")
+    print(f"Successful cities: {counts[DONE]}")
+    print(f"Failed cities: {len(failed)}")
+    print(f"Total bakeries found: {rows}")
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line options for the coordinator and workers."""
+    parser = argparse.ArgumentParser(
+        description="Scrape Google Maps bakeries for many cities with workers on several machines."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    coordinator = commands.add_parser("coordinate", help="Queue the cities of a CSV file and gather the results")
+    coordinator.add_argument("input_file", nargs="?", default="in.csv", help="CSV file with a 'city' column")
+    coordinator.add_argument(
+        "--format", choices=["csv", "parquet"], default="csv", dest="output_format",
+        help="Combined output: one CSV, or a Parquet dataset partitioned by source/city/date"
+    )
+    coordinator.add_argument(
+        "--max-attempts", type=int, default=3,
+        help="Attempts per city, including ones lost to expired leases (default: 3)"
+    )
+    coordinator.add_argument(
+        "-w", "--local-workers", type=int, default=0,
+        help="Also start this many worker processes on this machine"
+    )
+    worker = commands.add_parser("work", help="Lease and scrape cities until the queue is drained")
+
+    for command in (coordinator, worker):
+        command.add_argument("--queue", required=True, help="Queue file on storage shared by all machines")
+        command.add_argument(
+            "--backend", choices=["sqlite", "file"],
+            help="Queue backend (default: 'file' for .json queues, else 'sqlite')"
+        )
+        command.add_argument(
+            "--results", metavar="DIR", dest="results_dir",
+            help="Shared directory for per-city results (default: <queue>_results next to the queue)"
+        )
+        command.add_argument(
+            "--poll", type=float, default=POLL_INTERVAL, dest="poll_interval",
+            help=f"Seconds between queue checks (default: {POLL_INTERVAL:g})"
+        )
+        command.add_argument(
+            "--visibility-timeout", type=float, default=VISIBILITY_TIMEOUT,
+            help=f"Seconds before a silent worker's city is handed to another (default: {VISIBILITY_TIMEOUT:g})"
+        )
+        command.add_argument(
+            "--rate", action="append", default=[], metavar="HOST=RPS[:BURST]",
+            help="Override a site's rate limit on this machine, e.g. google.com=1.5:5 (repeatable)"
+        )
+        command.add_argument(
+            "--retry", action="append", default=[], metavar="OP=ATTEMPTS[:INITIAL[:MAX]]",
+            help="Override a retry policy, e.g. search=5:2:30 (repeatable)"
+        )
+        command.add_argument(
+            "--snapshots", metavar="DIR", dest="snapshot_dir",
+            help="Record compressed HTML snapshots of result feeds and detail panels in DIR"
+        )
+        command.add_argument(
+            "--replay", action="store_true",
+            help="Re-run extraction from the snapshots in --snapshots DIR without a browser"
+        )
+        command.add_argument(
+            "--index", metavar="DB", dest="index_path",
+            help="SQLite place index; known places reuse their details"
+        )
+        command.add_argument(
+            "--shared-index", action="store_true",
+            help="--index DB is on storage shared by all machines (opened without WAL, "
+                 "which network filesystems do not support); needed for --delta"
+        )
+        command.add_argument(
+            "--index-max-age", type=float, default=7, metavar="DAYS",
+            help="Re-fetch details of indexed places older than this (default: 7)"
+        )
+        command.add_argument(
+            "--delta", action="store_true",
+            help="Only open new or changed places (needs --index and --shared-index) and write a change-set"
+        )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.delta and not (args.index_path and args.shared_index):
+        # A per-machine index would compare each city against whichever history its worker holds
+        raise SystemExit("Delta mode needs one --index DB on shared storage, marked with --shared-index")
+    if args.replay and not args.snapshot_dir:
+        raise SystemExit("Replay needs --snapshots DIR")
+    rate_limits = _rate_limits_from_args(args.rate)
+    retry_policies = dict(parse_policy(spec) for spec in args.retry) or None
+    worker_options = dict(
+        visibility_timeout=args.visibility_timeout,
+        snapshot_dir=args.snapshot_dir,
+        replay=args.replay,
+        index_path=args.index_path,
+        index_max_age=args.index_max_age,
+        delta=args.delta,
+        shared_index=args.shared_index
+    )
+    if args.command == "coordinate":
+        coordinate(
+            args.input_file,
+            args.queue,
+            backend=args.backend,
+            results_dir=args.results_dir,
+            output_format=args.output_format,
+            max_attempts=args.max_attempts,
+            local_workers=args.local_workers,
+            poll_interval=args.poll_interval,
+            rate_limits=rate_limits,
+            retry_policies=retry_policies,
+            **worker_options
+        )
+    else:
+        run_worker(
+            args.queue,
+            backend=args.backend,
+            results_dir=args.results_dir,
+            poll_interval=args.poll_interval,
+            rate_limiter=HostRateLimiter(rate_limits),
+            retry_policies=RetryPolicies(retry_policies),
+            **worker_options
+        )
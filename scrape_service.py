@@ -0,0 +1,193 @@
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+from scrapers.google_maps_scraper import GoogleMapsScraper
+from scrapers.justdial_scraper import JustDialScraper
+from scrapers.zomato_scraper import ZomatoBakeryScraper
+from utils.driver_pool import BrowserBudget, DriverPool
+from utils.scrape_jobs import JobRejected, Runner, ScrapeJobManager
+
+# Scraper classes by job scraper name
+SCRAPERS = {
+    "justdial": JustDialScraper,
+    "google_maps": GoogleMapsScraper,
+    "zomato": ZomatoBakeryScraper,
+}
+
+
+def build_runners(driver_pools: Optional[Dict[str, DriverPool]] = None) -> Dict[str, Runner]:
+    """
+    Scrape functions for ScrapeJobManager, one per scraper.
+
+    Args:
+        driver_pools: Optional pool per scraper name to borrow browsers from;
+            without one each scrape launches and quits its own Chrome
+    """
+    pools = driver_pools or {}
+
+    def run_justdial(query: str, params: Dict, report: Callable[[Dict], None]) -> pd.DataFrame:
+        scraper = JustDialScraper(driver_pool=pools.get("justdial"))
+        scraper.on_listing = report
+        return scraper.scrape(query, params["num_pages"])
+
+    def run_google_maps(query: str, params: Dict, report: Callable[[Dict], None]) -> pd.DataFrame:
+        scraper = GoogleMapsScraper(driver_pool=pools.get("google_maps"))
+        scraper.on_listing = report
+        # Pass None as num_results to get all available data
+        return scraper.scrape(query, params["num_results"])
+
+    def run_zomato(city: str, params: Dict, report: Callable[[Dict], None]) -> pd.DataFrame:
+        scraper = ZomatoBakeryScraper(city, driver_pool=pools.get("zomato"))
+        scraper.on_listing = report
+        return scraper.scrape()
+
+    return {"justdial": run_justdial, "google_maps": run_google_maps, "zomato": run_zomato}
+
+
+class ScrapeServiceHandler(BaseHTTPRequestHandler):
+    """JSON API of the scrape service.
+
+    POST /jobs        submit {"scraper", "query", "params", "total"}; 429 when the queue is full
+    GET  /jobs/<id>   job state, with partial listings if ?partial=1
+    GET  /health      running, queued and cached scrape counts, and live browsers
+    """
+
+    server: "ScrapeService"
+
+    def _send(self, status: int, body: Dict) -> None:
+        payload = json.dumps(body, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self) -> None:
+        if urlparse(self.path).path != "/jobs":
+            self._send(404, {"error": "Not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            job = self.server.manager.submit(
+                request["scraper"], request["query"], total=request.get("total"), **request.get("params", {})
+            )
+        except JobRejected as e:
+            self._send(429, {"error": f"Scrape service is busy: {str(e)}"})
+        except (KeyError, TypeError, ValueError) as e:
+            self._send(400, {"error": str(e)})
+        else:
+            self._send(202, job.to_dict())
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        if url.path == "/health":
+            self._send(200, {**self.server.manager.stats(), "browsers": self.server.browser_budget.alive})
+            return
+
+        parts = url.path.strip("/").split("/")
+        job = self.server.manager.get(parts[1]) if len(parts) == 2 and parts[0] == "jobs" else None
+        if job is None:
+            self._send(404, {"error": "Unknown job"})
+            return
+        partial = parse_qs(url.query).get("partial", ["0"])[0] not in ("", "0")
+        self._send(200, job.to_dict(partial=partial))
+
+    def log_message(self, format: str, *args) -> None:
+        # Progress polling would flood the log, so only submissions are logged
+        if self.command != "GET":
+            super().log_message(format, *args)
+
+
+class ScrapeService(ThreadingHTTPServer):
+    """Long-lived scrape service: one job queue and browser pool shared by all clients.
+
+    At most ``workers`` scrapes run at once, each borrowing a warm driver
+    from its scraper's pool. The pools share one budget of ``workers``
+    browsers, so at most ``workers`` Chrome instances are alive in total,
+    not one set per scraper; an idle browser of one scraper is quit when
+    another scraper needs the slot. Memory is therefore bounded by
+    ``workers`` rather than by the number of webapp users. Up to ``max_pending`` further
+    scrapes queue; beyond that submissions are rejected. Identical
+    requests share one job and finished results are cached for ``ttl``.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address=("127.0.0.1", 8765),
+        workers: int = 2,
+        max_pending: int = 8,
+        ttl: float = 3600,
+        warm: bool = False
+    ):
+        """
+        Initialize the service; call ``serve_forever()`` to start handling requests.
+
+        Args:
+            address: (host, port) to listen on
+            workers: Concurrent scrapes, and the most browsers alive across all scrapers
+            max_pending: Scrapes allowed to wait for a worker
+            ttl: Seconds finished results stay cached
+            warm: Start browsers up front, filling the budget in SCRAPERS order
+        """
+        self.browser_budget = BrowserBudget(workers)
+        self.driver_pools = {
+            name: DriverPool(scraper.create_driver, size=workers, warm=warm, budget=self.browser_budget)
+            for name, scraper in SCRAPERS.items()
+        }
+        self.manager = ScrapeJobManager(
+            build_runners(self.driver_pools), max_workers=workers, ttl=ttl, max_pending=max_pending
+        )
+        super().__init__(address, ScrapeServiceHandler)
+
+    def server_close(self) -> None:
+        """Stop listening, let running scrapes finish and quit all browsers."""
+        super().server_close()
+        self.manager.shutdown()
+        for pool in self.driver_pools.values():
+            pool.close()
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line options for the scrape service."""
+    parser = argparse.ArgumentParser(description="Run a local scrape service shared by webapp sessions.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument(
+        "-w", "--workers", type=int, default=2,
+        help="Concurrent scrapes, and the most Chrome instances alive across all scrapers"
+    )
+    parser.add_argument(
+        "--max-pending", type=int, default=8,
+        help="Scrapes allowed to queue before new submissions are rejected"
+    )
+    parser.add_argument(
+        "--ttl", type=float, default=3600,
+        help="Seconds finished results are cached and shared (default: 3600)"
+    )
+    parser.add_argument("--warm", action="store_true", help="Start all browsers up front")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    service = ScrapeService(
+        (args.host, args.port),
+        workers=args.workers,
+        max_pending=args.max_pending,
+        ttl=args.ttl,
+        warm=args.warm
+    )
+    print(f"Scrape service listening on http://{args.host}:{args.port} with {args.workers} workers")
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down scrape service")
+    finally:
+        service.server_close()
@@ -0,0 +1,197 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Iterable, List, Optional
+
+import pandas as pd
+from playwright.async_api import Browser, Page, Playwright, Route, async_playwright
+
+from utils.metrics import get_metrics
+from utils.network_filter import BlockingProfile
+from utils.rate_limiter import get_rate_limiter
+from utils.scroll_controller import FeedState, ScrollController
+from .base_scraper import ANTI_DETECTION_SCRIPT, USER_AGENT
+
+# Resource types dropped when a profile blocks images
+MEDIA_RESOURCE_TYPES = {"image", "media", "font"}
+
+
+def as_function(script: str) -> str:
+    """Wrap a Selenium-style script body (using ``return``) for Playwright's evaluate."""
+    return f"() => {{ {script} }}"
+
+
+class AsyncBrowserEngine:
+    """One Chromium process serving many isolated pages concurrently.
+
+    Each page gets its own browser context (cookies, storage, cache), so
+    concurrent scrapes do not interfere, while sharing a single browser
+    process instead of one Chrome per scrape. At most ``max_pages`` pages
+    are open at once; further requests wait for a free slot.
+    """
+
+    def __init__(self, max_pages: int = 4, headless: bool = True):
+        """
+        Initialize the engine; the browser starts on first use or ``start()``.
+
+        Args:
+            max_pages: Maximum number of concurrently open pages
+            headless: Run Chromium without a window
+        """
+        self.max_pages = max_pages
+        self.headless = headless
+        self._slots = asyncio.Semaphore(max_pages)
+        self._start_lock = asyncio.Lock()
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+
+    async def start(self) -> Browser:
+        """Launch the shared browser if it is not running yet."""
+        async with self._start_lock:
+            if self._browser is None:
+                with get_metrics().span("driver_start", "async_engine"):
+                    self._playwright = await async_playwright().start()
+                    self._browser = await self._playwright.chromium.launch(
+                        headless=self.headless,
+                        args=["--disable-blink-features=AutomationControlled", "--disable-dev-shm-usage"]
+                    )
+        return self._browser
+
+    @staticmethod
+    async def _apply_blocking(context, profile: BlockingProfile) -> None:
+        """Abort requests the profile blocks, mirroring the CDP URL block list."""
+        async def handle(route: Route) -> None:
+            request = route.request
+            blocked_media = profile.block_images and request.resource_type in MEDIA_RESOURCE_TYPES
+            if (blocked_media and not profile.allows(request.url)) or profile.blocks(request.url):
+                await route.abort()
+            else:
+                await route.continue_()
+
+        await context.route("**/*", handle)
+
+    @asynccontextmanager
+    async def page(self, blocking_profile: Optional[BlockingProfile] = None) -> AsyncIterator[Page]:
+        """
+        Open a page in a fresh browser context, closed again on exit.
+
+        Args:
+            blocking_profile: Requests to block for this page
+        """
+        browser = await self.start()
+        async with self._slots:
+            context = await browser.new_context(
+                user_agent=USER_AGENT,
+                viewport={"width": 1920, "height": 1080},
+                locale="en-US"
+            )
+            try:
+                await context.add_init_script(ANTI_DETECTION_SCRIPT)
+                if blocking_profile:
+                    await self._apply_blocking(context, blocking_profile)
+                yield await context.new_page()
+            finally:
+                await context.close()
+
+    async def close(self) -> None:
+        """Close the browser and stop Playwright."""
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def __aenter__(self) -> "AsyncBrowserEngine":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+
+class AsyncBaseScraper(ABC):
+    """Base class for scrapers running on a shared AsyncBrowserEngine.
+
+    Counterpart of BaseScraper: subclasses implement ``async scrape()`` and
+    reuse their synchronous scraper's parsing and cleaning, so both engines
+    return identical DataFrames.
+    """
+
+    # Short name identifying the scraper's snapshots and output schema
+    SOURCE = ""
+
+    # Network filtering applied to the scraper's pages
+    BLOCKING_PROFILE: Optional[BlockingProfile] = BlockingProfile()
+
+    def __init__(self, browser: AsyncBrowserEngine):
+        """
+        Initialize async scraper.
+
+        Args:
+            browser: Shared browser engine the scraper opens its pages in
+        """
+        self.browser = browser
+        self.rate_limiter = get_rate_limiter()
+        self.metrics = get_metrics()
+        self.base_url = ""
+
+    def _page(self):
+        """Open a page with this scraper's blocking profile."""
+        return self.browser.page(self.BLOCKING_PROFILE)
+
+    async def _throttle(self, url: Optional[str] = None) -> None:
+        """Wait for the per-host rate limiter without blocking the event loop."""
+        waited = await asyncio.to_thread(self.rate_limiter.acquire, url or self.base_url)
+        if waited:
+            self.metrics.observe("throttle", waited, self.SOURCE)
+
+    def _span(self, stage: str, **labels):
+        """Time a stage of this scraper, e.g. ``with self._span("search"):``."""
+        return self.metrics.span(stage, self.SOURCE, **labels)
+
+    async def _sleep(self, seconds: float) -> None:
+        """Sleep without blocking other pages, recording the time under 'sleep'."""
+        with self._span("sleep"):
+            await asyncio.sleep(seconds)
+
+    async def _advance_scroll(
+        self,
+        controller: ScrollController,
+        scroll: Callable[[], Awaitable[None]],
+        probe: Callable[[], Awaitable[FeedState]]
+    ) -> FeedState:
+        """Async counterpart of ScrollController.advance(): scroll, then poll until new items, the end or the timeout."""
+        before = await probe()
+        await scroll()
+        started = time.monotonic()
+        state = await probe()
+        while not controller.finished(before, state, started):
+            await asyncio.sleep(controller.poll_interval)
+            state = await probe()
+        controller.record(before, state, time.monotonic() - started)
+        return state
+
+    @abstractmethod
+    async def scrape(self, *args, **kwargs) -> pd.DataFrame:
+        """Abstract method to be implemented by each scraper."""
+        pass
+
+
+async def scrape_concurrently(jobs: Iterable[Awaitable[pd.DataFrame]]) -> List[pd.DataFrame]:
+    """
+    Run scrape coroutines concurrently, returning an empty DataFrame for failures.
+
+    Concurrency is bounded by the browser engine's page slots, so all jobs
+    can be submitted at once.
+    """
+    results = await asyncio.gather(*jobs, return_exceptions=True)
+    frames = []
+    for result in results:
+        if isinstance(result, BaseException):
+            print(f"Scrape failed: {str(result)}")
+            frames.append(pd.DataFrame())
+        else:
+            frames.append(result)
+    return frames
@@ -0,0 +1,196 @@
+import time
+from typing import Dict, List, Optional
+
+import pandas as pd
+from bs4 import BeautifulSoup
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
+
+from utils.scroll_controller import FeedState, ScrollController
+from utils.snapshot_store import SnapshotStore
+from .async_engine import AsyncBaseScraper, AsyncBrowserEngine, as_function
+from .google_maps_scraper import (
+    FEED_STATE_SCRIPT, PANEL_HTML_SCRIPT, PANEL_STATE_SCRIPT, GoogleMapsScraper, PanelNotShown, _PanelReady
+)
+
+# Like NEW_CARDS_SCRIPT, minus the element handles evaluate() cannot return
+NEW_CARDS_FUNCTION = """() => {
+    const seen = window.__scrapedCardKeys || (window.__scrapedCardKeys = new Set());
+    const cards = [];
+    for (const card of document.querySelectorAll("div[role='feed'] div.Nv2PK")) {
+        const link = card.querySelector('a.hfpxzc');
+        const key = link ? link.href : card.textContent;
+        if (seen.has(key)) {
+            continue;
+        }
+        seen.add(key);
+        cards.push({key: key, html: card.outerHTML});
+    }
+    return cards;
+}"""
+
+# Opens the detail panel of the card whose place URL is ``key``
+CLICK_CARD_FUNCTION = """(key) => {
+    for (const link of document.querySelectorAll('a.hfpxzc')) {
+        if (link.href === key) {
+            link.click();
+            return true;
+        }
+    }
+    return false;
+}"""
+
+
+class AsyncGoogleMapsScraper(AsyncBaseScraper):
+    """Google Maps scraper running as one page of a shared async browser."""
+
+    SOURCE = GoogleMapsScraper.SOURCE
+    BLOCKING_PROFILE = GoogleMapsScraper.BLOCKING_PROFILE
+
+    def __init__(self, browser: AsyncBrowserEngine, snapshot_store: Optional[SnapshotStore] = None):
+        """
+        Initialize async Google Maps scraper.
+
+        Args:
+            browser: Shared browser engine
+            snapshot_store: Optional store that records cards and panels for replay
+        """
+        super().__init__(browser)
+        # Parsing, cleaning, snapshots and timeouts are shared with the Selenium scraper
+        self.parser = GoogleMapsScraper(snapshot_store=snapshot_store)
+        self.base_url = self.parser.base_url
+        self.scroll = ScrollController()
+
+    async def _search_location(self, page: Page, query: str) -> None:
+        """Perform search on Google Maps."""
+        with self._span("search"):
+            await page.fill("#searchboxinput", query, timeout=self.parser.WAIT_TIMEOUT * 1000)
+            await self._throttle()
+            await page.press("#searchboxinput", "Enter")
+            await page.wait_for_selector("div[role='feed']", timeout=self.parser.WAIT_TIMEOUT * 1000)
+
+    async def _load_more_results(self, page: Page) -> List[Dict]:
+        """Scroll until new cards load or the feed ends, and return only the cards not seen yet."""
+        with self._span("scroll"):
+            try:
+                if self.scroll.done:
+                    return []
+
+                async def scroll() -> None:
+                    await self._throttle()
+                    await page.evaluate(
+                        "() => { const feed = document.querySelector(\"div[role='feed']\");"
+                        " if (feed) { feed.scrollTo(0, feed.scrollHeight); } }"
+                    )
+
+                async def probe() -> FeedState:
+                    return FeedState(**await page.evaluate(as_function(FEED_STATE_SCRIPT)))
+
+                state = await self._advance_scroll(self.scroll, scroll, probe)
+                if state.end:
+                    print("Reached end of results list")
+                return await page.evaluate(NEW_CARDS_FUNCTION) or []
+
+            except Exception as e:
+                print(f"Error loading more results: {str(e)}")
+                self.scroll.fail()
+                return []
+
+    async def _wait_for_panel(self, page: Page, name: str) -> Dict[str, str]:
+        """Poll the detail panel until it shows ``name`` with its info rows."""
+        condition = _PanelReady(name, self.parser.INFO_GRACE)
+        deadline = time.monotonic() + self.parser.DETAIL_TIMEOUT
+        while time.monotonic() < deadline:
+            state = condition.check(await page.evaluate(as_function(PANEL_STATE_SCRIPT)))
+            if state:
+                return state
+            await self._sleep(self.parser.POLL_INTERVAL)
+        raise PanelNotShown(f"Detail panel for '{name}' did not load")
+
+    async def _extract_details(self, page: Page, key: str, name: str) -> Dict[str, str]:
+        """Open a card's detail panel and read its address and phone number."""
+        try:
+            await self._throttle()
+            if not await page.evaluate(CLICK_CARD_FUNCTION, key):
+                raise ValueError(f"Card for '{name}' is no longer in the feed")
+
+            panel = await self._wait_for_panel(page, name)
+            if self.parser.snapshot_store is not None:
+                self.parser._snapshot("details", await page.evaluate(as_function(PANEL_HTML_SCRIPT)), card_key=key)
+
+            return {
+                "Full Address": panel["address"] or "N/A",
+                "Phone Number": panel["phone"] or "N/A"
+            }
+        finally:
+            # Return to results list
+            await page.keyboard.press("Escape")
+            try:
+                await page.wait_for_selector(
+                    "h1.DUwDvf", state="hidden", timeout=self.parser.WAIT_TIMEOUT * 1000
+                )
+            except PlaywrightTimeoutError:
+                print("Detail panel did not close in time")
+
+    async def scrape(self, query: str, num_results: Optional[int] = None) -> pd.DataFrame:
+        """
+        Collect Google Maps listings for ``query``; same output as GoogleMapsScraper.scrape().
+
+        Raises:
+            Exception: Any error that stopped the scrape, after the page was closed
+        """
+        try:
+            async with self._page() as page:
+                self.parser._start_snapshots(query)
+                self.scroll = ScrollController()
+                await self._throttle()
+                with self._span("page_load"):
+                    await page.goto(self.base_url)
+                await self._search_location(page, query)
+
+                places_data = []
+                results = await self._load_more_results(page)
+
+                # Keep scrolling until we have enough results or the feed is exhausted
+                while num_results is None or len(places_data) < num_results:
+                    if not results:
+                        if self.scroll.done:
+                            print(f"No more results available. Found {len(places_data)} places.")
+                            break
+                        results = await self._load_more_results(page)
+                        continue
+
+                    for card in results:
+                        try:
+                            # _extract_basic_info records the 'parse' span itself
+                            soup = BeautifulSoup(card["html"], "lxml")
+                            basic_info = self.parser._extract_basic_info(soup)
+
+                            if basic_info["Name"] in self.parser.processed_names or basic_info["Name"] == "N/A":
+                                continue
+                            self.parser.processed_names.add(basic_info["Name"])
+
+                            with self._span("details", place=basic_info["Name"]):
+                                detailed_info = await self._extract_details(page, card["key"], basic_info["Name"])
+                            self.parser._snapshot("card", card["html"], card_key=card["key"])
+
+                            place_info = {**basic_info, **detailed_info}
+                            places_data.append(place_info)
+                            print(f"Processed: {place_info['Name']} ({len(places_data)}/{num_results})")
+
+                            if num_results and len(places_data) >= num_results:
+                                break
+
+                        except Exception as e:
+                            print(f"Error processing result: {str(e)}")
+                            continue
+
+                    # The loop condition is checked before scrolling for more
+                    results = []
+
+            print(f"Scraping completed. Found {len(places_data)} places.")
+            return self.parser._build_dataframe(places_data)
+
+        except Exception as e:
+            # Re-raised like GoogleMapsScraper.scrape(), so a failed query is not mistaken for an empty one
+            print(f"Fatal error occurred: {str(e)}")
+            raise
@@ -0,0 +1,156 @@
+import asyncio
+from typing import Dict, List, Optional
+
+import pandas as pd
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
+
+from utils.snapshot_store import SnapshotStore
+from .async_engine import AsyncBaseScraper, AsyncBrowserEngine, as_function
+from .justdial_scraper import PAGE_LISTINGS_SCRIPT, JustDialScraper
+
+
+class AsyncJustDialScraper(AsyncBaseScraper):
+    """JustDial scraper running as one page of a shared async browser."""
+
+    SOURCE = JustDialScraper.SOURCE
+    BLOCKING_PROFILE = JustDialScraper.BLOCKING_PROFILE
+
+    def __init__(
+        self,
+        browser: AsyncBrowserEngine,
+        engine: str = "auto",
+        snapshot_store: Optional[SnapshotStore] = None
+    ):
+        """
+        Initialize async JustDial scraper.
+
+        Args:
+            browser: Shared browser engine
+            engine: 'auto' (HTTP first, browser fallback), 'http' or 'browser'
+            snapshot_store: Optional store that records listing pages for replay
+        """
+        super().__init__(browser)
+        # Parsing, cleaning, snapshots and the HTTP path are shared with the Selenium scraper
+        self.parser = JustDialScraper(engine=engine, snapshot_store=snapshot_store)
+        self.base_url = self.parser.base_url
+
+    async def _wait_for_listings(self, page: Page) -> None:
+        """Wait until store listings are rendered instead of sleeping a fixed delay."""
+        try:
+            await page.wait_for_selector(".store-details", timeout=self.parser.WAIT_TIMEOUT * 1000)
+        except PlaywrightTimeoutError:
+            pass
+
+    async def _click_show_numbers(self, page: Page) -> None:
+        """Click on show number buttons to reveal phone numbers."""
+        with self._span("show_numbers"):
+            try:
+                await page.wait_for_selector(".shownum", timeout=self.parser.WAIT_TIMEOUT * 1000)
+            except PlaywrightTimeoutError:
+                print("No phone numbers found to click.")
+                return
+
+            for number in await page.query_selector_all(".shownum"):
+                try:
+                    await self._throttle()
+                    await number.click()
+                except Exception:
+                    continue
+            await self._sleep(self.parser.CLICK_DELAY)
+
+    async def _go_to_next_page(self, page: Page) -> bool:
+        """Navigate to the next page of results."""
+        with self._span("next_page"):
+            try:
+                next_page = await page.wait_for_selector(
+                    "a[rel='next']", state="visible", timeout=10000
+                )
+                await self._throttle()
+                await next_page.click()
+
+                # Wait for the old page to go away, then for the new listings
+                await next_page.wait_for_element_state(
+                    "hidden", timeout=self.parser.PAGE_LOAD_DELAY * 1000
+                )
+                await self._wait_for_listings(page)
+                return True
+            except Exception as e:
+                print(f"Error: Unable to navigate to the next page. {str(e)}")
+                return False
+
+    async def _scrape_browser(self, query: str, num_pages: int) -> List[Dict[str, str]]:
+        """Search and page through listings, revealing phone numbers."""
+        async with self._page() as page:
+            await self._throttle()
+            with self._span("page_load"):
+                await page.goto(self.base_url)
+
+            # Search
+            try:
+                with self._span("search"):
+                    await page.fill(".input_search", query, timeout=self.parser.WAIT_TIMEOUT * 1000)
+                    await self._throttle()
+                    await page.press(".input_search", "Enter")
+                    await self._wait_for_listings(page)
+            except Exception:
+                print("Search box not found or Justdial blocked the request.")
+                return []
+
+            store_data = []
+
+            for page_number in range(num_pages):
+                try:
+                    print(f"Processing page {page_number + 1}")
+
+                    # Click show numbers
+                    await self._click_show_numbers(page)
+
+                    # Extract store details from the whole page at once
+                    page_html = await page.evaluate(as_function(PAGE_LISTINGS_SCRIPT))
+                    if not page_html:
+                        print(f"No results found on page {page_number + 1}")
+                        break
+                    self.parser._snapshot("listings", page_html, page=page_number + 1)
+
+                    for store_info in self.parser.extract_stores_from_html(page_html):
+                        store_data.append(store_info)
+                        print(f"Processed: {store_info['Store Name']}")
+
+                    if page_number < num_pages - 1:
+                        if not await self._go_to_next_page(page):
+                            print(f"No more pages available after page {page_number + 1}")
+                            break
+
+                except Exception as e:
+                    print(f"Error processing page {page_number + 1}: {str(e)}")
+                    break
+
+            return store_data
+
+    async def scrape(self, query: str, num_pages: int = 2) -> pd.DataFrame:
+        """
+        Collect JustDial listings for ``query``; same output as JustDialScraper.scrape().
+
+        Raises:
+            Exception: Any error that stopped the scrape
+        """
+        try:
+            self.parser._start_snapshots(query)
+            store_data = []
+            if self.parser.engine != "browser":
+                # The HTTP fetch is blocking, so it runs off the event loop
+                store_data = await asyncio.to_thread(self.parser._scrape_http, query, num_pages)
+                if self.parser.engine == "auto" and not self.parser._http_complete(store_data):
+                    print("HTTP fetch incomplete or without phone numbers, falling back to browser")
+                    store_data = []
+                    self.parser._start_snapshots(query)
+
+            if not store_data and self.parser.engine != "http":
+                store_data = await self._scrape_browser(query, num_pages)
+
+            return self.parser._build_dataframe(store_data)
+
+        except Exception as e:
+            # Re-raised so callers can tell a failed scrape from a query without listings
+            print(f"Fatal error occurred: {str(e)}")
+            raise
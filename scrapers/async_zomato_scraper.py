@@ -0,0 +1,121 @@
+import asyncio
+from typing import Dict, List, Optional
+
+import pandas as pd
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
+
+from utils.scroll_controller import FeedState, ScrollController
+from utils.snapshot_store import SnapshotStore
+from .async_engine import AsyncBaseScraper, AsyncBrowserEngine, as_function
+from .zomato_scraper import NEW_LISTINGS_SCRIPT, PAGE_STATE_SCRIPT, ZomatoBakeryScraper
+
+
+class AsyncZomatoScraper(AsyncBaseScraper):
+    """Zomato bakery scraper running as one page of a shared async browser."""
+
+    SOURCE = ZomatoBakeryScraper.SOURCE
+    BLOCKING_PROFILE = ZomatoBakeryScraper.BLOCKING_PROFILE
+
+    def __init__(
+        self,
+        browser: AsyncBrowserEngine,
+        city: str,
+        engine: str = "auto",
+        snapshot_store: Optional[SnapshotStore] = None
+    ):
+        """
+        Initialize async Zomato scraper with city name.
+
+        Args:
+            browser: Shared browser engine
+            city: City name as used in Zomato URLs
+            engine: 'auto' (HTTP first, browser fallback), 'http' or 'browser'
+            snapshot_store: Optional store that records listing HTML for replay
+        """
+        super().__init__(browser)
+        # Parsing, cleaning, snapshots and the HTTP path are shared with the Selenium scraper
+        self.parser = ZomatoBakeryScraper(city, engine=engine, snapshot_store=snapshot_store)
+        self.base_url = self.parser.base_url
+
+    async def _wait_for_listings(self, page: Page) -> None:
+        """Wait for the first listings, reloading the page once on timeout."""
+        try:
+            await page.wait_for_selector("div.sc-evWYkj", timeout=20000)
+        except PlaywrightTimeoutError:
+            print("Initial page load timeout, retrying...")
+            await self._throttle()
+            await page.reload()
+            await page.wait_for_selector("div.sc-evWYkj", timeout=20000)
+
+    async def _scroll_page(self, page: Page, scroll: ScrollController) -> None:
+        """Scroll to the bottom and wait as long as new listings have been taking to load."""
+        async def scroll_down() -> None:
+            # Pace requests through the shared rate limiter
+            await self._throttle()
+            await page.evaluate("() => window.scrollTo(0, document.body.scrollHeight)")
+
+        async def probe() -> FeedState:
+            return FeedState(**await page.evaluate(as_function(PAGE_STATE_SCRIPT)))
+
+        with self._span("scroll_wait"):
+            await self._advance_scroll(scroll, scroll_down, probe)
+
+    async def _scroll_and_extract_listings(self) -> List[Dict[str, str]]:
+        """Scroll through the page and extract all bakery listings."""
+        try:
+            async with self._page() as page:
+                await self._throttle()
+                with self._span("page_load"):
+                    await page.goto(self.base_url)
+                    await self._wait_for_listings(page)
+
+                unique_bakeries = []
+                scroll = ScrollController(initial_timeout=self.parser.SCROLL_TIMEOUT)
+
+                # Scroll until the page stops growing for longer than listings have been taking to load
+                while not scroll.done:
+                    await self._scroll_page(page, scroll)
+
+                    # Extract only the listings added since the previous scroll
+                    new_listings = await page.evaluate(as_function(NEW_LISTINGS_SCRIPT))
+                    if new_listings["count"]:
+                        self.parser._snapshot("listings", new_listings["html"])
+                        for listing_info in self.parser._parse_listings_html(new_listings["html"]):
+                            unique_bakeries.append(listing_info)
+                            print(f"Processed: {listing_info['Name']}")
+
+                return unique_bakeries
+
+        except Exception as e:
+            print(f"Error during scroll and extraction: {str(e)}")
+            return []
+
+    async def _collect_listings(self) -> List[Dict[str, str]]:
+        """Collect listings with the configured engine, falling back to the browser."""
+        if self.parser.engine != "browser":
+            # The HTTP fetch is blocking, so it runs off the event loop
+            listings = await asyncio.to_thread(self.parser._fetch_listings_http)
+            if self.parser._http_complete(listings) or self.parser.engine == "http":
+                return listings
+            print("HTTP fetch incomplete, falling back to browser")
+            self.parser.processed_bakeries.clear()
+            self.parser._start_snapshots(self.parser.city)
+
+        return await self._scroll_and_extract_listings()
+
+    async def scrape(self) -> pd.DataFrame:
+        """
+        Collect bakery listings; same output as ZomatoBakeryScraper.scrape().
+
+        Raises:
+            Exception: Any error that stopped the scrape
+        """
+        try:
+            self.parser._start_snapshots(self.parser.city)
+            bakeries = await self._collect_listings()
+            return self.parser._build_dataframe(bakeries)
+
+        except Exception as e:
+            # Re-raised; an empty DataFrame would read as a city without bakeries
+            print(f"Error during scraping: {str(e)}")
+            raise
@@ -1,20 +1,258 @@
+import time
 from abc import ABC, abstractmethod
-from typing import Optional
+from functools import lru_cache, wraps
+from typing import Callable, Dict, List, Optional
 import pandas as pd
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
+from utils.change_set import ADDED, CHANGED, REMOVED, ChangeSet
+from utils.driver_pool import DriverPool
+from utils.metrics import get_metrics
+from utils.network_filter import BlockingProfile, NetworkStats
+from utils.place_index import PlaceIndex, place_key
+from utils.retry import get_retry_policies
+from utils.snapshot_store import SnapshotStore
+from utils.rate_limiter import get_rate_limiter
+
+# Fetch engines: HTTP first with browser fallback, HTTP only, or browser only
+ENGINES = ("auto", "http", "browser")
+
+# User agent of a regular desktop Chrome
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+# Injected into every new document to hide browser automation
+ANTI_DETECTION_SCRIPT = """
+    // Overwrite the 'webdriver' property
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+
+    // Overwrite the 'chrome' property
+    Object.defineProperty(window, 'chrome', {
+        get: () => ({
+            runtime: {},
+            // Add other chrome properties as needed
+        }),
+    });
+
+    // Override permissions
+    const originalQuery = window.navigator.permissions.query;
+    window.navigator.permissions.query = (parameters) => (
+        parameters.name === 'notifications' ?
+            Promise.resolve({ state: Notification.permission }) :
+            originalQuery(parameters)
+    );
+
+    // Additional anti-detection measures
+    window.navigator.chrome = { runtime: {} };
+    window.navigator.languages = ['en-US', 'en'];
+
+    // Fake plugins and mimeTypes
+    Object.defineProperty(navigator, 'plugins', {
+        get: () => [1, 2, 3, 4, 5]
+    });
+
+    Object.defineProperty(navigator, 'mimeTypes', {
+        get: () => [1, 2, 3, 4, 5]
+    });
+"""
+
+
+@lru_cache(maxsize=None)
+def chromedriver_path() -> str:
+    """Resolve the chromedriver binary once per process."""
+    return ChromeDriverManager().install()
+
+
+def timed(stage: str) -> Callable:
+    """Decorate a scraper method so each call is recorded as a span of ``stage``."""
+    def decorator(method: Callable) -> Callable:
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self._span(stage):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def retried(operation: str) -> Callable:
+    """Decorate a scraper method so transient failures are retried under the ``operation`` policy."""
+    def decorator(method: Callable) -> Callable:
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            return get_retry_policies().call(operation, method, self, *args, source=self.SOURCE, **kwargs)
+        return wrapper
+    return decorator
+
 
 class BaseScraper(ABC):
     """Base class for all web scrapers."""
+
+    # Short name identifying the scraper's snapshots and output schema
+    SOURCE = ""
+
+    # Network filtering applied to drivers created for this scraper
+    BLOCKING_PROFILE: Optional[BlockingProfile] = BlockingProfile()
+
+    # Fields naming and locating a place in the place index
+    NAME_FIELD = "Name"
+    LOCATION_FIELD = ""
+
+    # Card-level fields compared with the stored state in delta mode
+    DELTA_FIELDS: List[str] = []
     
-    def __init__(self):
-        """Initialize base scraper."""
+    def __init__(
+        self,
+        driver_pool: Optional[DriverPool] = None,
+        snapshot_store: Optional[SnapshotStore] = None,
+        place_index: Optional[PlaceIndex] = None,
+        delta: bool = False
+    ):
+        """
+        Initialize base scraper.
+
+        Args:
+            driver_pool: Optional pool to borrow drivers from instead of
+                launching (and quitting) a dedicated Chrome per scrape
+            snapshot_store: Optional store that records scraped HTML for offline replay
+            place_index: Optional cross-run index of places scraped before
+            delta: Compare results with the place index and report the
+                added, changed and removed places in ``changes``
+
+        Raises:
+            ValueError: If delta mode is requested without a place index
+        """
+        if delta and place_index is None:
+            raise ValueError("Delta mode needs a place index")
         self.driver = None
-        
+        self.driver_pool = driver_pool
+        self.snapshot_store = snapshot_store
+        self._snapshot_key = None
+        self.place_index = place_index
+        self.delta = delta
+        self._change_set: Optional[ChangeSet] = None
+        self.changes: Optional[pd.DataFrame] = None
+        # Optional callback receiving each listing as soon as it is extracted
+        self.on_listing: Optional[Callable[[Dict], None]] = None
+        self.rate_limiter = get_rate_limiter()
+        self.metrics = get_metrics()
+        self.network_stats = NetworkStats()
+        self.base_url = ""
+
     def _initialize_driver(self) -> webdriver.Chrome:
         """Initialize Chrome WebDriver with common options."""
+        return self.create_driver()
+
+    def _acquire_driver(self) -> webdriver.Chrome:
+        """Lease a driver from the pool, or launch a dedicated one."""
+        if self.driver is None:
+            with self._span("driver_acquire"):
+                start = self.driver_pool.acquire if self.driver_pool is not None else self._initialize_driver
+                self.driver = get_retry_policies().call("driver_start", start, source=self.SOURCE)
+        return self.driver
+
+    @retried("navigation")
+    def _navigate(self, url: str) -> None:
+        """Load a page, retrying transient failures under the 'navigation' policy."""
+        self._throttle(url)
+        with self._span("page_load"):
+            self.driver.get(url)
+
+    def _throttle(self, url: Optional[str] = None) -> None:
+        """Wait for the per-host rate limiter before navigating or interacting."""
+        waited = self.rate_limiter.acquire(url or self.base_url)
+        if waited:
+            self.metrics.observe("throttle", waited, self.SOURCE)
+
+    def _span(self, stage: str, **labels):
+        """Time a stage of this scraper, e.g. ``with self._span("search"):``."""
+        return self.metrics.span(stage, self.SOURCE, **labels)
+
+    def _sleep(self, seconds: float) -> None:
+        """Sleep, recording the time under the 'sleep' stage."""
+        with self._span("sleep"):
+            time.sleep(seconds)
+
+    def _start_snapshots(self, key: str) -> None:
+        """Start recording snapshots for a scrape identified by ``key``."""
+        if self.snapshot_store is not None:
+            self._snapshot_key = key
+            self.snapshot_store.start(self.SOURCE, key)
+
+    def _snapshot(self, kind: str, html: Optional[str], **meta) -> None:
+        """Record HTML for offline replay when a snapshot store is attached."""
+        if self.snapshot_store is not None and self._snapshot_key is not None and html:
+            self.snapshot_store.record(self.SOURCE, self._snapshot_key, kind, html, **meta)
+
+    def _report(self, listing: Dict) -> None:
+        """Pass a freshly extracted listing to ``on_listing``, e.g. for live progress."""
+        if self.on_listing is not None:
+            self.on_listing(listing)
+
+    def _start_changes(self, scope: str, shared: bool = False) -> None:
+        """
+        Start collecting the change-set of a scrape identified by ``scope`` in delta mode.
+
+        Args:
+            scope: What is scraped, e.g. the query
+            shared: The scrape covers only part of ``scope`` (see ChangeSet)
+        """
+        self.changes = None
+        if self.delta:
+            self._change_set = ChangeSet(
+                self.place_index, self.SOURCE, scope, self.DELTA_FIELDS, self.NAME_FIELD, shared=shared
+            )
+
+    def _finish_changes(self, complete: bool) -> None:
+        """
+        Store the change-set in ``changes``.
+
+        Args:
+            complete: Whether the whole listing was seen, so absent places count as removed
+        """
+        if self._change_set is None:
+            return
+        self.changes = self._change_set.finish(complete)
+        self._change_set = None
+        counts = self.changes["Change"].value_counts()
+        print(f"Changes: {counts.get(ADDED, 0)} added, {counts.get(CHANGED, 0)} changed, {counts.get(REMOVED, 0)} removed")
+
+    def _index_listings(self, listings: List[Dict]) -> None:
+        """Record fully extracted listings in the place index and the change-set."""
+        if self.place_index is None:
+            return
+        for listing in listings:
+            key = place_key(listing[self.NAME_FIELD], listing.get(self.LOCATION_FIELD))
+            if self._change_set is not None:
+                self._change_set.compare(key, listing)
+            self.place_index.store(self.SOURCE, key, listing)
+
+    def _replay_snapshots(self, key: str) -> List[Dict]:
+        """
+        Load recorded snapshots for a scrape, with their HTML under 'html'.
+
+        Raises:
+            ValueError: If no snapshot store is attached or nothing was recorded
+        """
+        if self.snapshot_store is None:
+            raise ValueError("Replay needs a snapshot store")
+        entries = self.snapshot_store.entries(self.SOURCE, key)
+        if not entries:
+            raise ValueError(f"No snapshots recorded for {self.SOURCE} '{key}'")
+        for entry in entries:
+            entry["html"] = self.snapshot_store.get(entry["digest"])
+        return entries
+
+    @classmethod
+    def create_driver(cls) -> webdriver.Chrome:
+        """Create a Chrome WebDriver configured for this scraper; used as the pool factory."""
+        started = time.perf_counter()
         chrome_options = Options()
         
         # Basic configuration
@@ -41,66 +279,34 @@ class BaseScraper(ABC):
         chrome_options.add_experimental_option("useAutomationExtension", False)
         
         # Random user agent that looks more like a real browser
-        chrome_options.add_argument(
-            "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/120.0.0.0 Safari/537.36"
-        )
+        chrome_options.add_argument(f"user-agent={USER_AGENT}")
         
         # Additional performance options
         chrome_options.add_argument("--disable-software-rasterizer")
         chrome_options.add_argument("--disable-web-security")
         chrome_options.add_argument("--allow-running-insecure-content")
         chrome_options.add_argument("--disable-site-isolation-trials")
+
+        # Skip images, fonts, media and trackers the scraper never reads
+        if cls.BLOCKING_PROFILE:
+            cls.BLOCKING_PROFILE.configure_options(chrome_options)
         
         # Create driver with enhanced options
         driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()),
+            service=Service(chromedriver_path()),
             options=chrome_options
         )
         
         # Execute CDP commands to prevent detection
-        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
-            "source": """
-                // Overwrite the 'webdriver' property
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => undefined
-                });
-                
-                // Overwrite the 'chrome' property
-                Object.defineProperty(window, 'chrome', {
-                    get: () => ({
-                        runtime: {},
-                        // Add other chrome properties as needed
-                    }),
-                });
-                
-                // Override permissions
-                const originalQuery = window.navigator.permissions.query;
-                window.navigator.permissions.query = (parameters) => (
-                    parameters.name === 'notifications' ?
-                        Promise.resolve({ state: Notification.permission }) :
-                        originalQuery(parameters)
-                );
-                
-                // Additional anti-detection measures
-                window.navigator.chrome = { runtime: {} };
-                window.navigator.languages = ['en-US', 'en'];
-                
-                // Fake plugins and mimeTypes
-                Object.defineProperty(navigator, 'plugins', {
-                    get: () => [1, 2, 3, 4, 5]
-                });
-                
-                Object.defineProperty(navigator, 'mimeTypes', {
-                    get: () => [1, 2, 3, 4, 5]
-                });
-            """
-        })
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": ANTI_DETECTION_SCRIPT})
         
+        if cls.BLOCKING_PROFILE:
+            cls.BLOCKING_PROFILE.apply(driver)
+
         # Set window size after creation
         driver.set_window_size(1920, 1080)
-        
+
+        get_metrics().observe("driver_start", time.perf_counter() - started, cls.SOURCE)
         return driver
     
     @abstractmethod
@@ -109,6 +315,14 @@ class BaseScraper(ABC):
         pass
     
     def cleanup(self):
-        """Clean up resources."""
+        """Clean up resources, returning pooled drivers instead of quitting them."""
         if self.driver:
-            self.driver.quit()
\ No newline at end of file
+            if self.BLOCKING_PROFILE and self.BLOCKING_PROFILE.track_stats:
+                self.network_stats.collect(self.driver)
+                print(f"Network: {self.network_stats}")
+
+            if self.driver_pool is not None:
+                self.driver_pool.release(self.driver)
+            else:
+                self.driver.quit()
+            self.driver = None
@@ -1,30 +1,184 @@
+import re
 import time
-from typing import Dict, List, Optional
+import unicodedata
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import quote_plus
 import pandas as pd
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
 from bs4 import BeautifulSoup
-from .base_scraper import BaseScraper
+from utils import cleaning
+from utils.driver_pool import DriverPool
+from utils.network_filter import BlockingProfile
+from utils.place_index import PlaceIndex, place_key
+from utils.scroll_controller import FeedState, ScrollController
+from utils.snapshot_store import SnapshotStore
+from .base_scraper import BaseScraper, retried, timed
+
+# Reports what the place detail panel currently shows in one round trip
+PANEL_STATE_SCRIPT = """
+    const title = document.querySelector('h1.DUwDvf');
+    if (!title) {
+        return null;
+    }
+    const text = (selector) => {
+        const element = document.querySelector(selector);
+        return element ? element.textContent.trim() : null;
+    };
+    return {
+        title: title.textContent.trim(),
+        info_rendered: document.querySelector('[data-item-id]') !== null,
+        address: text('button[data-item-id="address"] div.fontBodyMedium'),
+        phone: text('button[data-item-id^="phone:tel:"] div.fontBodyMedium')
+    };
+"""
+
+# Returns only the result cards not returned before, keyed by their place URL
+NEW_CARDS_SCRIPT = """
+    const seen = window.__scrapedCardKeys || (window.__scrapedCardKeys = new Set());
+    const cards = [];
+    for (const card of document.querySelectorAll("div[role='feed'] div.Nv2PK")) {
+        const link = card.querySelector('a.hfpxzc');
+        const key = link ? link.href : card.textContent;
+        if (seen.has(key)) {
+            continue;
+        }
+        seen.add(key);
+        cards.push({key: key, html: card.outerHTML, element: card});
+    }
+    return cards;
+"""
+
+# Counts the cards in the results feed and checks for its end-of-list message
+FEED_STATE_SCRIPT = """
+    const end = document.evaluate(
+        "//span[contains(text(), 'reached the end') or contains(text(), 'No more results')]",
+        document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+    ).singleNodeValue;
+    return {count: document.querySelectorAll("div[role='feed'] div.Nv2PK").length, end: end !== null};
+"""
+
+# Returns the HTML of the open place detail panel
+PANEL_HTML_SCRIPT = """
+    const title = document.querySelector('h1.DUwDvf');
+    const panel = title && title.closest("div[role='main']");
+    return panel ? panel.outerHTML : null;
+"""
+
+
+class PanelNotShown(Exception):
+    """The detail panel did not show the clicked place in time.
+
+    Not a transient browser error, so it is not retried: clicking the card
+    again would only wait for the same panel a second time.
+    """
+
+
+def _title_key(text: str) -> str:
+    """Normalise a place name for comparing card names with panel titles."""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = text.rstrip().rstrip("…").rstrip(".")
+    return " ".join(re.sub(r"[^\w]+", " ", text).split())
+
+
+class _PanelReady:
+    """Wait condition: the detail panel shows the clicked place and its info rows.
+
+    Returns the panel state once the title matches ``name`` and the info rows
+    (address, phone, website...) are rendered. Titles match after normalising
+    case, punctuation and Unicode forms, and when one is a prefix of the other,
+    since cards truncate long names. If the title matches but no info rows
+    appear within ``grace`` seconds, the place is taken to have none.
+    """
+
+    def __init__(self, name: Optional[str], grace: float):
+        self.name = _title_key(name) if name else None
+        self.grace = grace
+        self.matched_at = None
+
+    def __call__(self, driver) -> Optional[Dict[str, str]]:
+        return self.check(driver.execute_script(PANEL_STATE_SCRIPT))
+
+    def matches(self, title: str) -> bool:
+        """Whether a panel title belongs to the clicked place."""
+        if not self.name:
+            return True
+        title = _title_key(title)
+        return bool(title) and (title.startswith(self.name) or self.name.startswith(title))
+
+    def check(self, state: Optional[Dict[str, str]]) -> Optional[Dict[str, str]]:
+        """Evaluate a PANEL_STATE_SCRIPT result; usable with any browser engine."""
+        if not state or not self.matches(state["title"]):
+            return None
+        if state["info_rendered"]:
+            return state
+
+        if self.matched_at is None:
+            self.matched_at = time.monotonic()
+        elif time.monotonic() - self.matched_at >= self.grace:
+            return state
+        return None
+
 
 class GoogleMapsScraper(BaseScraper):
     """Scraper for Google Maps listings."""
 
-    def __init__(self):
-        """Initialize Google Maps scraper."""
-        super().__init__()
-        self.driver = self._initialize_driver()
+    SOURCE = "google_maps"
+
+    # Columns of the DataFrame returned by scrape()
+    COLUMNS = ["Name", "Rating", "Rating Count", "Category", "Full Address", "Phone Number"]
+
+    # Shown on result cards, so changes are detected before opening the panel
+    DELTA_FIELDS = ["Rating", "Rating Count"]
+
+    # Google stops a feed at about 120 cards, a little fewer on some queries; a feed of at
+    # least this many cards without an end marker is treated as cut off
+    RESULT_CAP = 100
+
+    # Map tiles, satellite imagery and Street View are the bulk of Maps traffic
+    BLOCKING_PROFILE = BlockingProfile().extend(deny=[
+        "*/maps/vt*", "*/maps/vt/*", "*/kh/v=*", "*khms*.google.com*",
+        "*streetviewpixels*", "*lh3.googleusercontent.com*", "*lh5.googleusercontent.com*"
+    ])
+
+    def __init__(
+        self,
+        driver_pool: Optional[DriverPool] = None,
+        snapshot_store: Optional[SnapshotStore] = None,
+        place_index: Optional[PlaceIndex] = None,
+        delta: bool = False
+    ):
+        """
+        Initialize Google Maps scraper.
+
+        Args:
+            driver_pool: Optional pool to borrow the browser from
+            snapshot_store: Optional store that records cards and panels for replay
+            place_index: Optional cross-run index; places fetched recently
+                reuse their stored details instead of opening the panel again
+            delta: Also open the panel for places whose rating or rating
+                count changed, and report changes in ``changes``
+        """
+        super().__init__(driver_pool, snapshot_store, place_index, delta)
         self.base_url = "https://www.google.com/maps"
         self.processed_names = set()
+        self.cards_seen = 0
+        self.reached_end = False
+        self.scroll = ScrollController()
+        # Place keys of the places returned by the last scrape
+        self.place_keys: Set[str] = set()
         
         # Constants
-        self.SCROLL_PAUSE_TIME = 2
-        self.MAX_SCROLL_ATTEMPTS = 10
         self.WAIT_TIMEOUT = 10
         self.DETAIL_TIMEOUT = 7
+        self.POLL_INTERVAL = 0.1
+        self.INFO_GRACE = 1.0
 
+    @retried("search")
+    @timed("search")
     def _search_location(self, query: str) -> None:
         """Perform search on Google Maps."""
         try:
@@ -33,53 +187,90 @@ class GoogleMapsScraper(BaseScraper):
             )
             search_box.clear()
             search_box.send_keys(query)
+            self._throttle()
             search_box.send_keys(Keys.RETURN)
 
             # Wait for search results
-            WebDriverWait(self.driver, self.WAIT_TIMEOUT).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "div[role='feed']"))
-            )
+            self._wait_for_feed()
         except TimeoutException as e:
             print(f"Timeout during search: {str(e)}")
             raise
 
-    def _load_more_results(self) -> List:
-        """Load more results by scrolling."""
+    def _wait_for_feed(self) -> None:
+        """Wait until the results feed is shown."""
+        WebDriverWait(self.driver, self.WAIT_TIMEOUT).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "div[role='feed']"))
+        )
+
+    @retried("search")
+    @timed("search")
+    def _search_viewport(self, query: str, viewport: Tuple[float, float, float]) -> None:
+        """Open the results of ``query`` within a map viewport of (lat, lng, zoom)."""
+        lat, lng, zoom = viewport
+        self._throttle()
+        self.driver.get(f"{self.base_url}/search/{quote_plus(query)}/@{lat:.5f},{lng:.5f},{zoom:g}z")
         try:
+            self._wait_for_feed()
+        except TimeoutException as e:
+            print(f"Timeout during viewport search: {str(e)}")
+            raise
+
+    @staticmethod
+    def viewport_key(query: str, viewport: Tuple[float, float, float]) -> str:
+        """Snapshot and change-set key of a viewport search, e.g. 'Bakeries @28.61000,77.23000,14z'."""
+        lat, lng, zoom = viewport
+        return f"{query} @{lat:.5f},{lng:.5f},{zoom:g}z"
+
+    @property
+    def saturated(self) -> bool:
+        """Whether the last scrape's feed hit Google's result cap, so places were left out."""
+        return not self.reached_end and self.cards_seen >= self.RESULT_CAP
+
+    def _collect_new_cards(self) -> List[Dict]:
+        """
+        Fetch the cards added to the feed since the last call in one round trip.
+
+        Returns:
+            List of dicts with the card's stable 'key' (place URL), its 'html'
+            and the live 'element' used to open the detail panel
+        """
+        cards = self.driver.execute_script(NEW_CARDS_SCRIPT) or []
+        self.cards_seen += len(cards)
+        return cards
+
+    def _feed_state(self) -> FeedState:
+        """Number of cards in the feed and whether its end-of-list message is shown."""
+        return FeedState(**self.driver.execute_script(FEED_STATE_SCRIPT))
+
+    @timed("scroll")
+    def _load_more_results(self) -> List[Dict]:
+        """Scroll until new cards load or the feed ends, and return only the cards not seen yet."""
+        try:
+            if self.scroll.done:
+                return []
             scrollable_div = self.driver.find_element(By.CSS_SELECTOR, "div[role='feed']")
-            current_count = len(self.driver.find_elements(By.CSS_SELECTOR, "div.Nv2PK"))
-            
-            # Try scrolling a few times
-            for _ in range(3):
+
+            def scroll() -> None:
+                self._throttle()
                 self.driver.execute_script(
                     "arguments[0].scrollTo(0, arguments[0].scrollHeight);",
                     scrollable_div
                 )
-                time.sleep(0.5)
-            
-            # Check if we got new results
-            new_count = len(self.driver.find_elements(By.CSS_SELECTOR, "div.Nv2PK"))
-            
-            # If no new results after scrolling, check for end of list
-            if new_count <= current_count:
-                try:
-                    end_message = self.driver.find_element(
-                        By.XPATH, 
-                        "//span[contains(text(), 'reached the end') or contains(text(), 'No more results')]"
-                    )
-                    if end_message:
-                        print("Reached end of results list")
-                        return []
-                except NoSuchElementException:
-                    pass
-
-            time.sleep(self.SCROLL_PAUSE_TIME)
-            return self.driver.find_elements(By.CSS_SELECTOR, "div.Nv2PK")
+
+            # Waits as long as the feed has been taking to load, not a fixed pause
+            state = self.scroll.advance(scroll, self._feed_state)
+            if state.end and not self.reached_end:
+                print("Reached end of results list")
+                self.reached_end = True
+
+            return self._collect_new_cards()
             
         except Exception as e:
             print(f"Error loading more results: {str(e)}")
+            self.scroll.fail()
             return []
 
+    @timed("parse")
     def _extract_basic_info(self, soup: BeautifulSoup) -> Dict[str, str]:
         """Extract basic information from listing."""
         name_tag = soup.find("div", class_="qBF1Pd")
@@ -105,71 +296,127 @@ class GoogleMapsScraper(BaseScraper):
             "Category": category
         }
 
-    def _extract_details(self, result) -> Dict[str, str]:
-        """Extract detailed information from listing."""
+    @staticmethod
+    def _extract_card_location(soup: BeautifulSoup) -> str:
+        """Address snippet shown on a result card after a '·' separator, e.g. '12, MG Road'."""
+        for separator in soup.find_all("span", attrs={"aria-hidden": "true"}, string=lambda text: text and text.strip() == "·"):
+            fragment = separator.find_next_sibling("span")
+            text = fragment.text.strip() if fragment else ""
+            # Skip price levels, which use the same separator
+            if text and not text.startswith(("₹", "$")):
+                return text
+        return ""
+
+    @staticmethod
+    def _extract_panel_info(soup: BeautifulSoup) -> Dict[str, str]:
+        """Extract address and phone from saved detail panel HTML."""
+        address_tag = soup.select_one('button[data-item-id="address"] div.fontBodyMedium')
+        phone_tag = soup.select_one('button[data-item-id^="phone:tel:"] div.fontBodyMedium')
+        return {
+            "Full Address": address_tag.text.strip() if address_tag else "N/A",
+            "Phone Number": phone_tag.text.strip() if phone_tag else "N/A"
+        }
+
+    def _wait_for_panel_closed(self) -> None:
+        """Wait until the detail panel is dismissed before clicking the next card."""
+        try:
+            WebDriverWait(self.driver, self.WAIT_TIMEOUT, poll_frequency=self.POLL_INTERVAL).until(
+                EC.invisibility_of_element_located((By.CSS_SELECTOR, "h1.DUwDvf"))
+            )
+        except TimeoutException:
+            print("Detail panel did not close in time")
+
+    @retried("details")
+    def _extract_details(self, result, name: Optional[str] = None, card_key: Optional[str] = None) -> Dict[str, str]:
+        """
+        Extract detailed information from listing.
+
+        Args:
+            result: Result card WebElement to open
+            name: Card name the detail panel title must match before reading it
+            card_key: Card identifier the panel snapshot is recorded under
+
+        Raises:
+            PanelNotShown: The panel did not show this place in time; only
+                failures to open it are retried
+        """
         try:
             clickable = result.find_element(By.CSS_SELECTOR, "a.hfpxzc")
+            self._throttle()
             self.driver.execute_script("arguments[0].click();", clickable)
-            
-            details_panel = WebDriverWait(self.driver, self.DETAIL_TIMEOUT).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "div.m6QErb.tLjsW"))
-            )
-            time.sleep(1.5)
 
-            # Extract phone number
+            # Return as soon as the panel for this place has rendered its info rows
             try:
-                phone_element = WebDriverWait(self.driver, 2).until(
-                    EC.presence_of_element_located((By.XPATH,
-                        '//button[contains(@data-item-id, "phone:tel:")]//div[contains(@class, "fontBodyMedium")]'))
-                )
-                phone_number = phone_element.text.strip()
-            except (TimeoutException, NoSuchElementException):
-                phone_number = "N/A"
+                panel = WebDriverWait(
+                    self.driver, self.DETAIL_TIMEOUT, poll_frequency=self.POLL_INTERVAL
+                ).until(_PanelReady(name, self.INFO_GRACE))
+            except TimeoutException:
+                raise PanelNotShown(f"Detail panel for '{name}' did not load") from None
 
-            # Extract address
-            try:
-                address_element = WebDriverWait(self.driver, 2).until(
-                    EC.presence_of_element_located((By.XPATH,
-                        '//button[@data-item-id="address"]//div[contains(@class, "fontBodyMedium")]'))
-                )
-                address = address_element.text.strip()
-            except (TimeoutException, NoSuchElementException):
-                address = "N/A"
+            if self.snapshot_store is not None:
+                self._snapshot("details", self.driver.execute_script(PANEL_HTML_SCRIPT), card_key=card_key)
 
             return {
-                "Full Address": address,
-                "Phone Number": phone_number
+                "Full Address": panel["address"] or "N/A",
+                "Phone Number": panel["phone"] or "N/A"
             }
         finally:
             # Return to results list
             self.driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ESCAPE)
-            time.sleep(1)
+            self._wait_for_panel_closed()
+
+    def scrape(
+        self,
+        query: str,
+        num_results: Optional[int] = None,
+        viewport: Optional[Tuple[float, float, float]] = None,
+        change_scope: Optional[str] = None,
+        skip_keys: Optional[Set[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Main scraping method to collect and process Google Maps listings.
 
-    def scrape(self, query: str, num_results: Optional[int] = None) -> pd.DataFrame:
-        """Main scraping method to collect and process Google Maps listings."""
+        Args:
+            query: Search query, e.g. 'Bakeries in Pune'
+            num_results: Optional cap on the number of places
+            viewport: Optional (lat, lng, zoom) to search within instead of
+                the query's own area; snapshots and changes are then keyed
+                by viewport_key()
+            change_scope: Optional scope shared with other scrapes, e.g. the
+                city a tile belongs to; changes are then collected for its
+                owner to merge instead of closing the scope here
+            skip_keys: Place keys already collected by another scrape, e.g.
+                an overlapping tile; their panels are not opened again and
+                they are left out of the results
+
+        Raises:
+            Exception: Any error that stopped the scrape, after the driver was released
+        """
         try:
-            self.driver.get(self.base_url)
-            self._search_location(query)
+            self._acquire_driver()
+            key = self.viewport_key(query, viewport) if viewport else query
+            self._start_snapshots(key)
+            self._start_changes(change_scope or key, shared=change_scope is not None)
+            self.place_keys = set()
+            self.cards_seen = 0
+            self.reached_end = False
+            self.scroll = ScrollController()
+            if viewport:
+                self._search_viewport(query, viewport)
+            else:
+                self._navigate(self.base_url)
+                self._search_location(query)
 
             places_data = []
-            scroll_attempts = 0
+            reused = 0
             results = self._load_more_results()
-            last_count = 0
 
-            # Keep scrolling until we have enough results or no more are available
-            while (num_results is None or len(places_data) < num_results) and scroll_attempts < self.MAX_SCROLL_ATTEMPTS:
+            # Keep scrolling until we have enough results or the feed is exhausted
+            while num_results is None or len(places_data) < num_results:
                 if not results:
-                    # Check if we're truly at the end
-                    current_count = len(places_data)
-                    if current_count == last_count:
-                        scroll_attempts += 1
-                        if scroll_attempts >= 3:  # Give up after 3 attempts with no new results
-                            print(f"No more results available. Found {len(places_data)} places.")
-                            break
-                    else:
-                        last_count = current_count
-                        scroll_attempts = 0
-                    
+                    if self.scroll.done:
+                        print(f"No more results available. Found {len(places_data)} places.")
+                        break
                     results = self._load_more_results()
                     continue
 
@@ -181,22 +428,42 @@ class GoogleMapsScraper(BaseScraper):
                 current_batch = results[:batch_size]
                 results = results[batch_size:]
 
-                for result in current_batch:
+                for card in current_batch:
                     try:
                         # Extract basic information
-                        soup = BeautifulSoup(result.get_attribute("outerHTML"), "lxml")
+                        soup = BeautifulSoup(card["html"], "lxml")
                         basic_info = self._extract_basic_info(soup)
                         
                         if basic_info["Name"] in self.processed_names or basic_info["Name"] == "N/A":
                             continue
                         self.processed_names.add(basic_info["Name"])
 
-                        # Extract detailed information
-                        detailed_info = self._extract_details(result)
+                        # Reuse details of unchanged places fetched recently by an earlier run
+                        key = place_key(basic_info["Name"], self._extract_card_location(soup))
+                        if skip_keys and key in skip_keys:
+                            continue
+                        change = self._change_set.compare(key, basic_info) if self._change_set else None
+                        known = None
+                        if change is None and self.place_index is not None:
+                            known = self.place_index.lookup(self.SOURCE, key)
+                        if known is not None:
+                            reused += 1
+                            detailed_info = {column: known.get(column, "N/A") for column in ("Full Address", "Phone Number")}
+                            # No panel is recorded, so replay takes the reused details from the manifest
+                            self._snapshot("card", card["html"], card_key=card["key"], details=detailed_info)
+                        else:
+                            # Extract detailed information
+                            with self._span("details", place=basic_info["Name"]):
+                                detailed_info = self._extract_details(card["element"], basic_info["Name"], card["key"])
+                            if self.place_index is not None:
+                                self.place_index.store(self.SOURCE, key, {**basic_info, **detailed_info})
+                            self._snapshot("card", card["html"], card_key=card["key"])
                         
                         # Combine information
                         place_info = {**basic_info, **detailed_info}
                         places_data.append(place_info)
+                        self.place_keys.add(key)
+                        self._report(place_info)
 
                         print(f"Processed: {place_info['Name']} ({len(places_data)}/{num_results})")
 
@@ -208,33 +475,71 @@ class GoogleMapsScraper(BaseScraper):
                         continue
 
             print(f"Scraping completed. Found {len(places_data)} places.")
-            df = pd.DataFrame(places_data)
-            
-            # Clean numeric data
-            if not df.empty:
-                df['Rating'] = df['Rating'].apply(self.clean_rating)
-                df['Rating Count'] = df['Rating Count'].apply(self.clean_rating_count)
-            
-            return df
+            # A capped scrape, or a feed cut off by Google, does not see the whole listing,
+            # so it cannot tell what was removed
+            self._finish_changes(complete=num_results is None and bool(places_data) and not self.saturated)
+            if self.place_index is not None:
+                print(f"Reused stored details for {reused} known places.")
+            return self._build_dataframe(places_data)
 
         except Exception as e:
+            # Re-raised so batch runs record the city as failed and retry it, rather than as empty
             print(f"Fatal error occurred: {str(e)}")
-            return pd.DataFrame()
+            raise
         finally:
             self.cleanup()
 
-    @staticmethod
-    def clean_rating(rating: str) -> Optional[float]:
-        """Clean rating string to float."""
-        try:
-            return float(rating)
-        except (ValueError, TypeError):
-            return None
+    @timed("clean")
+    def _build_dataframe(self, places_data: List[Dict[str, str]]) -> pd.DataFrame:
+        """Create the results DataFrame and clean numeric columns."""
+        df = pd.DataFrame(places_data)
+        
+        # Clean numeric data
+        if not df.empty:
+            df['Rating'] = cleaning.clean_rating(df['Rating'])
+            df['Rating Count'] = cleaning.clean_count(df['Rating Count'])
+        
+        return df
 
-    @staticmethod
-    def clean_rating_count(count: str) -> Optional[int]:
-        """Clean rating count string to integer."""
-        try:
-            return int(''.join(filter(str.isdigit, count)))
-        except (ValueError, TypeError):
-            return None
\ No newline at end of file
+    def replay(self, query: str, num_results: Optional[int] = None) -> pd.DataFrame:
+        """
+        Re-run extraction on the snapshots recorded for ``query``, without a browser.
+
+        Args:
+            query: Query the snapshots were recorded under
+            num_results: Optional cap on the number of places
+
+        Returns:
+            DataFrame in the same format as scrape()
+        """
+        entries = self._replay_snapshots(query)
+        panels = {
+            entry.get("card_key"): entry["html"]
+            for entry in entries if entry["kind"] == "details"
+        }
+
+        places_data = []
+        for entry in entries:
+            if entry["kind"] != "card":
+                continue
+            basic_info = self._extract_basic_info(BeautifulSoup(entry["html"], "lxml"))
+            if basic_info["Name"] in self.processed_names or basic_info["Name"] == "N/A":
+                continue
+            self.processed_names.add(basic_info["Name"])
+
+            panel_html = panels.get(entry.get("card_key"))
+            if entry.get("details"):
+                # Details the live run reused from the place index
+                detailed_info = dict(entry["details"])
+            elif panel_html:
+                with self._span("parse"):
+                    detailed_info = self._extract_panel_info(BeautifulSoup(panel_html, "lxml"))
+            else:
+                detailed_info = {"Full Address": "N/A", "Phone Number": "N/A"}
+            places_data.append({**basic_info, **detailed_info})
+
+            if num_results and len(places_data) >= num_results:
+                break
+
+        print(f"Replay completed. Found {len(places_data)} places.")
+        return self._build_dataframe(places_data)
@@ -1,9 +1,10 @@
 import time
+import json
 import re
 from typing import Dict, List, Optional
 
 import pandas as pd
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
@@ -12,36 +13,90 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
-from .base_scraper import BaseScraper
+from utils import cleaning
+from utils.driver_pool import DriverPool
+from utils.http_fetcher import FetchBlocked, get_http_fetcher
+from utils.metrics import get_metrics
+from utils.network_filter import BlockingProfile
+from utils.place_index import PlaceIndex
+from utils.snapshot_store import SnapshotStore
+from .base_scraper import ENGINES, BaseScraper, chromedriver_path, retried, timed
+
+# Collects every store listing on the current page in one round trip
+PAGE_LISTINGS_SCRIPT = """
+    return Array.from(document.getElementsByClassName('store-details'))
+        .map((store) => store.outerHTML)
+        .join('');
+"""
+
+# Search queries of the form "<what> in <city>" map onto listing URLs
+QUERY_PATTERN = re.compile(r'^\s*(?P<what>.+?)\s+in\s+(?P<city>.+?)\s*$', re.IGNORECASE)
+
 
 class JustDialScraper(BaseScraper):
     """Scraper for JustDial business listings."""
 
-    def __init__(self):
-        """Initialize JustDial scraper."""
-        super().__init__()
-        self.driver = self._initialize_justdial_driver()
+    SOURCE = "justdial"
+
+    # Place identity and the listing fields compared in delta mode
+    NAME_FIELD = "Store Name"
+    LOCATION_FIELD = "Address"
+    DELTA_FIELDS = ["Rating", "Rating Count"]
+
+    # Listings and revealed phone numbers are read as text; embedded maps are not needed
+    BLOCKING_PROFILE = BlockingProfile().extend(deny=["*maps.googleapis.com*", "*maps.gstatic.com*"])
+
+    def __init__(
+        self,
+        driver_pool: Optional[DriverPool] = None,
+        engine: str = "auto",
+        snapshot_store: Optional[SnapshotStore] = None,
+        place_index: Optional[PlaceIndex] = None,
+        delta: bool = False
+    ):
+        """
+        Initialize JustDial scraper.
+
+        Args:
+            driver_pool: Optional pool to borrow the browser from
+            engine: 'auto' (HTTP first, browser fallback unless every HTTP
+                listing has a phone number), 'http' (no phone numbers) or 'browser'
+            snapshot_store: Optional store that records listing pages for replay
+            place_index: Optional cross-run index the listings are recorded in
+            delta: Report listings added or changed since the last run in ``changes``
+        """
+        super().__init__(driver_pool, snapshot_store, place_index, delta)
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine '{engine}', expected one of {ENGINES}")
         self.base_url = "https://www.justdial.com"
+        self.engine = engine
         
         # Constants
         self.WAIT_TIMEOUT = 10
         self.PAGE_LOAD_DELAY = 5
         self.CLICK_DELAY = 3
 
-    def _initialize_justdial_driver(self) -> webdriver.Chrome:
+    @classmethod
+    def create_driver(cls) -> webdriver.Chrome:
         """Initialize Chrome WebDriver with JustDial-specific options."""
+        started = time.perf_counter()
         chrome_options = Options()
         chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64)")
         chrome_options.add_argument("--headless")
+        if cls.BLOCKING_PROFILE:
+            cls.BLOCKING_PROFILE.configure_options(chrome_options)
         
         driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()),
+            service=Service(chromedriver_path()),
             options=chrome_options
         )
+        if cls.BLOCKING_PROFILE:
+            cls.BLOCKING_PROFILE.apply(driver)
         driver.maximize_window()
+        get_metrics().observe("driver_start", time.perf_counter() - started, cls.SOURCE)
         return driver
 
+    @timed("show_numbers")
     def _click_show_numbers(self) -> None:
         """Click on show number buttons to reveal phone numbers."""
         try:
@@ -50,19 +105,17 @@ class JustDialScraper(BaseScraper):
             )
             for number in numbers:
                 try:
+                    self._throttle()
                     number.click()
                 except:
                     continue
-            time.sleep(self.CLICK_DELAY)
+            self._sleep(self.CLICK_DELAY)
         except TimeoutException:
             print("No phone numbers found to click.")
 
-    def _extract_store_details(self, element) -> Optional[Dict[str, str]]:
-        """Extract information from a single store listing."""
+    def _extract_store_details(self, soup: Tag) -> Optional[Dict[str, str]]:
+        """Extract information from a single parsed store listing."""
         try:
-            outer_html_text = element.get_attribute("outerHTML")
-            soup = BeautifulSoup(outer_html_text, "lxml")
-
             # Extract store name
             name_elem = soup.find("h2", class_="store-name")
             if not name_elem or not name_elem.span or not name_elem.span.a:
@@ -99,34 +152,148 @@ class JustDialScraper(BaseScraper):
             print(f"Error extracting store details: {str(e)}")
             return None
 
+    @timed("parse")
+    def extract_stores_from_html(self, html: str) -> List[Dict[str, str]]:
+        """
+        Extract all store listings from page HTML with a single parse.
+
+        Works on the live results page as well as on saved HTML files.
+
+        Args:
+            html: HTML containing one or more 'store-details' elements
+
+        Returns:
+            List of store info dictionaries
+        """
+        soup = BeautifulSoup(html, "lxml")
+        stores = []
+        for element in soup.find_all(class_="store-details"):
+            store_info = self._extract_store_details(element)
+            if store_info:
+                stores.append(store_info)
+        return stores
+
+    @staticmethod
+    def _extract_json_ld_stores(soup: BeautifulSoup) -> List[Dict[str, str]]:
+        """Extract stores from schema.org LocalBusiness JSON-LD blocks."""
+        businesses = []
+        for script in soup.find_all("script", type="application/ld+json"):
+            try:
+                data = json.loads(script.string or "")
+            except ValueError:
+                continue
+
+            items = data if isinstance(data, list) else [data]
+            for item in items:
+                if isinstance(item, dict) and item.get("@type") == "ItemList":
+                    items.extend(
+                        element.get("item", element)
+                        for element in item.get("itemListElement", [])
+                        if isinstance(element, dict)
+                    )
+                elif isinstance(item, dict) and item.get("name") and item.get("address"):
+                    businesses.append(item)
+
+        stores = []
+        for business in businesses:
+            address = business["address"]
+            if isinstance(address, dict):
+                address = ", ".join(
+                    str(address[key]) for key in ("streetAddress", "addressLocality")
+                    if address.get(key)
+                )
+            rating = business.get("aggregateRating") or {}
+            stores.append({
+                "Store Name": str(business["name"]).strip(),
+                "Address": str(address).strip() or "N/A",
+                "Rating": str(rating.get("ratingValue", "N/A")),
+                "Rating Count": str(rating.get("ratingCount", "0")),
+                "Phone Number": str(business.get("telephone", "N/A"))
+            })
+        return stores
+
+    def _extract_page_stores(self, html: str) -> List[Dict[str, str]]:
+        """Extract stores from a full listing page, using JSON-LD if no listing markup is present."""
+        stores = self.extract_stores_from_html(html)
+        if not stores:
+            stores = self._extract_json_ld_stores(BeautifulSoup(html, "lxml"))
+        return stores
+
+    def _listing_url(self, query: str, page: int) -> Optional[str]:
+        """Build the listing URL for a '<what> in <city>' query, if it has that form."""
+        match = QUERY_PATTERN.match(query)
+        if not match:
+            return None
+        city = match.group("city").title().replace(" ", "-")
+        what = "-".join(match.group("what").title().split())
+        url = f"{self.base_url}/{city}/{what}"
+        return url if page == 1 else f"{url}/page-{page}"
+
+    def _scrape_http(self, query: str, num_pages: int) -> List[Dict[str, str]]:
+        """Fetch listing pages over pooled HTTP connections, without a browser."""
+        if not self._listing_url(query, 1):
+            print("Query is not of the form '<what> in <city>', skipping HTTP fetch")
+            return []
+
+        store_data = []
+        for page in range(1, num_pages + 1):
+            try:
+                with self._span("http_fetch"):
+                    html = get_http_fetcher().get(self._listing_url(query, page))
+            except FetchBlocked as e:
+                print(f"HTTP fetch blocked: {str(e)}")
+                break
+            except Exception as e:
+                print(f"HTTP fetch failed on page {page}: {str(e)}")
+                break
+
+            self._snapshot("page", html, page=page)
+            stores = self._extract_page_stores(html)
+            if not stores:
+                break
+            store_data.extend(stores)
+            print(f"HTTP page {page}: {len(stores)} listings")
+
+        return store_data
+
+    def _http_complete(self, store_data: List[Dict[str, str]]) -> bool:
+        """
+        Whether HTTP listings can stand in for the browser's.
+
+        JustDial hides phone numbers until 'show number' is clicked, so
+        listings fetched over HTTP usually lack them; they are only used
+        when every store came with a number.
+        """
+        return bool(store_data) and all(
+            self._clean_phone(store["Phone Number"]) for store in store_data
+        )
+
+    @timed("next_page")
     def _go_to_next_page(self) -> bool:
         """Navigate to the next page of results."""
         try:
             next_page = WebDriverWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.XPATH, "//a[@rel='next']"))
             )
+            self._throttle()
             next_page.click()
-            time.sleep(self.PAGE_LOAD_DELAY)
+
+            # Wait for the old page to go away, then for the new listings
+            WebDriverWait(self.driver, self.PAGE_LOAD_DELAY).until(EC.staleness_of(next_page))
+            self._wait_for_listings()
             return True
         except Exception as e:
             print(f"Error: Unable to navigate to the next page. {str(e)}")
             return False
 
-    @staticmethod
-    def _clean_rating(rating: str) -> Optional[float]:
-        """Clean rating string to float."""
+    def _wait_for_listings(self) -> None:
+        """Wait until store listings are rendered instead of sleeping a fixed delay."""
         try:
-            return float(rating.replace('/5', '').strip())
-        except (ValueError, AttributeError):
-            return None
-
-    @staticmethod
-    def _clean_rating_count(count: str) -> Optional[int]:
-        """Clean rating count string to integer."""
-        try:
-            return int(''.join(filter(str.isdigit, count)))
-        except (ValueError, TypeError):
-            return None
+            WebDriverWait(self.driver, self.WAIT_TIMEOUT).until(
+                EC.presence_of_element_located((By.CLASS_NAME, "store-details"))
+            )
+        except TimeoutException:
+            pass
 
     @staticmethod
     def _clean_phone(phone: str) -> str:
@@ -145,72 +312,116 @@ class JustDialScraper(BaseScraper):
             DataFrame containing business information
         """
         try:
-            self.driver.get(self.base_url)
-            
-            # Search
-            try:
-                search_box = WebDriverWait(self.driver, self.WAIT_TIMEOUT).until(
-                    EC.presence_of_element_located((By.CLASS_NAME, "input_search"))
-                )
-                search_box.clear()
-                search_box.send_keys(query)
-                search_box.send_keys(Keys.RETURN)
-                time.sleep(self.PAGE_LOAD_DELAY)
-            except:
-                print("Search box not found or Justdial blocked the request.")
-                return pd.DataFrame()
-
+            self._start_snapshots(query)
+            self._start_changes(query)
             store_data = []
+            if self.engine != "browser":
+                store_data = self._scrape_http(query, num_pages)
+                if self.engine == "auto" and not self._http_complete(store_data):
+                    print("HTTP fetch incomplete or without phone numbers, falling back to browser")
+                    store_data = []
+                    self._start_snapshots(query)
+                for store_info in store_data:
+                    self._report(store_info)
+
+            if not store_data and self.engine != "http":
+                store_data = self._scrape_browser(query, num_pages)
+
+            self._index_listings(store_data)
+            # Only the first num_pages pages are read, so missing stores may just have moved down
+            self._finish_changes(complete=False)
+            return self._build_dataframe(store_data)
+
+        except Exception as e:
+            print(f"Fatal error occurred: {str(e)}")
+            return pd.DataFrame()
+        finally:
+            self.cleanup()
+
+    def replay(self, query: str) -> pd.DataFrame:
+        """Re-run extraction on the pages recorded for ``query``, without a browser."""
+        store_data = []
+        for entry in self._replay_snapshots(query):
+            if entry["kind"] == "page":
+                store_data.extend(self._extract_page_stores(entry["html"]))
+            elif entry["kind"] == "listings":
+                store_data.extend(self.extract_stores_from_html(entry["html"]))
+        return self._build_dataframe(store_data)
+
+    @timed("clean")
+    def _build_dataframe(self, store_data: List[Dict[str, str]]) -> pd.DataFrame:
+        """Create the results DataFrame, clean it and drop duplicate listings."""
+        df = pd.DataFrame(store_data)
+        if not df.empty:
+            # Clean data
+            df['Rating'] = cleaning.clean_rating(df['Rating'])
+            df['Rating Count'] = cleaning.clean_count(df['Rating Count'])
+            df['Phone Number'] = cleaning.clean_phone(df['Phone Number'])
             
-            for page in range(num_pages):
-                try:
-                    print(f"Processing page {page + 1}")
-                    
-                    # Click show numbers
-                    self._click_show_numbers()
-
-                    # Extract store details
-                    store_elements = self.driver.find_elements(By.CLASS_NAME, "store-details")
-                    if not store_elements:
-                        print(f"No results found on page {page + 1}")
-                        break
+            # Remove duplicates based on both name and address
+            total_before = len(df)
+            df = df.drop_duplicates(subset=['Store Name', 'Address'], keep='first')
+            duplicates_removed = total_before - len(df)
+            
+            print(f"Total listings found: {total_before}")
+            print(f"Duplicates removed: {duplicates_removed}")
+            print(f"Final unique listings: {len(df)}")
 
-                    for element in store_elements:
-                        store_info = self._extract_store_details(element)
-                        if store_info:
-                            store_data.append(store_info)
-                            print(f"Processed: {store_info['Store Name']}")
+        return df
 
-                    if page < num_pages - 1:
-                        if not self._go_to_next_page():
-                            print(f"No more pages available after page {page + 1}")
-                            break
+    @retried("search")
+    @timed("search")
+    def _search(self, query: str) -> None:
+        """Submit ``query`` in the search box and wait for the listings."""
+        search_box = WebDriverWait(self.driver, self.WAIT_TIMEOUT).until(
+            EC.presence_of_element_located((By.CLASS_NAME, "input_search"))
+        )
+        search_box.clear()
+        search_box.send_keys(query)
+        self._throttle()
+        search_box.send_keys(Keys.RETURN)
+        self._wait_for_listings()
 
-                except Exception as e:
-                    print(f"Error processing page {page + 1}: {str(e)}")
-                    break
+    def _scrape_browser(self, query: str, num_pages: int) -> List[Dict[str, str]]:
+        """Search and page through listings in Chrome, revealing phone numbers."""
+        self._acquire_driver()
+        self._navigate(self.base_url)
 
-            # Create DataFrame and clean data
-            df = pd.DataFrame(store_data)
-            if not df.empty:
-                # Clean data
-                df['Rating'] = df['Rating'].apply(self._clean_rating)
-                df['Rating Count'] = df['Rating Count'].apply(self._clean_rating_count)
-                df['Phone Number'] = df['Phone Number'].apply(self._clean_phone)
-                
-                # Remove duplicates based on both name and address
-                total_before = len(df)
-                df = df.drop_duplicates(subset=['Store Name', 'Address'], keep='first')
-                duplicates_removed = total_before - len(df)
+        # Search
+        try:
+            self._search(query)
+        except:
+            print("Search box not found or Justdial blocked the request.")
+            return []
+
+        store_data = []
+
+        for page in range(num_pages):
+            try:
+                print(f"Processing page {page + 1}")
                 
-                print(f"Total listings found: {total_before}")
-                print(f"Duplicates removed: {duplicates_removed}")
-                print(f"Final unique listings: {len(df)}")
+                # Click show numbers
+                self._click_show_numbers()
 
-            return df
+                # Extract store details from the whole page at once
+                page_html = self.driver.execute_script(PAGE_LISTINGS_SCRIPT)
+                if not page_html:
+                    print(f"No results found on page {page + 1}")
+                    break
+                self._snapshot("listings", page_html, page=page + 1)
 
-        except Exception as e:
-            print(f"Fatal error occurred: {str(e)}")
-            return pd.DataFrame()
-        finally:
-            self.cleanup()
\ No newline at end of file
+                for store_info in self.extract_stores_from_html(page_html):
+                    store_data.append(store_info)
+                    self._report(store_info)
+                    print(f"Processed: {store_info['Store Name']}")
+
+                if page < num_pages - 1:
+                    if not self._go_to_next_page():
+                        print(f"No more pages available after page {page + 1}")
+                        break
+
+            except Exception as e:
+                print(f"Error processing page {page + 1}: {str(e)}")
+                break
+
+        return store_data
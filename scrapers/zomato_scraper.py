@@ -1,39 +1,92 @@
-import time
-import random
+import json
 import re
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 
 import pandas as pd
 from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from .base_scraper import BaseScraper
+from selenium.common.exceptions import NoSuchElementException
+from utils import cleaning
+from utils.driver_pool import DriverPool
+from utils.http_fetcher import FetchBlocked, get_http_fetcher
+from utils.network_filter import BlockingProfile
+from utils.place_index import PlaceIndex
+from utils.scroll_controller import FeedState, ScrollController
+from utils.snapshot_store import SnapshotStore
+from .base_scraper import ENGINES, BaseScraper, retried, timed
+
+# Returns the HTML of listings added since the last call and marks them as seen
+NEW_LISTINGS_SCRIPT = """
+    const listings = document.querySelectorAll('div.sc-evWYkj:not([data-scraped])');
+    const html = [];
+    for (const listing of listings) {
+        listing.setAttribute('data-scraped', '1');
+        html.push(listing.outerHTML);
+    }
+    return {html: html.join(''), count: listings.length};
+"""
+
+# Page height grows as lazy-loaded listings are appended
+PAGE_STATE_SCRIPT = "return {count: document.body.scrollHeight, end: false};"
+
+# Server-rendered Redux state embedded in Zomato pages
+PRELOADED_STATE_PATTERN = re.compile(r'window\.__PRELOADED_STATE__\s*=\s*JSON\.parse\(("(?:[^"\\]|\\.)*")\)')
+
+# Keys under which the embedded state reports the total number of listings for the search
+STATE_TOTAL_KEYS = ("totalResults", "total_results", "resultsCount", "totalCount")
+
 
 class ZomatoBakeryScraper(BaseScraper):
     """A class to scrape bakery information from Zomato."""
 
+    SOURCE = "zomato"
+
+    # Place identity and the listing fields compared in delta mode
+    LOCATION_FIELD = "Location"
+    DELTA_FIELDS = ["Rating", "Cost for Two"]
+
+    # Listings are read as text; embedded maps are not needed
+    BLOCKING_PROFILE = BlockingProfile().extend(deny=["*maps.googleapis.com*", "*maps.gstatic.com*"])
+
     # Class constants
-    SCROLL_PAUSE_TIME = (1.5, 3.5)
-    MAX_SCROLL_ATTEMPTS = 10
+    # Scroll wait before any listing latency has been observed
+    SCROLL_TIMEOUT = 3.5
     WAIT_TIMEOUT = 10
     
-    PRICE_RANGES = [
-        (0, 300, 'Budget Friendly'),
-        (300, 600, 'Pocket Friendly'),
-        (600, 1000, 'Moderate'),
-        (1000, 1500, 'Premium'),
-        (1500, float('inf'), 'Luxury')
-    ]
-
-    def __init__(self, city: str):
-        """Initialize Zomato scraper with city name."""
-        super().__init__()
+    PRICE_RANGES = cleaning.PRICE_RANGES
+
+    def __init__(
+        self,
+        city: str,
+        driver_pool: Optional[DriverPool] = None,
+        engine: str = "auto",
+        snapshot_store: Optional[SnapshotStore] = None,
+        place_index: Optional[PlaceIndex] = None,
+        delta: bool = False
+    ):
+        """
+        Initialize Zomato scraper with city name.
+
+        Args:
+            city: City name as used in Zomato URLs
+            driver_pool: Optional pool to borrow the browser from
+            engine: 'auto' (HTTP first, browser fallback), 'http' or 'browser'
+            snapshot_store: Optional store that records listing HTML for replay
+            place_index: Optional cross-run index the listings are recorded in
+            delta: Report listings added, changed or removed since the last run in ``changes``
+        """
+        super().__init__(driver_pool, snapshot_store, place_index, delta)
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine '{engine}', expected one of {ENGINES}")
         self.city = city.lower()
         self.base_url = f"https://www.zomato.com/{self.city}/bakeries"
-        self.driver = self._initialize_driver()
+        self.engine = engine
         self.processed_bakeries = set()
+        # Listing count the HTTP page reports, and whether the last collection saw every listing
+        self.http_total: Optional[int] = None
+        self.listing_complete = False
 
     def _wait_for_element(self, by: By, value: str, timeout: Optional[int] = None) -> None:
         """Wait for an element to be present on the page."""
@@ -42,6 +95,20 @@ class ZomatoBakeryScraper(BaseScraper):
             EC.presence_of_element_located((by, value))
         )
 
+    def _page_state(self) -> FeedState:
+        """Current page height, which grows as listings load."""
+        return FeedState(**self.driver.execute_script(PAGE_STATE_SCRIPT))
+
+    @timed("scroll_wait")
+    def _scroll_page(self, scroll: ScrollController) -> None:
+        """Scroll to the bottom and wait as long as new listings have been taking to load."""
+        def scroll_down() -> None:
+            # Pace requests through the shared rate limiter
+            self._throttle()
+            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+
+        scroll.advance(scroll_down, self._page_state)
+
     def _extract_listing_info(self, listing: BeautifulSoup) -> Optional[Dict[str, str]]:
         """Extract information from a single bakery listing."""
         try:
@@ -73,88 +140,183 @@ class ZomatoBakeryScraper(BaseScraper):
             print(f"Error extracting listing info: {str(e)}")
             return None
 
-    def _scroll_and_extract_listings(self) -> List[Dict[str, str]]:
-        """Scroll through the page and extract all bakery listings."""
-        try:
-            self.driver.get(self.base_url)
-            time.sleep(5)  # Initial load delay
-            
-            try:
-                # Wait for main content to load
-                WebDriverWait(self.driver, 20).until(
-                    EC.presence_of_element_located((By.CLASS_NAME, "sc-evWYkj"))
-                )
-            except TimeoutException:
-                print("Initial page load timeout, retrying...")
-                self.driver.refresh()
-                time.sleep(5)
-                WebDriverWait(self.driver, 20).until(
-                    EC.presence_of_element_located((By.CLASS_NAME, "sc-evWYkj"))
-                )
+    @staticmethod
+    def _iter_state_listings(node) -> Iterator[Dict]:
+        """Yield restaurant 'info' objects found anywhere in the preloaded state."""
+        if isinstance(node, dict):
+            info = node.get('info')
+            if isinstance(info, dict) and info.get('name'):
+                yield info
+                return
+            for value in node.values():
+                yield from ZomatoBakeryScraper._iter_state_listings(value)
+        elif isinstance(node, list):
+            for value in node:
+                yield from ZomatoBakeryScraper._iter_state_listings(value)
 
-            unique_bakeries = []
-            scroll_attempts = 0
-            last_height = self.driver.execute_script("return document.body.scrollHeight")
+    @staticmethod
+    def _find_state_total(node) -> Optional[int]:
+        """Return the first total listing count found anywhere in the preloaded state."""
+        if isinstance(node, dict):
+            for key in STATE_TOTAL_KEYS:
+                if isinstance(node.get(key), int):
+                    return node[key]
+            values = node.values()
+        elif isinstance(node, list):
+            values = node
+        else:
+            return None
+        for value in values:
+            total = ZomatoBakeryScraper._find_state_total(value)
+            if total is not None:
+                return total
+        return None
 
-            while scroll_attempts < self.MAX_SCROLL_ATTEMPTS:
-                # Scroll down
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(random.uniform(*self.SCROLL_PAUSE_TIME))
+    def _state_total(self, html: str) -> Optional[int]:
+        """Total number of listings the page's embedded state reports, if it reports one."""
+        match = PRELOADED_STATE_PATTERN.search(html)
+        if not match:
+            return None
+        try:
+            return self._find_state_total(json.loads(json.loads(match.group(1))))
+        except ValueError:
+            return None
 
-                # Extract listings
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-                listings = soup.find_all('div', class_='sc-evWYkj')
+    def _extract_state_listings(self, html: str) -> List[Dict[str, str]]:
+        """Extract listings from the embedded __PRELOADED_STATE__ JSON."""
+        match = PRELOADED_STATE_PATTERN.search(html)
+        if not match:
+            return []
 
-                for listing in listings:
-                    listing_info = self._extract_listing_info(listing)
-                    if listing_info:
-                        unique_bakeries.append(listing_info)
-                        print(f"Processed: {listing_info['Name']}")
+        state = json.loads(json.loads(match.group(1)))
+        listings = []
+        for info in self._iter_state_listings(state):
+            name = info['name'].strip()
+            if name in self.processed_bakeries:
+                continue
+            self.processed_bakeries.add(name)
 
-                # Check if scroll reached bottom
-                new_height = self.driver.execute_script("return document.body.scrollHeight")
-                if new_height == last_height:
-                    scroll_attempts += 1
-                else:
-                    scroll_attempts = 0
-                last_height = new_height
+            rating = (info.get('rating') or {}).get('aggregate_rating')
+            cost = (info.get('cft') or {}).get('text')
+            location = (info.get('locality') or {}).get('name')
+            listings.append({
+                'Name': name,
+                'Rating': str(rating) if rating else 'N/A',
+                'Cost for Two': cost or 'N/A',
+                'Location': location or 'N/A'
+            })
+        return listings
 
-            return unique_bakeries
+    @timed("http_fetch")
+    def _fetch_listings_http(self) -> List[Dict[str, str]]:
+        """Fetch the listing page over HTTP and parse rendered HTML or embedded state.
 
+        Sets ``http_total`` to the listing count the page reports, if any.
+        """
+        self.http_total = None
+        try:
+            html = get_http_fetcher().get(self.base_url)
+        except FetchBlocked as e:
+            print(f"HTTP fetch blocked: {str(e)}")
+            return []
         except Exception as e:
-            print(f"Error during scroll and extraction: {str(e)}")
+            print(f"HTTP fetch failed: {str(e)}")
             return []
 
-    @staticmethod
-    def _clean_cost(cost: str) -> Optional[int]:
-        """Clean cost string to extract numerical value."""
-        if pd.isna(cost) or cost == 'N/A':
-            return None
-        try:
-            cleaned = re.sub(r'[^\d,]', '', str(cost))
-            return int(cleaned.replace(',', ''))
-        except (ValueError, TypeError):
-            return None
+        self._snapshot("page", html)
+        listings = self._parse_page_html(html)
+        self.http_total = self._state_total(html)
+        print(f"HTTP fetch found {len(listings)} of {self.http_total or 'an unknown number of'} listings")
+        return listings
 
-    @staticmethod
-    def _clean_rating(rating: str) -> Optional[float]:
-        """Clean rating string to extract numerical value."""
-        if pd.isna(rating) or rating == 'N/A':
-            return None
+    def _http_complete(self, listings: List[Dict[str, str]]) -> bool:
+        """Whether an HTTP fetch provably returned the whole listing, not just its first page."""
+        return self.http_total is not None and 0 < self.http_total <= len(listings)
+
+    @timed("parse")
+    def _parse_listings_html(self, html: str) -> List[Dict[str, str]]:
+        """Extract all not-yet-seen listings from an HTML fragment with one parse."""
+        soup = BeautifulSoup(html, 'lxml')
+        listings = []
+        for listing in soup.find_all('div', class_='sc-evWYkj'):
+            listing_info = self._extract_listing_info(listing)
+            if listing_info:
+                listings.append(listing_info)
+        return listings
+
+    def _parse_page_html(self, html: str) -> List[Dict[str, str]]:
+        """Extract listings from a full page, using the embedded state if none are rendered."""
+        listings = self._parse_listings_html(html)
+        if not listings:
+            try:
+                listings = self._extract_state_listings(html)
+            except (ValueError, KeyError, AttributeError) as e:
+                print(f"Could not parse embedded state: {str(e)}")
+        return listings
+
+    def _collect_listings(self) -> List[Dict[str, str]]:
+        """Collect listings with the configured engine, falling back to the browser.
+
+        In 'auto' mode the HTTP result is only used when the page's reported
+        total shows it holds every listing; the server renders just the
+        first page, so anything less is scrolled in the browser instead.
+        HTTP results never set ``listing_complete``: a reported total is
+        not proof that no listing was left out, so delta runs only infer
+        removals from a full browser scroll.
+        """
+        self.listing_complete = False
+        if self.engine != "browser":
+            listings = self._fetch_listings_http()
+            if self._http_complete(listings) or self.engine == "http":
+                for listing in listings:
+                    self._report(listing)
+                return listings
+            print("HTTP fetch incomplete, falling back to browser")
+            self.processed_bakeries.clear()
+            self._start_snapshots(self.city)
+
+        return self._scroll_and_extract_listings()
+
+    @retried("navigation")
+    def _load_listing_page(self) -> None:
+        """Open the listing page and wait for its first listings."""
+        self._throttle()
+        with self._span("page_load"):
+            self.driver.get(self.base_url)
+            # Wait for main content to load
+            WebDriverWait(self.driver, 20).until(
+                EC.presence_of_element_located((By.CLASS_NAME, "sc-evWYkj"))
+            )
+
+    def _scroll_and_extract_listings(self) -> List[Dict[str, str]]:
+        """Scroll through the page and extract all bakery listings; sets ``listing_complete``."""
+        self.listing_complete = False
         try:
-            return float(rating)
-        except ValueError:
-            return None
+            self._acquire_driver()
+            self._load_listing_page()
+
+            unique_bakeries = []
+            scroll = ScrollController(initial_timeout=self.SCROLL_TIMEOUT)
 
-    def _categorize_price(self, cost: Optional[float]) -> str:
-        """Categorize bakeries based on cost for two."""
-        if pd.isna(cost):
-            return 'Not Available'
+            # Scroll until the page stops growing for longer than listings have been taking to load
+            while not scroll.done:
+                self._scroll_page(scroll)
+
+                # Extract only the listings added since the previous scroll
+                new_listings = self.driver.execute_script(NEW_LISTINGS_SCRIPT)
+                if new_listings["count"]:
+                    self._snapshot("listings", new_listings["html"])
+                    for listing_info in self._parse_listings_html(new_listings["html"]):
+                        unique_bakeries.append(listing_info)
+                        self._report(listing_info)
+                        print(f"Processed: {listing_info['Name']}")
 
-        for min_cost, max_cost, category in self.PRICE_RANGES:
-            if min_cost <= cost < max_cost:
-                return category
-        return 'Not Available'
+            self.listing_complete = True
+            return unique_bakeries
+
+        except Exception as e:
+            print(f"Error during scroll and extraction: {str(e)}")
+            return []
 
     def scrape(self) -> pd.DataFrame:
         """
@@ -170,29 +332,51 @@ class ZomatoBakeryScraper(BaseScraper):
         """
         try:
             # Collect bakery data
-            bakeries = self._scroll_and_extract_listings()
-            if not bakeries:
-                return pd.DataFrame()
-
-            # Create and clean DataFrame
-            df = pd.DataFrame(bakeries)
-            
-            # Clean numeric columns
-            df['Cost for Two'] = df['Cost for Two'].apply(self._clean_cost)
-            df['Rating'] = df['Rating'].apply(self._clean_rating)
-            
-            # Add price category
-            df['Price Category'] = df['Cost for Two'].apply(self._categorize_price)
-
-            # Reorder columns
-            column_order = [
-                'Name', 'Rating', 'Cost for Two', 'Price Category',
-                'Location'
-            ]
-            return df[column_order]
+            self._start_snapshots(self.city)
+            self._start_changes(self.city)
+            bakeries = self._collect_listings()
+            self._index_listings(bakeries)
+            # An HTTP result or an interrupted scroll cannot tell what was removed
+            self._finish_changes(complete=bool(bakeries) and self.listing_complete)
+            return self._build_dataframe(bakeries)
 
         except Exception as e:
             print(f"Error during scraping: {str(e)}")
             return pd.DataFrame()
         finally:
-            self.cleanup()
\ No newline at end of file
+            self.cleanup()
+
+    def replay(self) -> pd.DataFrame:
+        """Re-run extraction on the snapshots recorded for this city, without a browser."""
+        bakeries = []
+        for entry in self._replay_snapshots(self.city):
+            if entry["kind"] == "page":
+                bakeries.extend(self._parse_page_html(entry["html"]))
+            elif entry["kind"] == "listings":
+                bakeries.extend(self._parse_listings_html(entry["html"]))
+
+        print(f"Replay completed. Found {len(bakeries)} bakeries.")
+        return self._build_dataframe(bakeries)
+
+    @timed("clean")
+    def _build_dataframe(self, bakeries: List[Dict[str, str]]) -> pd.DataFrame:
+        """Create the results DataFrame, clean it and add price categories."""
+        if not bakeries:
+            return pd.DataFrame()
+
+        # Create and clean DataFrame
+        df = pd.DataFrame(bakeries)
+        
+        # Clean numeric columns
+        df['Cost for Two'] = cleaning.clean_cost(df['Cost for Two'])
+        df['Rating'] = cleaning.clean_rating(df['Rating'])
+        
+        # Add price category
+        df['Price Category'] = cleaning.categorize_price(df['Cost for Two'], self.PRICE_RANGES)
+
+        # Reorder columns
+        column_order = [
+            'Name', 'Rating', 'Cost for Two', 'Price Category',
+            'Location'
+        ]
+        return df[column_order]
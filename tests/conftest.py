@@ -0,0 +1,23 @@
+from pathlib import Path
+
+import pytest
+
+FIXTURES_DIR = Path(__file__).parent.parent / "benchmarks" / "fixtures"
+
+
+class FakeFetcher:
+    """Stands in for the pooled HTTP fetcher, serving fixed pages."""
+
+    def __init__(self, pages):
+        self.pages = list(pages)
+        self.urls = []
+
+    def get(self, url):
+        self.urls.append(url)
+        return self.pages.pop(0) if self.pages else "<html></html>"
+
+
+@pytest.fixture
+def fixture_html():
+    """Read a benchmark fixture; regenerate them with python -m benchmarks.make_fixtures."""
+    return lambda name: (FIXTURES_DIR / name).read_text(encoding="utf-8")
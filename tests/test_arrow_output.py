@@ -0,0 +1,35 @@
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from utils.arrow_output import ParquetResultSink, read_results, schema_for, to_table
+
+
+def test_to_table_coerces_values_to_the_schema():
+    df = pd.DataFrame({"Name": ["Cake Shop", "Bread Co"], "Rating": ["4.5", "N/A"], "Rating Count": ["120", None]})
+
+    table = to_table(df, "google_maps")
+
+    assert table.schema == schema_for("google_maps")
+    assert table.column("Rating").to_pylist() == [4.5, None]
+    assert table.column("Rating Count").type == pa.int64()
+    assert table.column("Phone Number").null_count == 2
+
+
+def test_unknown_source_is_rejected():
+    with pytest.raises(ValueError, match="Unknown source"):
+        schema_for("yelp")
+
+
+def test_rewriting_a_city_replaces_its_partition(tmp_path):
+    sink = ParquetResultSink(tmp_path, "google_maps", date="2020-01-02")
+    first = pd.DataFrame({"Name": ["Cake Shop"], "Source City": ["Pune"]})
+    sink.write(first)
+    sink.write(pd.DataFrame({"Name": ["Cake Shop", "Bread Co"], "Source City": ["Pune"] * 2}))
+    sink.write(pd.DataFrame({"Name": ["Sweet Spot"], "Source City": ["Agra"]}))
+
+    results = read_results(tmp_path, source="google_maps", city="Pune")
+
+    assert sorted(results["Name"]) == ["Bread Co", "Cake Shop"]
+    assert set(results["date"]) == {"2020-01-02"}
+    assert len(read_results(tmp_path)) == 3
@@ -0,0 +1,74 @@
+import asyncio
+from types import SimpleNamespace
+
+from scrapers.async_engine import AsyncBaseScraper, AsyncBrowserEngine
+from utils.network_filter import BlockingProfile
+from utils.scroll_controller import FeedState, ScrollController
+
+
+class FakeContext:
+    async def route(self, pattern, handler):
+        self.handler = handler
+
+
+class FakeRoute:
+    def __init__(self, url, resource_type="script"):
+        self.request = SimpleNamespace(url=url, resource_type=resource_type)
+        self.outcome = None
+
+    async def abort(self):
+        self.outcome = "aborted"
+
+    async def continue_(self):
+        self.outcome = "continued"
+
+
+def route_outcomes(profile, requests):
+    context = FakeContext()
+
+    async def run():
+        await AsyncBrowserEngine._apply_blocking(context, profile)
+        routes = [FakeRoute(*request) for request in requests]
+        for route in routes:
+            await context.handler(route)
+        return [route.outcome for route in routes]
+
+    return asyncio.run(run())
+
+
+def test_routes_follow_deny_allow_and_image_rules():
+    profile = BlockingProfile(deny=["*googletagmanager.com*", "*.gstatic.com*"], allow=["https://maps.gstatic.com/*"])
+
+    outcomes = route_outcomes(profile, [
+        ("https://www.googletagmanager.com/gtm.js",),
+        ("https://fonts.gstatic.com/font.woff2",),
+        ("https://maps.gstatic.com/tiles/1.png", "image"),
+        ("https://www.google.com/logo.png", "image"),
+        ("https://www.google.com/maps",),
+    ])
+
+    assert outcomes == ["aborted", "aborted", "continued", "aborted", "continued"]
+
+
+class Feed(AsyncBaseScraper):
+    async def scrape(self):
+        pass
+
+
+def test_advance_scroll_polls_until_new_items_load():
+    scraper = Feed(browser=None)
+    controller = ScrollController(poll_interval=0.01)
+    states = iter([FeedState(10), FeedState(10), FeedState(10), FeedState(20)])
+    scrolls = []
+
+    async def scroll():
+        scrolls.append(1)
+
+    async def probe():
+        return next(states)
+
+    state = asyncio.run(scraper._advance_scroll(controller, scroll, probe))
+
+    assert state == FeedState(20)
+    assert scrolls == [1]
+    assert controller.idle_rounds == 0 and len(controller.latencies) == 1
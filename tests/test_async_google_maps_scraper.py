@@ -0,0 +1,109 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from bs4 import BeautifulSoup
+
+from scrapers.async_engine import as_function
+from scrapers.async_google_maps_scraper import CLICK_CARD_FUNCTION, NEW_CARDS_FUNCTION, AsyncGoogleMapsScraper
+from scrapers.google_maps_scraper import FEED_STATE_SCRIPT, PANEL_STATE_SCRIPT
+from utils.metrics import StageMetrics
+from utils.rate_limiter import HostRateLimiter
+
+
+class FakeKeyboard:
+    async def press(self, key):
+        pass
+
+
+class FeedPage:
+    """Playwright page stub serving the recorded feed, ``batch`` cards per scroll."""
+
+    def __init__(self, feed_html, batch):
+        cards = BeautifulSoup(feed_html, "lxml").select("div.Nv2PK")
+        self.cards = [
+            {"key": card.select_one("a.hfpxzc")["href"], "html": str(card), "name": card.select_one(".qBF1Pd").text}
+            for card in cards
+        ]
+        self.batch = batch
+        self.loaded = batch
+        self.returned = 0
+        self.scrolls = 0
+        self.open_panel = None
+        self.keyboard = FakeKeyboard()
+
+    async def goto(self, url):
+        pass
+
+    async def fill(self, selector, value, timeout=None):
+        pass
+
+    async def press(self, selector, key):
+        pass
+
+    async def wait_for_selector(self, selector, state=None, timeout=None):
+        pass
+
+    async def evaluate(self, script, *args):
+        if script == NEW_CARDS_FUNCTION:
+            cards = [{"key": card["key"], "html": card["html"]} for card in self.cards[self.returned:self.loaded]]
+            self.returned = self.loaded
+            return cards
+        if script == as_function(FEED_STATE_SCRIPT):
+            return {"count": self.loaded, "end": self.loaded >= len(self.cards)}
+        if script == CLICK_CARD_FUNCTION:
+            self.open_panel = next(card["name"] for card in self.cards if card["key"] == args[0])
+            return True
+        if script == as_function(PANEL_STATE_SCRIPT):
+            return {"title": self.open_panel, "info_rendered": True, "address": "MG Road", "phone": "020 1234"}
+        # Scrolling the feed loads the next batch of cards
+        self.scrolls += 1
+        self.loaded = min(len(self.cards), self.loaded + self.batch)
+        return None
+
+
+class FakeBrowser:
+    def __init__(self, page):
+        self._fake_page = page
+
+    @asynccontextmanager
+    async def page(self, blocking_profile=None):
+        yield self._fake_page
+
+
+def make_scraper(page):
+    scraper = AsyncGoogleMapsScraper(FakeBrowser(page))
+    scraper.rate_limiter = HostRateLimiter({})
+    scraper.metrics = scraper.parser.metrics = StageMetrics()
+    return scraper
+
+
+def test_capped_scrape_stops_scrolling_once_it_has_enough(fixture_html):
+    page = FeedPage(fixture_html("google_maps_feed.html"), batch=10)
+    scraper = make_scraper(page)
+
+    df = asyncio.run(scraper.scrape("Bakeries in Pune", num_results=15))
+
+    assert len(df) == 15
+    # The first scroll already loads 20 cards; no scroll is needed after the 15th place
+    assert page.scrolls == 1
+
+
+def test_each_card_is_recorded_as_one_parse_span(fixture_html):
+    page = FeedPage(fixture_html("google_maps_feed.html"), batch=10)
+    scraper = make_scraper(page)
+
+    asyncio.run(scraper.scrape("Bakeries in Pune", num_results=10))
+
+    assert scraper.metrics.histograms[("google_maps", "parse")].count == 10
+
+
+def test_fatal_errors_are_raised_not_returned_as_empty(fixture_html):
+    page = FeedPage(fixture_html("google_maps_feed.html"), batch=10)
+
+    async def crash(url):
+        raise RuntimeError("page crashed")
+
+    page.goto = crash
+    with pytest.raises(RuntimeError, match="page crashed"):
+        asyncio.run(make_scraper(page).scrape("Bakeries in Pune"))
@@ -0,0 +1,52 @@
+import asyncio
+import re
+
+import pytest
+
+import scrapers.justdial_scraper as justdial_scraper
+from conftest import FakeFetcher
+from scrapers.async_justdial_scraper import AsyncJustDialScraper
+
+BROWSER_STORE = {
+    "Store Name": "Browser Bakery", "Address": "Kothrud, Pune", "Rating": "4.2",
+    "Rating Count": "12", "Phone Number": "+91 9876543210"
+}
+
+
+def make_scraper(monkeypatch, page):
+    monkeypatch.setattr(justdial_scraper, "get_http_fetcher", lambda: FakeFetcher([page]))
+    scraper = AsyncJustDialScraper(browser=None)
+    scraper.browser_calls = 0
+
+    async def browse(query, num_pages):
+        scraper.browser_calls += 1
+        return [dict(BROWSER_STORE)]
+
+    monkeypatch.setattr(scraper, "_scrape_browser", browse)
+    return scraper
+
+
+def test_http_listings_with_phone_numbers_are_used(monkeypatch, fixture_html):
+    scraper = make_scraper(monkeypatch, fixture_html("justdial_page.html"))
+    df = asyncio.run(scraper.scrape("Bakeries in Delhi", num_pages=1))
+    assert scraper.browser_calls == 0
+    assert len(df) == 200
+
+
+def test_http_listings_without_phone_numbers_fall_back_to_browser(monkeypatch, fixture_html):
+    html = re.sub(r'<p class="contact-info">.*?</p>', "", fixture_html("justdial_page.html"), flags=re.DOTALL)
+    scraper = make_scraper(monkeypatch, html)
+    df = asyncio.run(scraper.scrape("Bakeries in Delhi", num_pages=1))
+    assert scraper.browser_calls == 1
+    assert df["Store Name"].tolist() == ["Browser Bakery"]
+
+
+def test_fatal_errors_are_raised_not_returned_as_empty(monkeypatch):
+    scraper = make_scraper(monkeypatch, "<html></html>")
+
+    async def crash(query, num_pages):
+        raise RuntimeError("browser crashed")
+
+    monkeypatch.setattr(scraper, "_scrape_browser", crash)
+    with pytest.raises(RuntimeError, match="browser crashed"):
+        asyncio.run(scraper.scrape("Bakeries in Delhi", num_pages=1))
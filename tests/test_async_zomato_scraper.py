@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+import scrapers.zomato_scraper as zomato_scraper
+from conftest import FakeFetcher
+from scrapers.async_zomato_scraper import AsyncZomatoScraper
+
+BROWSER_LISTING = {"Name": "Browser Bakery", "Rating": "4.1", "Cost for Two": "₹300 for two", "Location": "Kothrud"}
+
+
+def make_scraper(monkeypatch, page, engine="auto"):
+    monkeypatch.setattr(zomato_scraper, "get_http_fetcher", lambda: FakeFetcher([page]))
+    scraper = AsyncZomatoScraper(browser=None, city="pune", engine=engine)
+    scraper.browser_calls = 0
+
+    async def scroll():
+        scraper.browser_calls += 1
+        return [dict(BROWSER_LISTING)]
+
+    monkeypatch.setattr(scraper, "_scroll_and_extract_listings", scroll)
+    return scraper
+
+
+def test_partial_http_listing_falls_back_to_the_browser(monkeypatch, fixture_html):
+    scraper = make_scraper(monkeypatch, fixture_html("zomato_listings.html"))
+    df = asyncio.run(scraper.scrape())
+    assert scraper.browser_calls == 1
+    assert df["Name"].tolist() == ["Browser Bakery"]
+
+
+def test_http_engine_parses_the_listing_page(monkeypatch, fixture_html):
+    scraper = make_scraper(monkeypatch, fixture_html("zomato_listings.html"), engine="http")
+    df = asyncio.run(scraper.scrape())
+    assert scraper.browser_calls == 0
+    assert len(df) == 300
+
+
+def test_browser_failure_is_raised_not_returned_as_empty(monkeypatch, fixture_html):
+    scraper = make_scraper(monkeypatch, fixture_html("zomato_listings.html"), engine="browser")
+
+    async def crash():
+        raise RuntimeError("browser crashed")
+
+    monkeypatch.setattr(scraper, "_scroll_and_extract_listings", crash)
+    with pytest.raises(RuntimeError, match="browser crashed"):
+        asyncio.run(scraper.scrape())
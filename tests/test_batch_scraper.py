@@ -0,0 +1,176 @@
+import json
+from concurrent.futures import Executor, Future
+
+import pandas as pd
+import pytest
+
+import batch_scraper
+import utils.retry
+from scrapers.google_maps_scraper import GoogleMapsScraper
+from utils.arrow_output import read_results
+from utils.change_set import ADDED, CHANGE_COLUMNS, REMOVED
+from utils.geo_tiles import Tile
+from utils.place_index import PlaceIndex
+from utils.retry import RetryPolicies, RetryPolicy
+from utils.run_journal import DONE, FAILED, RunJournal
+
+
+@pytest.fixture
+def crashing_scraper(monkeypatch):
+    """Make every GoogleMapsScraper.scrape() fail inside its own try block."""
+    calls = []
+
+    def crash(self):
+        calls.append(self)
+        raise RuntimeError("browser crashed")
+
+    monkeypatch.setattr(GoogleMapsScraper, "_acquire_driver", crash)
+    # batch_scrape_bakeries installs its policies process-wide
+    monkeypatch.setattr(utils.retry, "_retry_policies", None)
+    return calls
+
+
+class InlineExecutor(Executor):
+    """Run submitted calls at once, in this process."""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+class FakeTiles:
+    """Two tiles of Pune whose scrape results come from ``scrape(tile)``, recording every call."""
+
+    def __init__(self):
+        self.tiles = [Tile(18.5, 73.8, 4.0, 0), Tile(18.5, 73.9, 4.0, 0)]
+        self.calls = []
+        self.scrape = None
+
+    def scrape_tile(self, city, tile, driver_pool, snapshot_store, place_index, delta, skip_keys):
+        self.calls.append((tile, skip_keys))
+        return self.scrape(tile)
+
+    def run(self, place_index=None):
+        return batch_scraper.scrape_city_tiled("Pune", 18.5, 73.85, 1e6, InlineExecutor(), place_index)
+
+
+@pytest.fixture
+def tiled(monkeypatch):
+    fake = FakeTiles()
+    monkeypatch.setattr(batch_scraper, "city_tiles", lambda lat, lng, population: fake.tiles)
+    monkeypatch.setattr(batch_scraper, "scrape_tile", fake.scrape_tile)
+    monkeypatch.setattr(utils.retry, "_retry_policies", RetryPolicies({"tile": RetryPolicy(2, 0.0, 0.0)}))
+    return fake
+
+
+def listing(*names):
+    return pd.DataFrame({"Name": list(names), "Full Address": [f"{name} Road" for name in names]})
+
+
+def added(*keys):
+    return pd.DataFrame([[ADDED, key, key, ""] for key in keys], columns=CHANGE_COLUMNS)
+
+
+def test_tiled_delta_reports_places_seen_by_any_tile_once(tiled, tmp_path):
+    results = {
+        tiled.tiles[0]: (listing("Cake Shop", "Sweet Spot"), added("sweet spot|"), {"cake shop|", "sweet spot|"}, False),
+        tiled.tiles[1]: (listing("Sweet Spot"), added("sweet spot|"), {"sweet spot|"}, False),
+    }
+    tiled.scrape = results.get
+    with PlaceIndex(tmp_path / "index.sqlite") as index:
+        index.set_scope("google_maps", "Bakeries in Pune", ["cake shop|", "bread co|"])
+
+        df, changes = tiled.run(index)
+
+        assert index.scope_keys("google_maps", "Bakeries in Pune") == {"cake shop|", "sweet spot|"}
+
+    # 'Cake Shop' was unchanged in one tile and absent from the other, so it is not removed
+    assert changes[["Change", "Key"]].values.tolist() == [[ADDED, "sweet spot|"], [REMOVED, "bread co|"]]
+    assert sorted(df["Name"]) == ["Cake Shop", "Sweet Spot"]
+
+
+def test_later_tiles_skip_places_collected_by_earlier_ones(tiled):
+    quadrants = tiled.tiles[0].subdivide()
+    saturated = listing("Cake Shop")
+    tiled.scrape = lambda tile: (
+        (saturated, None, {"cake shop|"}, True) if tile == tiled.tiles[0] else (None, None, set(), False)
+    )
+
+    tiled.run()
+
+    skipped = {tile: skip_keys for tile, skip_keys in tiled.calls}
+    assert skipped[tiled.tiles[0]] == set()
+    assert all(skipped[quadrant] == {"cake shop|"} for quadrant in quadrants)
+
+
+def test_tile_failing_after_its_retries_fails_the_city(tiled, tmp_path):
+    def scrape(tile):
+        if tile == tiled.tiles[1]:
+            raise RuntimeError("feed did not load")
+        return listing("Cake Shop"), added(), {"cake shop|"}, False
+
+    tiled.scrape = scrape
+    with PlaceIndex(tmp_path / "index.sqlite") as index:
+        index.set_scope("google_maps", "Bakeries in Pune", ["cake shop|", "bread co|"])
+
+        with pytest.raises(RuntimeError, match="1 of 2 tiles failed, e.g. feed did not load"):
+            tiled.run(index)
+
+        # The incomplete city must not forget places the failed tile may still list
+        assert index.scope_keys("google_maps", "Bakeries in Pune") == {"cake shop|", "bread co|"}
+    assert [tile for tile, _ in tiled.calls].count(tiled.tiles[1]) == 2
+
+
+def test_scrape_reraises_fatal_errors(crashing_scraper):
+    with pytest.raises(RuntimeError, match="browser crashed"):
+        GoogleMapsScraper().scrape("Bakeries in Pune")
+
+
+def test_crashed_city_is_deferred_and_retried(crashing_scraper, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pd.DataFrame({"city": ["Pune"]}).to_csv("cities.csv", index=False)
+
+    batch_scraper.batch_scrape_bakeries("cities.csv", retry_policies={"city": RetryPolicy(3, 0.0, 0.0)})
+
+    # The main pass plus two deferred passes
+    assert len(crashing_scraper) == 3
+    journal = RunJournal(next((tmp_path / "scraped_results").glob("run_*.jsonl")))
+    assert journal.entries["Pune"]["status"] == FAILED
+    assert journal.entries["Pune"]["error"] == "browser crashed"
+
+
+def test_resume_rewrites_completed_cities_into_the_original_partition(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pd.DataFrame({"city": ["Pune"]}).to_csv("cities.csv", index=False)
+    city_file = tmp_path / "Pune.csv"
+    pd.DataFrame({"Name": ["Cake Shop"], "Rating": ["4.5"], "Source City": ["Pune"]}).to_csv(city_file, index=False)
+    journal_file = tmp_path / "run.jsonl"
+    journal_file.write_text(json.dumps({
+        "city": "Pune", "status": DONE, "output_file": str(city_file), "rows": 1,
+        "error": None, "recorded_at": "2020-01-02 23:59:00",
+    }) + "\n")
+
+    for _ in range(2):
+        batch_scraper.batch_scrape_bakeries("cities.csv", output_format="parquet", resume=str(journal_file))
+
+    partitions = list((tmp_path / "scraped_results" / "parquet").rglob("*.parquet"))
+    assert [p.parent.name for p in partitions] == ["date=2020-01-02"]
+    assert len(read_results(tmp_path / "scraped_results" / "parquet")) == 1
+
+
+def test_interrupted_sequential_run_closes_the_driver_pool(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pd.DataFrame({"city": ["Pune"]}).to_csv("cities.csv", index=False)
+    closed = []
+    monkeypatch.setattr(batch_scraper.DriverPool, "close", lambda pool: closed.append(pool))
+
+    def interrupt(*args):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(batch_scraper, "scrape_city", interrupt)
+
+    with pytest.raises(KeyboardInterrupt):
+        batch_scraper.batch_scrape_bakeries("cities.csv")
+
+    assert len(closed) == 1
@@ -0,0 +1,45 @@
+import pandas as pd
+
+from benchmarks import bench_parsing
+from utils import cleaning
+from utils.metrics import StageMetrics, get_metrics, set_metrics
+
+
+def test_parsing_cases_do_not_record_metrics_spans():
+    previous = get_metrics()
+    metrics = StageMetrics()
+    set_metrics(metrics)
+    try:
+        for name in ("google_maps.extract_basic_info", "justdial.extract_store_details", "zomato.extract_listing_info"):
+            function, items = bench_parsing.BENCHMARKS[name]()
+            assert items > 0
+            function()
+    finally:
+        set_metrics(previous)
+
+    assert metrics.histograms == {}
+
+
+def test_compare_flags_only_slowdowns_beyond_tolerance():
+    baseline = {"fast": {"items_per_sec": 100.0}, "slow": {"items_per_sec": 100.0}}
+    results = {
+        "fast": {"items_per_sec": 80.0},
+        "slow": {"items_per_sec": 70.0},
+        "new": {"items_per_sec": 1.0},
+    }
+
+    assert bench_parsing.compare(results, baseline, tolerance=0.25) == ["slow"]
+
+
+def test_rowwise_references_agree_with_the_vectorized_cleaners():
+    raw = bench_parsing._raw_values()
+    costs = pd.Series(raw["cost"][:500])
+    ratings = pd.Series(raw["justdial_rating"][:500])
+
+    pd.testing.assert_series_equal(cleaning.clean_cost(costs), costs.map(bench_parsing._zomato_cost).astype("Int64"))
+    assert cleaning.categorize_price(cleaning.clean_cost(costs)).tolist() == [
+        bench_parsing._zomato_price_category(bench_parsing._zomato_cost(cost)) for cost in costs
+    ]
+    pd.testing.assert_series_equal(
+        cleaning.clean_rating(ratings), ratings.map(bench_parsing._justdial_rating).astype("float64")
+    )
@@ -0,0 +1,61 @@
+import pytest
+
+from utils.change_set import ADDED, CHANGED, REMOVED, ChangeSet
+from utils.place_index import PlaceIndex
+
+FIELDS = ["Rating", "Rating Count"]
+
+
+@pytest.fixture
+def index(tmp_path):
+    """Index remembering two places listed for Pune by an earlier run."""
+    with PlaceIndex(tmp_path / "index.sqlite") as index:
+        index.store("google_maps", "cake shop|", {"Name": "Cake Shop", "Rating": 4.5, "Rating Count": 120})
+        index.store("google_maps", "bread co|", {"Name": "Bread Co", "Rating": 4.0, "Rating Count": 30})
+        index.set_scope("google_maps", "Pune", ["cake shop|", "bread co|"])
+        yield index
+
+
+def test_complete_listing_reports_added_changed_and_removed(index):
+    changes = ChangeSet(index, "google_maps", "Pune", FIELDS)
+    assert changes.compare("cake shop|", {"Name": "Cake Shop", "Rating": 4.5, "Rating Count": 121}) == CHANGED
+    assert changes.compare("sweet spot|", {"Name": "Sweet Spot", "Rating": 4.8, "Rating Count": 3}) == ADDED
+
+    df = changes.finish(complete=True)
+
+    assert df[["Change", "Name"]].values.tolist() == [
+        [CHANGED, "Cake Shop"], [ADDED, "Sweet Spot"], [REMOVED, "Bread Co"]
+    ]
+    assert df["Changes"].iloc[0] == "Rating Count: 120 -> 121"
+    assert index.scope_keys("google_maps", "Pune") == {"cake shop|", "sweet spot|"}
+
+
+def test_incomplete_listing_reports_no_removals(index):
+    changes = ChangeSet(index, "google_maps", "Pune", FIELDS)
+    assert changes.compare("cake shop|", {"Name": "Cake Shop", "Rating": 4.5, "Rating Count": 120}) is None
+
+    df = changes.finish(complete=False)
+
+    assert df.empty
+    assert index.scope_keys("google_maps", "Pune") == {"cake shop|", "bread co|"}
+
+
+def test_shared_parts_are_merged_and_closed_by_the_scope_owner(index):
+    city = ChangeSet(index, "google_maps", "Pune", FIELDS)
+    parts = []
+    for seen in (["cake shop|", "sweet spot|"], ["sweet spot|"]):
+        part = ChangeSet(index, "google_maps", "Pune", FIELDS, shared=True)
+        for key in seen:
+            part.compare(key, {"Name": key.rstrip("|").title(), "Rating": 4.5, "Rating Count": 120})
+        parts.append((part.finish(complete=True), part.seen))
+
+    # A part closing on its own must neither report removals nor forget keys
+    assert index.scope_keys("google_maps", "Pune") == {"cake shop|", "bread co|"}
+
+    for changes, seen in parts:
+        city.merge(changes, seen)
+    df = city.finish(complete=True)
+
+    # The overlapping part's 'Sweet Spot' is reported once; only 'Bread Co' was seen by no part
+    assert df[["Change", "Name"]].values.tolist() == [[ADDED, "Sweet Spot"], [REMOVED, "Bread Co"]]
+    assert index.scope_keys("google_maps", "Pune") == {"cake shop|", "sweet spot|"}
@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+
+from utils import cleaning
+
+
+def test_rating_accepts_out_of_five_and_rejects_labels():
+    ratings = cleaning.clean_rating(pd.Series(["4.5", " 3.9/5 ", "N/A", "NEW", None, "4.1 stars"]))
+    assert ratings.tolist()[:2] == [4.5, 3.9]
+    assert ratings.iloc[2:].isna().all()
+
+
+def test_counts_and_costs_read_the_first_grouped_number():
+    assert cleaning.clean_count(pd.Series(["(1,234)", "56 Ratings", "N/A"])).tolist() == [1234, 56, pd.NA]
+    assert cleaning.clean_cost(pd.Series(["₹1,200 for two", None])).tolist() == [1200, pd.NA]
+
+
+def test_phone_keeps_only_digits():
+    assert cleaning.clean_phone(pd.Series(["+91 98765 43210", "N/A"])).tolist() == ["919876543210", ""]
+
+
+def test_price_categories_use_inclusive_lower_bounds():
+    costs = pd.Series([0, 299, 300, 1000, 5000, None, -5])
+    assert cleaning.categorize_price(costs).tolist() == [
+        "Budget Friendly", "Budget Friendly", "Pocket Friendly", "Premium", "Luxury",
+        cleaning.PRICE_NOT_AVAILABLE, cleaning.PRICE_NOT_AVAILABLE,
+    ]
+
+
+@pytest.mark.parametrize("source", ["google_maps", "zomato", "justdial"])
+def test_cleaning_is_idempotent_across_a_csv_round_trip(source, tmp_path):
+    raw = pd.DataFrame({
+        "Rating": ["4.5/5", "N/A"],
+        "Rating Count": ["(1,234)", "N/A"],
+        "Cost for Two": ["₹450 for two", "N/A"],
+        "Phone Number": ["+91 98765 43210", "020 1234"],
+    })
+    cleaned = cleaning.clean_results(raw, source)
+    cleaned.to_csv(tmp_path / "results.csv", index=False)
+
+    # Phone digits are read back as text, or leading zeros would be lost
+    reread = cleaning.clean_results(pd.read_csv(tmp_path / "results.csv", dtype={"Phone Number": str}), source)
+
+    columns = list(cleaning.COLUMN_CLEANERS[source]) + (["Price Category"] if source == "zomato" else [])
+    pd.testing.assert_frame_equal(reread[columns], cleaned[columns])
@@ -0,0 +1,32 @@
+import pytest
+
+import utils.retry
+from distributed_scraper import run_worker
+from scrapers.google_maps_scraper import GoogleMapsScraper
+from utils.retry import RetryPolicies, RetryPolicy
+from utils.work_queue import FAILED, open_queue
+
+
+@pytest.mark.parametrize("queue_name", ["queue.db", "queue.json"])
+def test_crashed_city_fails_its_lease(queue_name, tmp_path, monkeypatch):
+    def crash(self):
+        raise RuntimeError("browser crashed")
+
+    monkeypatch.setattr(GoogleMapsScraper, "_acquire_driver", crash)
+    monkeypatch.setattr(utils.retry, "_retry_policies", None)
+    queue_path = str(tmp_path / queue_name)
+    with open_queue(queue_path) as queue:
+        queue.publish({"Pune": {"city": "Pune"}}, max_attempts=2)
+
+    run_worker(queue_path, poll_interval=0.01, retry_policies=RetryPolicies({"city": RetryPolicy(2, 0.0, 0.0)}))
+
+    with open_queue(queue_path) as queue:
+        [item] = queue.items()
+    assert item["status"] == FAILED
+    assert item["attempts"] == 2
+    assert item["error"] == "browser crashed"
+
+
+def test_delta_workers_need_a_shared_index(tmp_path):
+    with pytest.raises(ValueError, match="shared by all nodes"):
+        run_worker(str(tmp_path / "queue.db"), index_path=str(tmp_path / "index.sqlite"), delta=True)
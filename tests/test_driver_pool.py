@@ -0,0 +1,117 @@
+import threading
+
+import pytest
+
+from utils.driver_pool import BrowserBudget, DriverPool
+
+
+class FakeDriver:
+    """Just enough of a WebDriver for the pool's reset between leases."""
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.quit_called = False
+        self.window_handles = ["main"]
+        self.switch_to = self
+
+    def window(self, handle):
+        pass
+
+    def execute_script(self, script):
+        pass
+
+    def get(self, url):
+        pass
+
+    def execute_cdp_cmd(self, command, params):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+
+def factory(kind, started):
+    def create():
+        driver = FakeDriver(kind)
+        started.append(driver)
+        return driver
+    return create
+
+
+def test_pool_reuses_drivers():
+    started = []
+    pool = DriverPool(factory("a", started), size=2)
+    first = pool.acquire()
+    pool.release(first)
+    assert pool.acquire() is first
+    assert len(started) == 1
+
+
+def test_pool_recycles_after_max_uses():
+    started = []
+    pool = DriverPool(factory("a", started), size=1, max_uses=2)
+    driver = pool.acquire()
+    pool.release(driver)
+    pool.release(pool.acquire())
+    assert driver.quit_called
+    assert pool.acquire() is not driver
+
+
+def test_budget_caps_browsers_across_pools():
+    started = []
+    budget = BrowserBudget(2)
+    pools = {kind: DriverPool(factory(kind, started), size=2, budget=budget) for kind in "abc"}
+
+    for kind in "abc":
+        for _ in range(2):
+            with pools[kind].lease():
+                pass
+        assert budget.alive <= 2
+    # The idle browser of the first scraper was quit to make room for the third
+    assert [driver.kind for driver in started if not driver.quit_called] == ["b", "c"]
+    assert budget.alive == 2
+
+
+def test_budget_waits_for_a_leased_browser():
+    budget = BrowserBudget(1)
+    first = DriverPool(factory("a", []), size=1, budget=budget)
+    second = DriverPool(factory("b", []), size=1, budget=budget)
+    driver = first.acquire()
+    with pytest.raises(TimeoutError):
+        second.acquire(timeout=0.2)
+
+    threading.Timer(0.1, first.release, args=(driver,)).start()
+    assert second.acquire(timeout=2).kind == "b"
+    assert budget.alive == 1
+
+
+def test_warm_stops_at_the_budget():
+    budget = BrowserBudget(3)
+    pools = [DriverPool(factory(kind, []), size=2, warm=True, budget=budget) for kind in "abc"]
+    assert budget.alive == 3
+    assert [pool._created for pool in pools] == [2, 1, 0]
+
+
+def test_concurrent_leases_never_exceed_max_uses():
+    started = []
+    pool = DriverPool(factory("a", started), size=4, max_uses=3)
+    leases = {}
+    leases_lock = threading.Lock()
+
+    def work():
+        for _ in range(50):
+            with pool.lease() as driver:
+                with leases_lock:
+                    leases[id(driver)] = leases.get(id(driver), 0) + 1
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    pool.close()
+
+    assert sum(leases.values()) == 400
+    assert len(started) >= 400 // 3
+    assert all(driver.quit_called for driver in started)
+    assert pool._uses == {}
@@ -0,0 +1,49 @@
+import math
+
+import pandas as pd
+import pytest
+
+from utils.geo_tiles import MAX_DEPTH, MIN_CITY_KM, VIEWPORT_PIXELS, Tile, city_tiles, merge_tiles
+
+
+def test_small_or_unknown_population_gives_one_city_tile():
+    for population in (0, float("nan"), 50000):
+        (tile,) = city_tiles(18.52, 73.86, population)
+        assert tile.span_km == MIN_CITY_KM
+        assert (tile.lat, tile.lng) == (18.52, 73.86)
+
+
+def test_large_city_is_split_by_population():
+    tiles = city_tiles(19.08, 72.88, 12_000_000)
+    assert len(tiles) == 25
+    assert tiles[0].lat < tiles[-1].lat and tiles[0].lng < tiles[-1].lng
+    assert math.isclose(sum(tile.span_km ** 2 for tile in tiles), (5 * tiles[0].span_km) ** 2)
+
+
+def test_subdivision_halves_tiles_and_zooms_in():
+    tile = Tile(18.52, 73.86, 8.0)
+    quadrants = tile.subdivide()
+    assert [quadrant.span_km for quadrant in quadrants] == [4.0] * 4
+    assert all(quadrant.depth == 1 and quadrant.zoom() == tile.zoom() + 1 for quadrant in quadrants)
+    assert not Tile(18.52, 73.86, 8.0, MAX_DEPTH).can_subdivide()
+    assert not Tile(18.52, 73.86, 1.0).can_subdivide()
+
+
+def test_overlapping_tiles_are_merged_per_place():
+    first = pd.DataFrame({"Name": ["Cake Shop", "Bread Co"], "Full Address": ["12, MG Road, Camp", "Deccan"]})
+    second = pd.DataFrame({"Name": ["cake shop"], "Full Address": ["12 MG Road Camp, Pune"]})
+
+    merged = merge_tiles([first, None, pd.DataFrame(), second])
+
+    assert merged["Name"].tolist() == ["Cake Shop", "Bread Co"]
+    assert merge_tiles([]).empty
+
+
+@pytest.mark.parametrize("span_km", [40.0, 8.0, 0.75])
+def test_zoom_is_the_closest_that_covers_the_tile(span_km):
+    zoom = Tile(18.52, 73.86, span_km).zoom()
+
+    def visible_km(level):
+        return VIEWPORT_PIXELS * 156543.03 * math.cos(math.radians(18.52)) / 2 ** level / 1000
+
+    assert visible_km(zoom) >= span_km > visible_km(zoom + 1)
@@ -0,0 +1,138 @@
+import pandas as pd
+import pytest
+from bs4 import BeautifulSoup
+
+import utils.retry
+from scrapers.google_maps_scraper import PANEL_STATE_SCRIPT, GoogleMapsScraper, PanelNotShown, _PanelReady
+from utils.place_index import PlaceIndex, place_key
+from utils.snapshot_store import SnapshotStore
+
+
+def test_feed_cut_off_at_the_cap_is_saturated():
+    scraper = GoogleMapsScraper()
+    scraper.cards_seen = GoogleMapsScraper.RESULT_CAP + 20
+    assert scraper.saturated
+
+    scraper.reached_end = True
+    assert not scraper.saturated
+
+
+def test_short_feed_is_not_saturated():
+    scraper = GoogleMapsScraper()
+    scraper.cards_seen = 40
+    assert not scraper.saturated
+
+
+class PanelDriver:
+    """Driver stub whose detail panel always shows ``title``."""
+
+    def __init__(self, title):
+        self.title = title
+        self.clicks = 0
+
+    def find_element(self, *args):
+        return self
+
+    def send_keys(self, *args):
+        pass
+
+    def execute_script(self, script, *args):
+        if script.startswith("arguments[0].click()"):
+            self.clicks += 1
+            return None
+        if script == PANEL_STATE_SCRIPT:
+            return {"title": self.title, "info_rendered": True, "address": "MG Road", "phone": "020 1234"}
+        return None
+
+
+@pytest.mark.parametrize("name, title", [
+    ("Theobroma", "Theobroma Bakery & Cake Shop"),
+    ("Monginis Cake Shop…", "Monginis Cake Shop - Kothrud"),
+    ("Café  Goodluck", "CAFÉ GOODLUCK"),
+    ("Ｋａｙａｎｉ Bakery", "Kayani Bakery"),
+])
+def test_panel_title_matches_normalised_and_truncated_names(name, title):
+    assert _PanelReady(name, grace=1.0).matches(title)
+
+
+def test_panel_of_another_place_does_not_match():
+    assert not _PanelReady("Kayani Bakery", grace=1.0).matches("Marz-o-rin")
+
+
+def test_panel_mismatch_is_not_retried(monkeypatch):
+    monkeypatch.setattr(utils.retry, "_retry_policies", None)
+    scraper = GoogleMapsScraper()
+    scraper.DETAIL_TIMEOUT = 0.3
+    scraper.WAIT_TIMEOUT = 0.1
+    scraper.driver = PanelDriver("Marz-o-rin")
+    monkeypatch.setattr(scraper, "_wait_for_panel_closed", lambda: None)
+
+    with pytest.raises(PanelNotShown):
+        scraper._extract_details(scraper.driver, "Kayani Bakery")
+
+    assert scraper.driver.clicks == 1
+
+
+@pytest.fixture
+def feed_scraper(monkeypatch, fixture_html):
+    """Build GoogleMapsScrapers that serve recorded cards instead of driving a browser."""
+    cards = [
+        {"key": card.select_one("a.hfpxzc")["href"], "html": str(card), "element": None}
+        for card in BeautifulSoup(fixture_html("google_maps_feed.html"), "lxml").select("div.Nv2PK")[:3]
+    ]
+
+    def build(**kwargs):
+        scraper = GoogleMapsScraper(**kwargs)
+        served = []
+
+        def load_more():
+            scraper.scroll.end_reached = True
+            batch = [] if served else cards
+            served.append(batch)
+            return batch
+
+        monkeypatch.setattr(scraper, "_acquire_driver", lambda: None)
+        monkeypatch.setattr(scraper, "_navigate", lambda url: None)
+        monkeypatch.setattr(scraper, "_search_location", lambda query: None)
+        monkeypatch.setattr(scraper, "_load_more_results", load_more)
+        return scraper
+
+    build.cards = cards
+    return build
+
+
+def test_replay_keeps_details_reused_from_the_place_index(feed_scraper, tmp_path, monkeypatch):
+    store = SnapshotStore(tmp_path / "snapshots")
+    with PlaceIndex(tmp_path / "index.sqlite") as index:
+        for card in feed_scraper.cards:
+            soup = BeautifulSoup(card["html"], "lxml")
+            name = GoogleMapsScraper()._extract_basic_info(soup)["Name"]
+            key = place_key(name, GoogleMapsScraper._extract_card_location(soup))
+            index.store("google_maps", key, {"Full Address": f"{name} Road", "Phone Number": "020 1234"})
+
+        scraper = feed_scraper(snapshot_store=store, place_index=index)
+        # Every place is known, so no detail panel may be opened
+        monkeypatch.setattr(scraper, "_extract_details", pytest.fail)
+        live = scraper.scrape("Bakeries in Pune")
+
+    replayed = GoogleMapsScraper(snapshot_store=store).replay("Bakeries in Pune")
+
+    assert len(live) == 3
+    assert live["Phone Number"].tolist() == ["020 1234"] * 3
+    pd.testing.assert_frame_equal(replayed, live)
+
+
+def test_skip_keys_leave_out_places_collected_elsewhere(feed_scraper, monkeypatch):
+    first = feed_scraper()
+    monkeypatch.setattr(first, "_extract_details", lambda element, name, key: {"Full Address": "MG Road"})
+    first.scrape("Bakeries in Pune")
+    collected = sorted(first.place_keys)
+
+    second = feed_scraper()
+    opened = []
+    monkeypatch.setattr(second, "_extract_details", lambda element, name, key: opened.append(name) or {})
+    df = second.scrape("Bakeries in Pune", skip_keys=set(collected[:2]))
+
+    assert len(collected) == 3
+    assert len(df) == len(opened) == 1
+    assert second.place_keys == {collected[2]}
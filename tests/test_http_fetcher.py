@@ -0,0 +1,39 @@
+import pytest
+import requests
+
+from utils.http_fetcher import FetchBlocked, HttpFetcher
+
+
+def serving(monkeypatch, status, text):
+    """Fetcher whose session answers every request with ``status`` and ``text``."""
+    def get(url, timeout):
+        response = requests.Response()
+        response.status_code = status
+        response._content = text.encode()
+        response.url = url
+        return response
+
+    fetcher = HttpFetcher()
+    monkeypatch.setattr(fetcher.session, "get", get)
+    return fetcher
+
+
+def test_listing_page_is_returned(monkeypatch, fixture_html):
+    page = fixture_html("justdial_page.html")
+    assert serving(monkeypatch, 200, page).get("https://www.justdial.com/Delhi/Bakeries") == page
+
+
+@pytest.mark.parametrize("status", [403, 429])
+def test_refused_requests_are_blocked(monkeypatch, status):
+    with pytest.raises(FetchBlocked, match=str(status)):
+        serving(monkeypatch, status, "").get("https://www.zomato.com/pune")
+
+
+def test_short_challenge_page_is_blocked(monkeypatch):
+    with pytest.raises(FetchBlocked, match="challenge"):
+        serving(monkeypatch, 200, "<html>Please solve this CAPTCHA</html>").get("https://www.zomato.com/pune")
+
+
+def test_server_errors_are_raised(monkeypatch):
+    with pytest.raises(requests.HTTPError):
+        serving(monkeypatch, 500, "").get("https://www.zomato.com/pune")
@@ -0,0 +1,54 @@
+import re
+
+import pytest
+
+import scrapers.justdial_scraper as justdial_scraper
+from conftest import FakeFetcher
+from scrapers.justdial_scraper import JustDialScraper
+
+BROWSER_STORE = {
+    "Store Name": "Browser Bakery", "Address": "Kothrud, Pune", "Rating": "4.2",
+    "Rating Count": "12", "Phone Number": "+91 9876543210"
+}
+
+
+@pytest.fixture
+def scraper(monkeypatch):
+    def serve(*pages, engine="auto"):
+        monkeypatch.setattr(justdial_scraper, "get_http_fetcher", lambda: FakeFetcher(pages))
+        scraper = JustDialScraper(engine=engine)
+        scraper.browser_calls = 0
+
+        def browse(query, num_pages):
+            scraper.browser_calls += 1
+            return [dict(BROWSER_STORE)]
+
+        monkeypatch.setattr(scraper, "_scrape_browser", browse)
+        return scraper
+    return serve
+
+
+def _without_phones(html):
+    return re.sub(r'<p class="contact-info">.*?</p>', "", html, flags=re.DOTALL)
+
+
+def test_http_listings_with_phone_numbers_are_used(scraper, fixture_html):
+    justdial = scraper(fixture_html("justdial_page.html"))
+    df = justdial.scrape("Bakeries in Delhi", num_pages=1)
+    assert justdial.browser_calls == 0
+    assert len(df) == 200
+    assert df["Phone Number"].str.len().gt(0).all()
+
+
+def test_http_listings_without_phone_numbers_fall_back_to_browser(scraper, fixture_html):
+    justdial = scraper(_without_phones(fixture_html("justdial_page.html")))
+    df = justdial.scrape("Bakeries in Delhi", num_pages=1)
+    assert justdial.browser_calls == 1
+    assert df["Store Name"].tolist() == ["Browser Bakery"]
+
+
+def test_http_engine_never_opens_the_browser(scraper, fixture_html):
+    justdial = scraper(_without_phones(fixture_html("justdial_page.html")), engine="http")
+    df = justdial.scrape("Bakeries in Delhi", num_pages=1)
+    assert justdial.browser_calls == 0
+    assert len(df) == 200
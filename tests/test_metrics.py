@@ -0,0 +1,54 @@
+import pickle
+
+from utils.metrics import Histogram, StageMetrics, metric_labels
+
+
+def test_histogram_quantiles_are_bucket_bounds():
+    histogram = Histogram(buckets=(0.1, 1.0, 10.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value)
+
+    assert histogram.counts == [1, 2, 1, 0]
+    assert histogram.quantile(0.5) == 1.0
+    assert histogram.quantile(1.0) == 5.0
+
+
+def test_context_labels_feed_city_totals_and_slowest_spans():
+    metrics = StageMetrics(slowest=2)
+    with metric_labels(city="Pune"):
+        metrics.observe("details", 2.0, "google_maps", place="Cake Shop")
+        metrics.observe("details", 1.0, "google_maps", place="Bread Co")
+        metrics.observe("search", 3.0, "google_maps")
+    metrics.observe("city", 9.0)
+
+    report = metrics.report()
+
+    assert report["cities"] == {"Pune": {"details": 3.0, "search": 3.0}}
+    assert [(span["stage"], span["seconds"]) for span in report["slowest"]] == [("city", 9.0), ("search", 3.0)]
+    assert report["stages"]["google_maps"]["details"]["count"] == 2
+    assert "batch" in report["stages"]
+
+
+def test_worker_state_merges_into_the_parent():
+    parent, worker = StageMetrics(), StageMetrics()
+    parent.observe("search", 1.0, "google_maps")
+    with metric_labels(city="Pune"):
+        worker.observe("search", 2.0, "google_maps")
+
+    parent.merge(pickle.loads(pickle.dumps(worker.drain())))
+
+    assert parent.histograms[("google_maps", "search")].count == 2
+    assert parent.city_totals == {"Pune": {"search": 2.0}}
+    assert worker.histograms == {}
+
+
+def test_prometheus_buckets_are_cumulative():
+    metrics = StageMetrics(buckets=(1.0, 10.0))
+    metrics.observe("scroll", 0.5, 'google"maps')
+    metrics.observe("scroll", 5.0, 'google"maps')
+
+    lines = metrics.to_prometheus().splitlines()
+
+    assert 'scraper_stage_duration_seconds_bucket{source="google\\"maps",stage="scroll",le="1.0"} 1' in lines
+    assert 'scraper_stage_duration_seconds_bucket{source="google\\"maps",stage="scroll",le="10.0"} 2' in lines
+    assert 'scraper_stage_duration_seconds_count{source="google\\"maps",stage="scroll"} 2' in lines
@@ -0,0 +1,47 @@
+import pytest
+
+from utils.network_filter import BlockingProfile
+
+
+class RecordingDriver:
+    def __init__(self):
+        self.commands = []
+
+    def execute_cdp_cmd(self, command, params):
+        self.commands.append((command, params))
+
+
+def test_allow_pattern_exempts_url_from_broader_deny():
+    profile = BlockingProfile(allow=["https://maps.gstatic.com/mapfiles/*"])
+    assert profile.blocks("https://example.com/photo.png")
+    assert not profile.blocks("https://maps.gstatic.com/mapfiles/marker.png")
+    # The broad deny pattern stays in place for every other URL
+    assert "*.png*" in profile.blocked_patterns
+
+
+def test_allow_patterns_are_sent_before_the_deny_list():
+    profile = BlockingProfile(allow=["https://maps.gstatic.com/mapfiles/*"])
+    driver = RecordingDriver()
+    profile.apply(driver)
+    command, params = driver.commands[-1]
+    assert command == "Network.setBlockedURLs"
+    assert params["urls"] == profile.blocked_patterns
+    assert params["urlPatterns"] == [{"urlPattern": "https://maps.gstatic.com/mapfiles/*", "block": False}]
+
+
+def test_profile_without_allow_list_sends_only_urls():
+    driver = RecordingDriver()
+    BlockingProfile().apply(driver)
+    assert "urlPatterns" not in driver.commands[-1][1]
+
+
+def test_allow_pattern_must_be_absolute():
+    with pytest.raises(ValueError):
+        BlockingProfile(allow=["*gstatic.com*"])
+
+
+def test_extend_keeps_defaults():
+    profile = BlockingProfile().extend(deny=["*/maps/vt*"])
+    assert profile.blocks("https://www.google.com/maps/vt?pb=1")
+    assert profile.blocks("https://www.googletagmanager.com/gtm.js")
+    assert not profile.blocks("https://www.google.com/maps/search/bakeries")
@@ -0,0 +1,37 @@
+from utils.place_index import PlaceIndex, place_key
+
+
+def test_place_key_ignores_case_accents_and_long_locations():
+    assert place_key("Café Goodluck!", "12, MG Road, Camp") == place_key("cafe goodluck", "12 MG Road Camp, Pune 411001")
+    assert place_key("Cafe Goodluck", "Deccan") != place_key("Cafe Goodluck", "Camp")
+
+
+def test_fresh_records_are_reused_and_stale_ones_refetched(tmp_path):
+    with PlaceIndex(tmp_path / "index.sqlite", max_age_days=7) as index:
+        key = place_key("Cake Shop", "MG Road")
+        index.store("google_maps", key, {"Name": "Cake Shop", "Phone Number": "020 1234"}, now=1000.0)
+
+        assert index.lookup("google_maps", key, now=1000.0 + 86400)["Phone Number"] == "020 1234"
+        assert index.get("google_maps", key)["seen_at"] == 1000.0 + 86400
+        assert index.lookup("google_maps", key, now=1000.0 + 8 * 86400) is None
+        assert index.lookup("zomato", key, now=1000.0) is None
+
+
+def test_index_persists_across_runs(tmp_path):
+    path = tmp_path / "index.sqlite"
+    with PlaceIndex(path) as index:
+        index.store("google_maps", "cake shop|mg road", {"Name": "Cake Shop"})
+        index.set_scope("google_maps", "Bakeries in Pune", ["cake shop|mg road", "bread co|camp"])
+        index.set_scope("google_maps", "Bakeries in Pune", ["cake shop|mg road"])
+
+    with PlaceIndex(path) as index:
+        assert len(index) == 1
+        assert index.scope_keys("google_maps", "Bakeries in Pune") == {"cake shop|mg road"}
+
+
+def test_index_for_shared_storage_is_opened_without_wal(tmp_path):
+    with PlaceIndex(tmp_path / "index.sqlite", wal=False) as index:
+        index.store("google_maps", "cake shop|", {"Name": "Cake Shop"})
+        assert index._conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+
+    assert not (tmp_path / "index.sqlite-wal").exists()
@@ -0,0 +1,38 @@
+import time
+
+import pytest
+
+from utils.rate_limiter import HostRateLimiter, TokenBucket, parse_limit
+
+
+def test_bucket_allows_a_burst_then_paces_requests():
+    bucket = TokenBucket(rate=20.0, burst=2)
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == 0.0
+
+    started = time.monotonic()
+    waited = bucket.acquire()
+    assert waited > 0
+    assert time.monotonic() - started >= 0.04
+
+
+def test_hosts_match_by_suffix_and_unlisted_hosts_are_not_limited():
+    limiter = HostRateLimiter({"zomato.com": (1.0, 1)})
+    assert limiter._bucket_for("https://www.zomato.com/pune") is limiter.buckets["zomato.com"]
+    assert limiter._bucket_for("zomato.com") is limiter.buckets["zomato.com"]
+    assert limiter._bucket_for("https://notzomato.com/") is None
+    assert limiter.acquire("https://example.com/") == 0.0
+
+
+@pytest.mark.parametrize("spec, expected", [
+    ("google.com=2", ("google.com", (2.0, 2.0))),
+    ("justdial.com=0.5", ("justdial.com", (0.5, 1.0))),
+    ("zomato.com=1:5", ("zomato.com", (1.0, 5.0))),
+])
+def test_parse_limit(spec, expected):
+    assert parse_limit(spec) == expected
+
+
+def test_parse_limit_rejects_missing_rate():
+    with pytest.raises(ValueError, match="host=rate"):
+        parse_limit("google.com")
@@ -0,0 +1,26 @@
+import pandas as pd
+
+from utils.result_sink import CsvResultSink
+
+
+def test_batches_are_appended_under_a_fixed_schema(tmp_path):
+    path = tmp_path / "all.csv"
+    sink = CsvResultSink(path, ["Name", "Rating"])
+    sink.write(pd.DataFrame({"Name": ["Cake Shop"], "Rating": [4.5], "Extra": ["dropped"]}))
+    sink.write(pd.DataFrame())
+    sink.write(pd.DataFrame({"Name": ["Bread Co"]}))
+
+    assert not path.exists()
+    assert sink.finalize() == path
+    assert sink.rows == 2
+    df = pd.read_csv(path)
+    assert df.columns.tolist() == ["Name", "Rating"]
+    assert df["Name"].tolist() == ["Cake Shop", "Bread Co"]
+    assert pd.isna(df["Rating"].iloc[1])
+
+
+def test_discard_leaves_nothing_behind(tmp_path):
+    sink = CsvResultSink(tmp_path / "all.csv", ["Name"])
+    sink.write(pd.DataFrame({"Name": ["Cake Shop"]}))
+    sink.discard()
+    assert list(tmp_path.iterdir()) == []
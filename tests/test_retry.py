@@ -0,0 +1,74 @@
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from utils.metrics import StageMetrics, get_metrics, set_metrics
+from utils.retry import RetryPolicies, RetryPolicy, parse_policy
+
+
+@pytest.fixture
+def metrics():
+    previous = get_metrics()
+    metrics = StageMetrics()
+    set_metrics(metrics)
+    yield metrics
+    set_metrics(previous)
+
+
+def flaky(failures, error=WebDriverException("tab crashed")):
+    """Function failing ``failures`` times before returning 'ok'."""
+    calls = []
+
+    def call():
+        calls.append(1)
+        if len(calls) <= failures:
+            raise error
+        return "ok"
+
+    call.calls = calls
+    return call
+
+
+def test_transient_errors_are_retried_and_recorded(metrics):
+    policies = RetryPolicies({"search": RetryPolicy(3, 0.0, 0.0)})
+    function = flaky(2)
+
+    assert policies.call("search", function, source="google_maps") == "ok"
+    assert len(function.calls) == 3
+    assert metrics.histograms[("google_maps", "retry")].count == 2
+
+
+def test_retries_stop_after_the_last_attempt(metrics):
+    function = flaky(5)
+    with pytest.raises(WebDriverException):
+        RetryPolicies({"search": RetryPolicy(2, 0.0, 0.0)}).call("search", function)
+    assert len(function.calls) == 2
+
+
+def test_other_errors_fail_at_once(metrics):
+    function = flaky(1, error=KeyError("Name"))
+    with pytest.raises(KeyError):
+        RetryPolicies().call("search", function)
+    assert len(function.calls) == 1
+
+
+def test_delay_doubles_with_jitter_up_to_the_maximum():
+    policies = RetryPolicies({"city": RetryPolicy(5, 1.0, 5.0)})
+    assert 1.0 <= policies.delay("city", 1) <= 2.0
+    assert 2.0 <= policies.delay("city", 2) <= 3.0
+    assert policies.delay("city", 4) == 5.0
+    assert policies.get("unknown") == RetryPolicy(1, 0.0, 0.0)
+
+
+@pytest.mark.parametrize("spec, expected", [
+    ("details=4", ("details", RetryPolicy(4, 0.5, 4.0))),
+    ("city=3:60", ("city", RetryPolicy(3, 60.0, 120.0))),
+    ("search=2:1:5", ("search", RetryPolicy(2, 1.0, 5.0))),
+])
+def test_parse_policy(spec, expected):
+    assert parse_policy(spec) == expected
+
+
+@pytest.mark.parametrize("spec", ["details", "=3", "details=1:2:3:4"])
+def test_parse_policy_rejects_malformed_values(spec):
+    with pytest.raises(ValueError):
+        parse_policy(spec)
@@ -0,0 +1,36 @@
+from utils.run_journal import DONE, EMPTY, FAILED, RunJournal
+
+
+def test_reopened_journal_keeps_latest_outcome_and_run_date(tmp_path):
+    city_file = tmp_path / "Pune.csv"
+    city_file.write_text("Name\nCake Shop\n")
+    journal = RunJournal(tmp_path / "run.jsonl")
+    journal.record("Pune", FAILED, error="timeout")
+    journal.record("Pune", DONE, output_file=city_file, rows=1)
+    journal.record("Agra", EMPTY)
+
+    resumed = RunJournal(journal.path)
+
+    assert resumed.started_at == journal.started_at
+    assert resumed.is_complete("Pune")
+    assert resumed.completed_files() == [city_file]
+    assert resumed.unfinished_cities() == ["Agra"]
+
+
+def test_run_date_is_the_date_of_the_first_entry(tmp_path):
+    path = tmp_path / "run.jsonl"
+    path.write_text(
+        '{"city": "Pune", "status": "empty", "recorded_at": "2020-01-02 23:59:00"}\n'
+        '{"city": "Agra", "status": "empty", "recorded_at": "2020-01-03 00:01:00"}\n'
+    )
+
+    assert RunJournal(path).run_date == "2020-01-02"
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    path = tmp_path / "run.jsonl"
+    RunJournal(path).record("Pune", EMPTY)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"city": "Agra", "sta')
+
+    assert list(RunJournal(path).entries) == ["Pune"]
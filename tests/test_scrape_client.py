@@ -0,0 +1,49 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from scrape_service import ScrapeService
+from utils.scrape_client import ScrapeServiceClient
+from utils.scrape_jobs import DONE
+
+LISTING = {"Name": "Cake Shop", "Rating": "4.5", "Cost for Two": "₹450 for two", "Location": "Kothrud"}
+
+
+@pytest.fixture
+def client():
+    """Client of a running service whose Zomato scrapes return one listing without a browser."""
+    service = ScrapeService(("127.0.0.1", 0), workers=1)
+
+    def run_zomato(city, params, report):
+        report(LISTING)
+        return pd.DataFrame([LISTING])
+
+    service.manager.runners["zomato"] = run_zomato
+    threading.Thread(target=service.serve_forever, daemon=True).start()
+    yield ScrapeServiceClient(f"http://127.0.0.1:{service.server_address[1]}")
+    service.shutdown()
+    service.server_close()
+
+
+def test_remote_job_result_keeps_cleaned_dtypes(client):
+    job_id = client.submit("zomato", "pune").id
+    deadline = time.monotonic() + 5
+    job = client.get(job_id)
+    while not job.done and time.monotonic() < deadline:
+        time.sleep(0.05)
+        job = client.get(job_id)
+
+    assert job.status == DONE
+    assert job.result["Rating"].tolist() == [4.5]
+    assert job.result["Cost for Two"].dtype == "Int64"
+    assert job.partial()["Name"].tolist() == ["Cake Shop"]
+    assert client.submit("zomato", "Pune").cached
+
+
+def test_unknown_scrapers_and_jobs(client):
+    with pytest.raises(ValueError, match="Unknown scraper"):
+        client.submit("yelp", "Bakeries")
+    assert client.get("missing") is None
+    assert client.get(None) is None
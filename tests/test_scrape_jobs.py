@@ -0,0 +1,67 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from utils.scrape_jobs import DONE, FAILED, JobRejected, ScrapeJobManager
+
+
+def wait(job, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not job.done:
+        assert time.monotonic() < deadline, f"Job {job.query} did not finish"
+        time.sleep(0.01)
+    return job
+
+
+@pytest.fixture
+def manager():
+    """Manager whose 'zomato' runner reports each listing and blocks until released."""
+    release = threading.Event()
+    calls = []
+
+    def run(query, params, report):
+        calls.append(query)
+        listings = [{"Name": "Cake Shop", "Rating": "4.5/5", "Cost for Two": "₹450 for two"}] if query != "nowhere" else []
+        for listing in listings:
+            report(listing)
+        release.wait(5)
+        if query == "broken":
+            raise RuntimeError("blocked")
+        return pd.DataFrame(listings)
+
+    manager = ScrapeJobManager({"zomato": run}, max_workers=1, max_pending=1)
+    manager.release, manager.calls = release, calls
+    yield manager
+    release.set()
+    manager.shutdown()
+
+
+def test_running_query_is_joined_and_result_cached(manager):
+    job = manager.submit("zomato", "Pune")
+    assert manager.submit("zomato", "  pune ") is job
+    manager.release.set()
+
+    assert wait(job).status == DONE
+    assert job.partial()["Rating"].tolist() == [4.5]
+    cached = manager.submit("zomato", "Pune")
+    assert cached.cached and cached.status == DONE
+    assert manager.calls == ["Pune"]
+
+
+def test_full_queue_rejects_new_scrapes(manager):
+    manager.submit("zomato", "Pune")
+    manager.submit("zomato", "Agra")
+    with pytest.raises(JobRejected):
+        manager.submit("zomato", "Delhi")
+    assert manager.stats()["queued"] + manager.stats()["running"] == 2
+
+
+def test_failed_and_empty_results_are_not_cached(manager):
+    manager.release.set()
+    assert wait(manager.submit("zomato", "broken")).status == FAILED
+    assert wait(manager.submit("zomato", "nowhere")).status == DONE
+
+    assert manager.stats()["cached"] == 0
+    assert not manager.submit("zomato", "nowhere").cached
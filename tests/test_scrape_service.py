@@ -0,0 +1,34 @@
+import threading
+
+import pytest
+import requests
+
+from scrape_service import SCRAPERS, ScrapeService
+
+
+@pytest.fixture
+def service():
+    service = ScrapeService(("127.0.0.1", 0), workers=2)
+    threading.Thread(target=service.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{service.server_address[1]}", service
+    service.shutdown()
+    service.server_close()
+
+
+def test_pools_share_one_browser_budget(service):
+    url, server = service
+    assert set(server.driver_pools) == set(SCRAPERS)
+    assert {id(pool.budget) for pool in server.driver_pools.values()} == {id(server.browser_budget)}
+    assert server.browser_budget.limit == 2
+    assert requests.get(f"{url}/health").json()["browsers"] == 0
+
+
+def test_rejects_unknown_scraper(service):
+    url, _ = service
+    response = requests.post(f"{url}/jobs", json={"scraper": "yelp", "query": "Bakeries"})
+    assert response.status_code == 400
+
+
+def test_unknown_job_is_404(service):
+    url, _ = service
+    assert requests.get(f"{url}/jobs/missing").status_code == 404
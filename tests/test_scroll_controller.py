@@ -0,0 +1,50 @@
+import pytest
+
+from utils.scroll_controller import FeedState, ScrollController
+
+
+def test_timeout_follows_observed_latency():
+    controller = ScrollController(initial_timeout=3.0, min_timeout=0.5, max_timeout=10.0, safety=2.0)
+    assert controller.timeout() == 3.0
+    for _ in range(10):
+        controller.record(FeedState(0), FeedState(10), waited=0.4)
+    assert controller.timeout() == pytest.approx(0.8)
+
+    controller.record(FeedState(10), FeedState(10), waited=0.8)
+    assert controller.timeout() == pytest.approx(1.2)
+
+
+def test_feed_is_done_after_idle_rounds_or_the_end_marker():
+    controller = ScrollController(min_idle_rounds=2)
+    controller.record(FeedState(0), FeedState(0), waited=3.0)
+    assert not controller.done
+    controller.fail()
+    assert controller.done
+
+    ended = ScrollController()
+    ended.record(FeedState(10), FeedState(12, end=True), waited=0.2)
+    assert ended.done
+
+
+def test_slow_loads_earn_more_idle_rounds():
+    controller = ScrollController(min_idle_rounds=2, max_idle_rounds=5)
+    for waited in [0.2] * 10:
+        controller.record(FeedState(0), FeedState(1), waited=waited)
+    assert controller.idle_limit() == 2
+
+    # One load far slower than the round timeout means empty rounds may just be slow
+    controller.record(FeedState(1), FeedState(2), waited=1.2)
+    assert controller.idle_limit() == 4
+
+
+def test_advance_polls_until_new_items_arrive():
+    controller = ScrollController(poll_interval=0.01)
+    states = iter([FeedState(5), FeedState(5), FeedState(5), FeedState(9)])
+    scrolls, sleeps = [], []
+
+    state = controller.advance(lambda: scrolls.append(1), lambda: next(states), sleep=sleeps.append)
+
+    assert state == FeedState(9)
+    assert scrolls == [1]
+    assert sleeps == [0.01, 0.01]
+    assert controller.rounds == 1 and controller.idle_rounds == 0
@@ -0,0 +1,52 @@
+import os
+import time
+
+import pandas as pd
+
+import scrapers.justdial_scraper as justdial_scraper
+from conftest import FakeFetcher
+from scrapers.justdial_scraper import JustDialScraper
+from utils.snapshot_store import SnapshotStore
+
+
+def test_identical_html_is_stored_once(tmp_path):
+    store = SnapshotStore(tmp_path)
+    store.start("zomato", "pune")
+    first = store.record("zomato", "pune", "listings", "<div>Cake Shop</div>")
+    second = store.record("zomato", "pune", "listings", "<div>Cake Shop</div>", page=2)
+
+    assert first == second
+    assert store.get(first) == "<div>Cake Shop</div>"
+    assert len(list(tmp_path.glob("objects/*/*.html.gz"))) == 1
+    assert [entry.get("page") for entry in store.entries("zomato", "pune")] == [None, 2]
+
+
+def test_start_replaces_an_earlier_recording(tmp_path):
+    store = SnapshotStore(tmp_path)
+    store.start("zomato", "pune")
+    store.record("zomato", "pune", "listings", "<div>old</div>")
+    store.start("zomato", "pune")
+
+    assert not store.has("zomato", "pune")
+
+
+def test_evict_removes_files_past_the_ttl(tmp_path):
+    store = SnapshotStore(tmp_path, ttl_days=1)
+    store.start("zomato", "pune")
+    digest = store.record("zomato", "pune", "listings", "<div>Cake Shop</div>")
+    stale = time.time() - 2 * 86400
+    os.utime(store._object_path(digest), (stale, stale))
+
+    assert store.evict() == 1
+    assert store.has("zomato", "pune")
+
+
+def test_replay_reproduces_a_recorded_scrape(tmp_path, monkeypatch, fixture_html):
+    monkeypatch.setattr(justdial_scraper, "get_http_fetcher", lambda: FakeFetcher([fixture_html("justdial_page.html")]))
+    store = SnapshotStore(tmp_path)
+    scraped = JustDialScraper(engine="http", snapshot_store=store).scrape("Bakeries in Delhi", num_pages=1)
+
+    replayed = JustDialScraper(snapshot_store=store).replay("Bakeries in Delhi")
+
+    assert len(scraped) == 200
+    pd.testing.assert_frame_equal(replayed, scraped)
@@ -0,0 +1,102 @@
+import threading
+import time
+
+import pytest
+
+import utils.work_queue
+from utils.work_queue import DONE, FAILED, LEASED, QUEUED, LeaseKeeper, open_queue
+
+
+@pytest.fixture(params=["queue.db", "queue.json"])
+def queue(request, tmp_path):
+    with open_queue(tmp_path / request.param) as queue:
+        yield queue
+
+
+def test_items_are_leased_in_publish_order_once_each(queue):
+    assert queue.publish({"Pune": {"city": "Pune"}, "Agra": {"city": "Agra"}}) == 2
+    assert queue.publish({"Pune": {"city": "Pune"}}) == 0
+
+    first = queue.lease("a", visibility_timeout=60)
+    second = queue.lease("b", visibility_timeout=60)
+
+    assert (first.key, first.payload, first.attempt) == ("Pune", {"city": "Pune"}, 1)
+    assert second.key == "Agra"
+    assert queue.lease("c", visibility_timeout=60) is None
+    assert queue.counts() == {QUEUED: 0, LEASED: 2, DONE: 0, FAILED: 0}
+
+
+def test_expired_lease_is_taken_over_and_the_old_holder_fenced(queue):
+    queue.publish({"Pune": {"city": "Pune"}})
+    stale = queue.lease("a", visibility_timeout=0.05)
+    time.sleep(0.1)
+    current = queue.lease("b", visibility_timeout=60)
+
+    assert current.attempt == 2
+    assert not queue.complete(stale, {"rows": 1})
+    assert not queue.heartbeat(stale, 60)
+    assert queue.complete(current, {"rows": 2})
+    [item] = queue.items()
+    assert (item["status"], item["result"]) == (DONE, {"rows": 2})
+
+
+def test_failed_items_are_retried_until_out_of_attempts(queue):
+    queue.publish({"Pune": {"city": "Pune"}}, max_attempts=2)
+    assert queue.fail(queue.lease("a", 60), "timeout", delay=60)
+    assert queue.lease("a", 60) is None
+
+    queue.publish({"Agra": {"city": "Agra"}}, max_attempts=2)
+    item = queue.lease("a", 60)
+    queue.fail(item, "timeout")
+    queue.fail(queue.lease("a", 60), "blocked")
+
+    assert {entry["key"]: entry["status"] for entry in queue.items()} == {"Pune": QUEUED, "Agra": FAILED}
+    # Republishing requeues failed cities with fresh attempts
+    assert queue.publish({"Agra": {"city": "Agra"}}) == 1
+    assert queue.lease("a", 60).attempt == 1
+
+
+def test_concurrent_workers_never_share_an_item(queue):
+    queue.publish({f"city-{i}": {"i": i} for i in range(40)})
+    leased, lock = [], threading.Lock()
+
+    def work(worker):
+        while True:
+            item = queue.lease(worker, 60)
+            if item is None:
+                return
+            with lock:
+                leased.append(item.key)
+            queue.complete(item, {})
+
+    threads = [threading.Thread(target=work, args=(f"w{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(leased) == sorted(f"city-{i}" for i in range(40))
+    assert queue.counts()[DONE] == 40
+
+
+def test_lease_keeper_extends_the_lease(queue):
+    queue.publish({"Pune": {"city": "Pune"}})
+    item = queue.lease("a", visibility_timeout=0.15)
+    with LeaseKeeper(queue, item, visibility_timeout=0.15) as keeper:
+        time.sleep(0.4)
+        assert queue.lease("b", 60) is None
+    assert not keeper.lost
+    assert queue.complete(item, {})
+
+
+def test_unknown_backend_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Unknown queue backend"):
+        open_queue(tmp_path / "queue.db", backend="redis")
+
+
+def test_file_backend_without_posix_locks_names_the_alternative(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils.work_queue, "fcntl", None)
+
+    with pytest.raises(RuntimeError, match="'file' queue backend .* 'sqlite'"):
+        open_queue(tmp_path / "queue.json")
+    open_queue(tmp_path / "queue.db").close()
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+import scrapers.zomato_scraper as zomato_scraper
+from conftest import FakeFetcher
+from scrapers.zomato_scraper import ZomatoBakeryScraper
+
+BROWSER_LISTING = {"Name": "Browser Bakery", "Rating": "4.1", "Cost for Two": "₹300 for two", "Location": "Kothrud"}
+
+
+def _state_page(names, total=None):
+    """Listing page whose listings only exist in the embedded preloaded state."""
+    state = {"pages": {"search": {"sections": [{"info": {"name": name}} for name in names]}}}
+    if total is not None:
+        state["pages"]["search"]["totalResults"] = total
+    return f"<html><script>window.__PRELOADED_STATE__ = JSON.parse({json.dumps(json.dumps(state))});</script></html>"
+
+
+@pytest.fixture
+def scraper(monkeypatch):
+    def serve(*pages):
+        monkeypatch.setattr(zomato_scraper, "get_http_fetcher", lambda: FakeFetcher(pages))
+        scraper = ZomatoBakeryScraper("pune")
+        scraper.browser_calls = 0
+
+        def scroll():
+            scraper.browser_calls += 1
+            scraper.listing_complete = True
+            return [dict(BROWSER_LISTING)]
+
+        monkeypatch.setattr(scraper, "_scroll_and_extract_listings", scroll)
+        return scraper
+    return serve
+
+
+def test_first_page_only_falls_back_to_browser(scraper, fixture_html):
+    zomato = scraper(fixture_html("zomato_listings.html"))
+    assert zomato._collect_listings() == [BROWSER_LISTING]
+    assert zomato.browser_calls == 1
+
+
+def test_short_of_reported_total_falls_back_to_browser(scraper):
+    zomato = scraper(_state_page(["A", "B"], total=40))
+    zomato._collect_listings()
+    assert zomato.browser_calls == 1
+
+
+def test_full_http_listing_is_used_but_not_complete(scraper):
+    zomato = scraper(_state_page(["A", "B"], total=2))
+    listings = zomato._collect_listings()
+    assert [listing["Name"] for listing in listings] == ["A", "B"]
+    assert zomato.browser_calls == 0
+    # Delta runs only infer removals from a full browser scroll
+    assert not zomato.listing_complete
+
+
+def test_http_engine_keeps_partial_results(scraper, fixture_html):
+    zomato = scraper(fixture_html("zomato_listings.html"))
+    zomato.engine = "http"
+    assert len(zomato._collect_listings()) == 300
+    assert zomato.browser_calls == 0
+    assert not zomato.listing_complete
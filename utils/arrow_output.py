@@ -0,0 +1,188 @@
+import os
+from io import BytesIO
+from pathlib import Path
+from typing import Optional, Union
+from urllib.parse import quote
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# Explicit column types per scraper, so Parquet keeps what CSV loses
+SCHEMAS = {
+    "google_maps": pa.schema([
+        ("Name", pa.string()),
+        ("Rating", pa.float64()),
+        ("Rating Count", pa.int64()),
+        ("Category", pa.string()),
+        ("Full Address", pa.string()),
+        ("Phone Number", pa.string()),
+    ]),
+    "zomato": pa.schema([
+        ("Name", pa.string()),
+        ("Rating", pa.float64()),
+        ("Cost for Two", pa.int64()),
+        ("Price Category", pa.string()),
+        ("Location", pa.string()),
+    ]),
+    "justdial": pa.schema([
+        ("Store Name", pa.string()),
+        ("Address", pa.string()),
+        ("Rating", pa.float64()),
+        ("Rating Count", pa.int64()),
+        ("Phone Number", pa.string()),
+    ]),
+}
+
+# Columns added by batch runs
+BATCH_FIELDS = [
+    pa.field("Source City", pa.string()),
+    pa.field("Scrape Date", pa.timestamp("s")),
+]
+
+
+def schema_for(source: str, df: Optional[pd.DataFrame] = None) -> pa.Schema:
+    """Return the schema for a scraper, plus batch columns present in ``df``."""
+    if source not in SCHEMAS:
+        raise ValueError(f"Unknown source '{source}', expected one of {list(SCHEMAS)}")
+    schema = SCHEMAS[source]
+    for field in BATCH_FIELDS:
+        if df is not None and field.name in df.columns:
+            schema = schema.append(field)
+    return schema
+
+
+def to_table(df: pd.DataFrame, source: str) -> pa.Table:
+    """
+    Convert scraper results to an Arrow table with the scraper's schema.
+
+    Values are coerced to the schema types; unparseable values become null
+    and missing columns are filled with nulls.
+
+    Args:
+        df: Results DataFrame (typed, or re-read from CSV)
+        source: Scraper key in SCHEMAS
+
+    Returns:
+        Arrow table with exactly the schema's columns
+    """
+    schema = schema_for(source, df)
+    columns = {}
+    for field in schema:
+        values = df[field.name] if field.name in df.columns else pd.Series([None] * len(df), dtype=object)
+        if pa.types.is_floating(field.type):
+            values = pd.to_numeric(values, errors="coerce").astype("float64")
+        elif pa.types.is_integer(field.type):
+            values = pd.to_numeric(values, errors="coerce").astype("Int64")
+        elif pa.types.is_timestamp(field.type):
+            values = pd.to_datetime(values, errors="coerce")
+        else:
+            values = values.astype("string")
+        columns[field.name] = pa.array(values, type=field.type, from_pandas=True)
+    return pa.table(columns, schema=schema)
+
+
+def to_parquet_bytes(df: pd.DataFrame, source: str) -> bytes:
+    """Serialize results to an in-memory Parquet file, e.g. for a download button."""
+    buffer = BytesIO()
+    pq.write_table(to_table(df, source), buffer)
+    return buffer.getvalue()
+
+
+def partition_path(root: Union[str, Path], source: str, city: str, date: str) -> Path:
+    """Hive-style directory for one source, city and date."""
+    return Path(root) / f"source={source}" / f"city={quote(city, safe='')}" / f"date={date}"
+
+
+def write_partition(
+    df: pd.DataFrame,
+    root: Union[str, Path],
+    source: str,
+    city: str,
+    date: Optional[str] = None
+) -> Path:
+    """
+    Atomically write results as one Parquet file in their partition.
+
+    Rewriting the same source, city and date replaces the earlier file, so
+    reruns and resumed runs do not duplicate rows.
+
+    Args:
+        df: Results DataFrame
+        root: Dataset root directory
+        source: Scraper key in SCHEMAS
+        city: City (or query) the results belong to
+        date: Partition date as YYYY-MM-DD (defaults to today)
+
+    Returns:
+        Path of the written file
+    """
+    date = date or pd.Timestamp.now().strftime("%Y-%m-%d")
+    directory = partition_path(root, source, city, date)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    path = directory / "part-0.parquet"
+    partial_path = directory / "part-0.parquet.part"
+    pq.write_table(to_table(df, source), partial_path)
+    os.replace(partial_path, path)
+    return path
+
+
+def read_results(root: Union[str, Path], source: Optional[str] = None, city: Optional[str] = None) -> pd.DataFrame:
+    """
+    Read partitioned results with a columnar scan, pruning by source and city.
+
+    Args:
+        root: Dataset root directory
+        source: Only read this scraper's partitions
+        city: Only read this city's partitions
+
+    Returns:
+        DataFrame with partition columns 'source', 'city' and 'date' added
+    """
+    dataset = ds.dataset(root, format="parquet", partitioning="hive")
+    condition = None
+    for name, value in (("source", source), ("city", city)):
+        if value is not None:
+            term = ds.field(name) == value
+            condition = term if condition is None else condition & term
+    return dataset.to_table(filter=condition).to_pandas()
+
+
+class ParquetResultSink:
+    """Result sink writing each batch to its own source/city/date partition.
+
+    Mirrors CsvResultSink so batch runs can switch output formats.
+    """
+
+    def __init__(self, root: Union[str, Path], source: str, date: Optional[str] = None):
+        """
+        Open a partitioned Parquet sink.
+
+        Args:
+            root: Dataset root directory
+            source: Scraper key in SCHEMAS
+            date: Partition date as YYYY-MM-DD (defaults to today)
+        """
+        schema_for(source)
+        self.path = Path(root)
+        self.source = source
+        self.date = date or pd.Timestamp.now().strftime("%Y-%m-%d")
+        self.rows = 0
+
+    def write(self, df: pd.DataFrame, city: Optional[str] = None) -> None:
+        """Write one city's results as a partition file."""
+        if df is None or df.empty:
+            return
+        if city is None:
+            city = str(df["Source City"].iloc[0])
+        write_partition(df, self.path, self.source, city, self.date)
+        self.rows += len(df)
+
+    def finalize(self) -> Path:
+        """Partitions are written atomically as they arrive; return the dataset root."""
+        return self.path
+
+    def discard(self) -> None:
+        """Nothing is left half-written between batches."""
@@ -0,0 +1,129 @@
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from utils.place_index import PlaceIndex
+
+# Kinds of change reported for a place
+ADDED = "added"
+CHANGED = "changed"
+REMOVED = "removed"
+
+# Columns of the change-set DataFrame
+CHANGE_COLUMNS = ["Change", "Name", "Key", "Changes"]
+
+
+class ChangeSet:
+    """Added, changed and removed places of one scrape versus the stored state.
+
+    Cards are compared with the records a PlaceIndex holds from earlier
+    runs on a few card-level fields (rating, rating count, cost...). Places
+    listed for the same scope last time but not seen now are reported as
+    removed when ``finish`` is told the listing was complete.
+
+    A scope can also be split across several scrapes, e.g. the map tiles of
+    one city: each part runs a ``shared`` ChangeSet, and the owner of the
+    scope ``merge``s their results before finishing it once for all of them.
+    """
+
+    def __init__(
+        self,
+        index: PlaceIndex,
+        source: str,
+        scope: str,
+        fields: List[str],
+        name_field: str = "Name",
+        shared: bool = False
+    ):
+        """
+        Start tracking changes for one scrape.
+
+        Args:
+            index: Place index holding the previous state
+            source: Scraper name, e.g. 'google_maps'
+            scope: What was scraped, e.g. the query or city
+            fields: Card-level fields whose change marks a place as changed
+            name_field: Field holding the place name
+            shared: This scrape covers only part of the scope, whose owner
+                merges it; finish then neither reports removals nor
+                touches the scope's stored keys
+        """
+        self.index = index
+        self.source = source
+        self.scope = scope
+        self.fields = list(fields)
+        self.name_field = name_field
+        self.shared = shared
+        self.previous = index.scope_keys(source, scope)
+        self.seen = set()
+        self.rows: List[Dict[str, str]] = []
+
+    def compare(self, key: str, card: Dict) -> Optional[str]:
+        """
+        Classify a freshly extracted card against its stored record.
+
+        Args:
+            key: Place key from place_key()
+            card: Card-level data, holding at least the tracked fields and the name
+
+        Returns:
+            ADDED or CHANGED, or None if the place is unchanged
+        """
+        self.seen.add(key)
+        entry = self.index.get(self.source, key)
+        if entry is None:
+            self.rows.append({"Change": ADDED, "Name": card.get(self.name_field), "Key": key, "Changes": ""})
+            return ADDED
+
+        stored = entry["record"]
+        differences = [
+            f"{field}: {stored.get(field)} -> {card.get(field)}"
+            for field in self.fields
+            if str(stored.get(field)) != str(card.get(field))
+        ]
+        if differences:
+            self.rows.append({"Change": CHANGED, "Name": card.get(self.name_field), "Key": key, "Changes": "; ".join(differences)})
+            return CHANGED
+        return None
+
+    def merge(self, changes: pd.DataFrame, seen: Iterable[str]) -> None:
+        """
+        Fold in the change-set of a shared part of this scope.
+
+        Places already reported, e.g. by an overlapping tile, are not
+        reported twice.
+
+        Args:
+            changes: Added and changed places from the part's finish()
+            seen: Keys of every place the part listed, changed or not
+        """
+        reported = {row["Key"] for row in self.rows}
+        for row in changes.to_dict("records"):
+            if row["Change"] != REMOVED and row["Key"] not in reported:
+                reported.add(row["Key"])
+                self.rows.append({column: row[column] for column in CHANGE_COLUMNS})
+        self.seen.update(seen)
+
+    def finish(self, complete: bool = True) -> pd.DataFrame:
+        """
+        Close the scrape and return its change-set.
+
+        Args:
+            complete: Whether the whole listing was seen; removals are only
+                reported (and forgotten) for complete listings
+
+        Returns:
+            DataFrame with CHANGE_COLUMNS
+        """
+        if self.shared:
+            # The owner of the scope decides on removals once every part is merged
+            pass
+        elif complete:
+            for key in sorted(self.previous - self.seen):
+                entry = self.index.get(self.source, key)
+                name = entry["record"].get(self.name_field) if entry else None
+                self.rows.append({"Change": REMOVED, "Name": name, "Key": key, "Changes": ""})
+            self.index.set_scope(self.source, self.scope, self.seen)
+        else:
+            self.index.set_scope(self.source, self.scope, self.previous | self.seen)
+        return pd.DataFrame(self.rows, columns=CHANGE_COLUMNS)
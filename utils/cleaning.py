@@ -0,0 +1,128 @@
+from typing import Callable, Dict, Iterable, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Cost-for-two ranges as (inclusive lower, exclusive upper, category)
+PRICE_RANGES = [
+    (0, 300, 'Budget Friendly'),
+    (300, 600, 'Pocket Friendly'),
+    (600, 1000, 'Moderate'),
+    (1000, 1500, 'Premium'),
+    (1500, float('inf'), 'Luxury')
+]
+
+# Category for missing costs or costs outside every range
+PRICE_NOT_AVAILABLE = 'Not Available'
+
+
+# Whole-string decimal number, after '/5' suffixes and whitespace are removed
+NUMBER_PATTERN = r"^[+-]?(\d+(\.\d*)?|\.\d+)$"
+
+
+def _as_text(values: pd.Series) -> pa.Array:
+    """View raw values as an Arrow string array, so cleaning runs in Arrow's C++ kernels."""
+    try:
+        return pa.array(values, type=pa.string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Mixed types, e.g. numbers among strings
+        return pa.array(values.astype("string"), type=pa.string(), from_pandas=True)
+
+
+def _to_int_series(values: pa.Array, index: pd.Index) -> pd.Series:
+    """Convert an Arrow integer array to a nullable Int64 Series."""
+    mask = values.is_null().to_numpy(zero_copy_only=False)
+    data = pc.fill_null(values, 0).to_numpy(zero_copy_only=False).astype("int64")
+    return pd.Series(pd.arrays.IntegerArray(data, mask), index=index)
+
+
+def clean_rating(values: pd.Series) -> pd.Series:
+    """
+    Convert ratings such as '4.5', '4.5/5' or 'N/A' to float64.
+
+    Unparseable values become NaN.
+    """
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype("float64")
+    text = pc.utf8_trim_whitespace(pc.replace_substring(_as_text(values), "/5", ""))
+    numbers = pc.cast(pc.if_else(pc.match_substring_regex(text, NUMBER_PATTERN), text, None), pa.float64())
+    return pd.Series(numbers.to_numpy(zero_copy_only=False), index=values.index, dtype="float64")
+
+
+def _first_number(values: pd.Series) -> pd.Series:
+    """Read the first (comma-grouped) number in each value as nullable Int64."""
+    if pd.api.types.is_numeric_dtype(values):
+        return pd.to_numeric(values, errors="coerce").round().astype("Int64")
+    text = pc.replace_substring(_as_text(values), ",", "")
+    digits = pc.struct_field(pc.extract_regex(text, r"(?P<number>\d+)"), [0])
+    return _to_int_series(pc.cast(digits, pa.int64()), values.index)
+
+
+def clean_count(values: pd.Series) -> pd.Series:
+    """Convert rating counts such as '(1,234)' or '56 Ratings' to Int64."""
+    return _first_number(values)
+
+
+def clean_cost(values: pd.Series) -> pd.Series:
+    """Convert costs such as '₹1,200 for two' or 'N/A' to Int64."""
+    return _first_number(values)
+
+
+def clean_phone(values: pd.Series) -> pd.Series:
+    """Reduce phone numbers to their digits, as a string Series."""
+    digits = pc.replace_substring_regex(_as_text(values), r"[^0-9]+", "")
+    return pd.Series(pd.arrays.ArrowStringArray(digits), index=values.index)
+
+
+def categorize_price(costs: pd.Series, ranges: Iterable[Tuple[float, float, str]] = PRICE_RANGES) -> pd.Series:
+    """
+    Bin costs into price categories in one pass.
+
+    Args:
+        costs: Numeric costs, missing values allowed
+        ranges: Contiguous (lower, upper, category) ranges, lower bound inclusive
+
+    Returns:
+        String Series of categories, PRICE_NOT_AVAILABLE where no range applies
+    """
+    ranges = list(ranges)
+    bins = [ranges[0][0]] + [upper for _, upper, _ in ranges]
+    labels = [category for _, _, category in ranges]
+    numeric = pd.to_numeric(costs, errors="coerce").astype("float64")
+    categories = pd.cut(numeric, bins=bins, labels=labels, right=False)
+    return categories.astype("string").fillna(PRICE_NOT_AVAILABLE)
+
+
+# Columns cleaned for each scraper's output; Google keeps formatted phone numbers
+COLUMN_CLEANERS: Dict[str, Dict[str, Callable[[pd.Series], pd.Series]]] = {
+    "google_maps": {"Rating": clean_rating, "Rating Count": clean_count},
+    "zomato": {"Rating": clean_rating, "Cost for Two": clean_cost},
+    "justdial": {"Rating": clean_rating, "Rating Count": clean_count, "Phone Number": clean_phone},
+}
+
+
+def clean_results(df: pd.DataFrame, source: str) -> pd.DataFrame:
+    """
+    Clean a scraper's raw results, or re-type results read back from CSV.
+
+    Cleaning is idempotent, so already-clean frames keep their values and
+    every source ends up with the same dtypes: float64 ratings, Int64 counts
+    and costs, string phone numbers.
+
+    Args:
+        df: Results DataFrame
+        source: Scraper key in COLUMN_CLEANERS
+
+    Returns:
+        Cleaned copy of ``df``
+    """
+    if source not in COLUMN_CLEANERS:
+        raise ValueError(f"Unknown source '{source}', expected one of {list(COLUMN_CLEANERS)}")
+    df = df.copy()
+    for column, cleaner in COLUMN_CLEANERS[source].items():
+        if column in df.columns:
+            df[column] = cleaner(df[column])
+    if source == "zomato" and "Cost for Two" in df.columns:
+        df["Price Category"] = categorize_price(df["Cost for Two"])
+    return df
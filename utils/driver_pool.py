@@ -0,0 +1,284 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+# Seconds between checks for a browser slot freed in another pool sharing a budget
+BUDGET_POLL_INTERVAL = 0.5
+
+
+class BrowserBudget:
+    """Caps the number of browsers alive across several driver pools.
+
+    Pools of different scrapers cannot share drivers, since each scraper
+    configures Chrome its own way. A pool sharing a budget may only start a
+    driver while the budget has a free slot; if it has none, an idle driver
+    of another pool is quit to make room. Memory is then bounded by
+    ``limit`` browsers, however many pools there are.
+    """
+
+    def __init__(self, limit: int):
+        """
+        Initialize budget.
+
+        Args:
+            limit: Maximum number of browsers alive across all pools
+        """
+        if limit < 1:
+            raise ValueError("Browser budget must be at least 1")
+        self.limit = limit
+        self._alive = 0
+        self._pools: List["DriverPool"] = []
+        self._lock = threading.Lock()
+
+    def register(self, pool: "DriverPool") -> None:
+        """Add a pool whose idle drivers may be quit to free slots."""
+        with self._lock:
+            self._pools.append(pool)
+
+    def _take(self) -> bool:
+        with self._lock:
+            if self._alive < self.limit:
+                self._alive += 1
+                return True
+            return False
+
+    def reserve(self, requester: "DriverPool", evict: bool = True) -> bool:
+        """
+        Take a slot for a new driver of ``requester``.
+
+        Args:
+            requester: Pool about to start a driver
+            evict: Quit an idle driver of another pool if no slot is free
+
+        Returns:
+            Whether a slot was taken
+        """
+        if self._take():
+            return True
+        if evict:
+            with self._lock:
+                pools = [pool for pool in self._pools if pool is not requester]
+            for pool in pools:
+                # The freed slot may be taken by another pool first; callers retry
+                if pool.evict_idle() and self._take():
+                    return True
+        return False
+
+    def release(self) -> None:
+        """Free the slot of a driver that quit."""
+        with self._lock:
+            self._alive -= 1
+
+    @property
+    def alive(self) -> int:
+        """Browsers currently alive across all pools."""
+        return self._alive
+
+
+class DriverPool:
+    """Thread-safe pool of warmed WebDrivers that scrapers lease and return.
+
+    Drivers are built by ``factory`` (e.g. ``GoogleMapsScraper.create_driver``),
+    so they come out already configured with the anti-detection CDP script.
+    Between leases the pool resets browser state instead of quitting Chrome.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], WebDriver],
+        size: int = 1,
+        max_uses: int = 50,
+        warm: bool = False,
+        budget: Optional[BrowserBudget] = None
+    ):
+        """
+        Initialize driver pool.
+
+        Args:
+            factory: Callable returning a fully configured WebDriver
+            size: Maximum number of drivers alive at once
+            max_uses: Leases after which a driver is recycled to cap memory growth
+            warm: Start all drivers up front instead of on first lease
+            budget: Optional cap on browsers shared with other pools; warming
+                then stops when the budget is used up
+        """
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.factory = factory
+        self.size = size
+        self.max_uses = max_uses
+        self._idle: "queue.LifoQueue[WebDriver]" = queue.LifoQueue()
+        self._uses: Dict[int, int] = {}
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        self.budget = budget
+        if budget is not None:
+            budget.register(self)
+
+        if warm:
+            self.warm()
+
+    def warm(self, count: Optional[int] = None) -> None:
+        """Start drivers ahead of time so the first leases skip the cold start."""
+        count = self.size if count is None else min(count, self.size)
+        while True:
+            with self._lock:
+                if self._created >= count:
+                    return
+                self._created += 1
+            if self.budget is not None and not self.budget.reserve(self, evict=False):
+                with self._lock:
+                    self._created -= 1
+                return
+            self._idle.put(self._create())
+
+    def _create(self) -> WebDriver:
+        """Create a new driver, releasing its slot if startup fails."""
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            if self.budget is not None:
+                self.budget.release()
+            raise
+        with self._lock:
+            self._uses[id(driver)] = 0
+        return driver
+
+    def acquire(self, timeout: Optional[float] = None) -> WebDriver:
+        """
+        Lease a driver, starting a new one if the pool is not yet full.
+
+        Args:
+            timeout: Seconds to wait for a free driver (None waits forever)
+
+        Returns:
+            WebDriver reserved for the caller until ``release`` is called
+        """
+        if self._closed:
+            raise RuntimeError("Driver pool is closed")
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+                break
+            except queue.Empty:
+                pass
+
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+            if can_create:
+                if self.budget is None or self.budget.reserve(self):
+                    driver = self._create()
+                    break
+                with self._lock:
+                    self._created -= 1
+
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise TimeoutError("No WebDriver available in pool")
+            wait = remaining
+            if self.budget is not None:
+                # Slots can also free up in the other pools sharing the budget
+                wait = BUDGET_POLL_INTERVAL if remaining is None else min(remaining, BUDGET_POLL_INTERVAL)
+            try:
+                driver = self._idle.get(timeout=wait)
+                break
+            except queue.Empty:
+                continue
+
+        with self._lock:
+            self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+        return driver
+
+    def release(self, driver: WebDriver) -> None:
+        """Return a leased driver, resetting it or recycling it if unusable."""
+        with self._lock:
+            worn_out = self._uses.get(id(driver), 0) >= self.max_uses
+        if self._closed or worn_out:
+            self.discard(driver)
+            return
+
+        try:
+            self._reset(driver)
+        except Exception as e:
+            print(f"Discarding unhealthy driver: {str(e)}")
+            self.discard(driver)
+            return
+
+        self._idle.put(driver)
+
+    def discard(self, driver: WebDriver) -> None:
+        """Quit a driver and free its slot in the pool."""
+        with self._lock:
+            self._uses.pop(id(driver), None)
+            self._created -= 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        if self.budget is not None:
+            self.budget.release()
+
+    def evict_idle(self) -> bool:
+        """Quit one idle driver to free its budget slot; False if none is idle."""
+        try:
+            driver = self._idle.get_nowait()
+        except queue.Empty:
+            return False
+        self.discard(driver)
+        return True
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None) -> Iterator[WebDriver]:
+        """Context manager that acquires a driver and always returns it."""
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    @staticmethod
+    def _reset(driver: WebDriver) -> None:
+        """Clear tabs, storage, cookies and navigation state between leases."""
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        # Storage is per origin, so clear it before leaving the current page
+        try:
+            driver.execute_script(
+                "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+            )
+        except Exception:
+            pass
+
+        driver.get("about:blank")
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+
+    def close(self) -> None:
+        """Quit all idle drivers; leased drivers are quit when released."""
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self.discard(driver)
+
+    def __enter__(self) -> "DriverPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -0,0 +1,103 @@
+import math
+from typing import List, NamedTuple, Sequence, Tuple
+
+import pandas as pd
+
+from utils.place_index import place_key
+
+# Assumed urban population density (people per km²) for sizing a city's extent
+URBAN_DENSITY = 10000
+
+# People per initial tile; denser cities start with more, smaller tiles
+PEOPLE_PER_TILE = 500000
+
+# Bounds of the city extent and of subdivision
+MIN_CITY_KM = 8.0
+MAX_CITY_KM = 80.0
+MIN_TILE_KM = 0.75
+MAX_DEPTH = 3
+
+# Map viewport height in pixels (the feed panel covers part of the width)
+VIEWPORT_PIXELS = 1080
+
+
+class Tile(NamedTuple):
+    """Square map area of ``span_km`` around a centre; ``depth`` counts subdivisions."""
+
+    lat: float
+    lng: float
+    span_km: float
+    depth: int = 0
+
+    def zoom(self) -> int:
+        """Google Maps zoom level whose viewport just covers the tile."""
+        meters_per_pixel = self.span_km * 1000 / VIEWPORT_PIXELS
+        zoom = math.log2(156543.03 * math.cos(math.radians(self.lat)) / meters_per_pixel)
+        return min(max(math.floor(zoom), 10), 18)
+
+    def viewport(self) -> Tuple[float, float, float]:
+        """(lat, lng, zoom) for GoogleMapsScraper.scrape()."""
+        return (self.lat, self.lng, self.zoom())
+
+    def can_subdivide(self) -> bool:
+        return self.depth < MAX_DEPTH and self.span_km / 2 >= MIN_TILE_KM
+
+    def subdivide(self) -> List["Tile"]:
+        """Split the tile into its four quadrants."""
+        return grid(self.lat, self.lng, self.span_km, 2, self.depth + 1)
+
+
+def _offset(lat: float, north_km: float, east_km: float) -> Tuple[float, float]:
+    """Degrees of latitude and longitude for a small offset in km."""
+    return north_km / 110.574, east_km / (111.320 * math.cos(math.radians(lat)))
+
+
+def grid(lat: float, lng: float, extent_km: float, cells: int, depth: int = 0) -> List[Tile]:
+    """Split a square of ``extent_km`` around (lat, lng) into ``cells`` x ``cells`` tiles."""
+    span_km = extent_km / cells
+    tiles = []
+    for row in range(cells):
+        for column in range(cells):
+            north_km = (row + 0.5) * span_km - extent_km / 2
+            east_km = (column + 0.5) * span_km - extent_km / 2
+            d_lat, d_lng = _offset(lat, north_km, east_km)
+            tiles.append(Tile(round(lat + d_lat, 5), round(lng + d_lng, 5), span_km, depth))
+    return tiles
+
+
+def city_tiles(lat: float, lng: float, population: float) -> List[Tile]:
+    """
+    Initial tiles covering a city, using its population as a density hint.
+
+    The city is treated as a square of area population / URBAN_DENSITY,
+    split into about population / PEOPLE_PER_TILE tiles.
+
+    Args:
+        lat: City centre latitude
+        lng: City centre longitude
+        population: City population (NaN or 0 gives a single small city tile)
+
+    Returns:
+        Tiles in row-major order, south-west first
+    """
+    population = population if population and not math.isnan(population) else 0
+    extent_km = min(max(math.sqrt(population / URBAN_DENSITY), MIN_CITY_KM), MAX_CITY_KM)
+    cells = max(1, math.ceil(math.sqrt(population / PEOPLE_PER_TILE)))
+    # Never start below the subdivision limit
+    cells = min(cells, max(1, int(extent_km // MIN_TILE_KM)))
+    return grid(lat, lng, extent_km, cells)
+
+
+def merge_tiles(frames: Sequence[pd.DataFrame], name_column: str = "Name", address_column: str = "Full Address") -> pd.DataFrame:
+    """
+    Combine tile results, keeping one row per place.
+
+    Neighbouring and nested tiles overlap, so the same place is usually
+    found more than once; rows are deduplicated on place_key() of name and address.
+    """
+    frames = [frame for frame in frames if frame is not None and not frame.empty]
+    if not frames:
+        return pd.DataFrame()
+    df = pd.concat(frames, ignore_index=True)
+    keys = [place_key(str(name), str(address)) for name, address in zip(df[name_column], df[address_column])]
+    return df[~pd.Series(keys, index=df.index).duplicated()].reset_index(drop=True)
@@ -0,0 +1,89 @@
+import re
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.rate_limiter import get_rate_limiter
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+# Markers of bot challenges served with a 200 status
+CHALLENGE_PATTERN = re.compile(r"captcha|access denied|are you a robot|unusual traffic", re.IGNORECASE)
+
+
+class FetchBlocked(Exception):
+    """Raised when a site refuses or challenges a lightweight HTTP fetch."""
+
+
+class HttpFetcher:
+    """Pooled HTTP client for pages whose listings are server-rendered."""
+
+    def __init__(self, pool_size: int = 10, timeout: float = 15):
+        """
+        Initialize HTTP fetcher.
+
+        Args:
+            pool_size: Keep-alive connections kept per host
+            timeout: Seconds to wait for a response
+        """
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, url: str) -> str:
+        """
+        Fetch a page through the shared rate limiter.
+
+        Args:
+            url: Page URL
+
+        Returns:
+            Response body as text
+
+        Raises:
+            FetchBlocked: If the site rejects the request or serves a challenge page
+        """
+        get_rate_limiter().acquire(url)
+        response = self.session.get(url, timeout=self.timeout)
+
+        if response.status_code in (401, 403, 429):
+            raise FetchBlocked(f"{url} returned HTTP {response.status_code}")
+        response.raise_for_status()
+
+        # Real listing pages are large; short pages mentioning a captcha are challenges
+        if len(response.text) < 20000 and CHALLENGE_PATTERN.search(response.text):
+            raise FetchBlocked(f"{url} served a bot challenge")
+        return response.text
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.session.close()
+
+
+_http_fetcher: Optional[HttpFetcher] = None
+
+
+def get_http_fetcher() -> HttpFetcher:
+    """Return the process-wide fetcher so connections are reused across scrapers."""
+    global _http_fetcher
+    if _http_fetcher is None:
+        _http_fetcher = HttpFetcher()
+    return _http_fetcher
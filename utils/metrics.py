@@ -0,0 +1,258 @@
+import heapq
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+# Upper bounds (seconds) of the stage duration histogram buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+# Labels such as the city being scraped, attached to every span recorded inside
+_context_labels: ContextVar[Optional[Dict[str, str]]] = ContextVar("metrics_labels", default=None)
+
+
+class Histogram:
+    """Fixed-bucket histogram of durations, mergeable across processes."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        # One count per bucket plus an overflow bucket
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one duration."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket it falls in."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def state(self) -> Dict:
+        """Picklable raw state for merging in another process."""
+        return {"counts": list(self.counts), "count": self.count, "sum": self.sum, "max": self.max}
+
+    def merge(self, state: Dict) -> None:
+        """Add the raw state of a histogram with the same buckets."""
+        self.counts = [a + b for a, b in zip(self.counts, state["counts"])]
+        self.count += state["count"]
+        self.sum += state["sum"]
+        self.max = max(self.max, state["max"])
+
+    def as_dict(self) -> Dict:
+        """Summary and cumulative buckets for the JSON report."""
+        cumulative, buckets = 0, {}
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        buckets["+Inf"] = self.count
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 4),
+            "mean": round(self.sum / self.count, 4) if self.count else 0.0,
+            "p50": round(self.quantile(0.5), 4),
+            "p90": round(self.quantile(0.9), 4),
+            "p99": round(self.quantile(0.99), 4),
+            "max": round(self.max, 4),
+            "buckets": buckets,
+        }
+
+
+class StageMetrics:
+    """Timing spans for scraper stages, aggregated per source and stage.
+
+    Every span is recorded into a histogram keyed by (source, stage), into
+    per-city stage totals when a 'city' label is set, and into a short list
+    of the slowest spans with all of their labels (e.g. the place name).
+    Spans may nest (a 'sleep' inside a 'scroll'), so stage totals overlap.
+    Worker processes drain their state and the parent merges it, so one
+    report covers a whole parallel run.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, slowest: int = 20):
+        """
+        Create an empty metrics registry.
+
+        Args:
+            buckets: Histogram bucket upper bounds in seconds
+            slowest: Number of slowest individual spans to keep
+        """
+        self.buckets = tuple(buckets)
+        self.max_slowest = slowest
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.histograms: Dict[Tuple[str, str], Histogram] = {}
+        self.city_totals: Dict[str, Dict[str, float]] = {}
+        # Min-heap of (seconds, source, stage, sorted label items)
+        self.slowest: List[Tuple[float, str, str, Tuple[Tuple[str, str], ...]]] = []
+        self.started_at = time.time()
+
+    def observe(self, stage: str, seconds: float, source: str = "", **labels) -> None:
+        """
+        Record a stage duration.
+
+        Args:
+            stage: Stage name, e.g. 'search', 'scroll', 'details'
+            seconds: Duration of the stage
+            source: Scraper the stage belongs to ('' for the batch runner)
+            **labels: Extra labels, merged over the active context labels
+        """
+        labels = {**(_context_labels.get() or {}), **labels}
+        with self._lock:
+            key = (source, stage)
+            if key not in self.histograms:
+                self.histograms[key] = Histogram(self.buckets)
+            self.histograms[key].observe(seconds)
+
+            city = labels.get("city")
+            if city:
+                totals = self.city_totals.setdefault(city, {})
+                totals[stage] = totals.get(stage, 0.0) + seconds
+
+            entry = (seconds, source, stage, tuple(sorted(labels.items())))
+            if len(self.slowest) < self.max_slowest:
+                heapq.heappush(self.slowest, entry)
+            elif seconds > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, entry)
+
+    @contextmanager
+    def span(self, stage: str, source: str = "", **labels) -> Iterator[None]:
+        """Time the enclosed block as one span of ``stage``, also when it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started, source, **labels)
+
+    def drain(self) -> Dict:
+        """Return the picklable state recorded so far and start empty."""
+        with self._lock:
+            state = {
+                "histograms": {key: histogram.state() for key, histogram in self.histograms.items()},
+                "city_totals": self.city_totals,
+                "slowest": self.slowest,
+            }
+            self._reset()
+        return state
+
+    def merge(self, state: Dict) -> None:
+        """Merge state drained from another registry, e.g. a worker process."""
+        with self._lock:
+            for key, histogram_state in state["histograms"].items():
+                if key not in self.histograms:
+                    self.histograms[key] = Histogram(self.buckets)
+                self.histograms[key].merge(histogram_state)
+            for city, totals in state["city_totals"].items():
+                merged = self.city_totals.setdefault(city, {})
+                for stage, seconds in totals.items():
+                    merged[stage] = merged.get(stage, 0.0) + seconds
+            for entry in state["slowest"]:
+                if len(self.slowest) < self.max_slowest:
+                    heapq.heappush(self.slowest, entry)
+                elif entry[0] > self.slowest[0][0]:
+                    heapq.heapreplace(self.slowest, entry)
+
+    def report(self) -> Dict:
+        """Build the JSON report: histograms per source and stage, city totals, slowest spans."""
+        with self._lock:
+            stages: Dict[str, Dict] = {}
+            for (source, stage), histogram in sorted(self.histograms.items()):
+                stages.setdefault(source or "batch", {})[stage] = histogram.as_dict()
+            return {
+                "started_at": self.started_at,
+                "finished_at": time.time(),
+                "stages": stages,
+                "cities": {
+                    city: {stage: round(seconds, 4) for stage, seconds in sorted(totals.items())}
+                    for city, totals in sorted(self.city_totals.items())
+                },
+                "slowest": [
+                    {"seconds": round(seconds, 4), "source": source or "batch", "stage": stage, **dict(labels)}
+                    for seconds, source, stage, labels in sorted(self.slowest, key=lambda entry: -entry[0])
+                ],
+            }
+
+    def to_prometheus(self, prefix: str = "scraper") -> str:
+        """Render the stage histograms in the Prometheus text exposition format."""
+        name = f"{prefix}_stage_duration_seconds"
+        lines = [
+            f"# HELP {name} Time spent in each scraper stage.",
+            f"# TYPE {name} histogram",
+        ]
+        with self._lock:
+            for (source, stage), histogram in sorted(self.histograms.items()):
+                labels = f'source="{_escape(source or "batch")}",stage="{_escape(stage)}"'
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f"{name}_sum{{{labels}}} {histogram.sum:.6f}")
+                lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path: Union[str, Path]) -> Path:
+        """Write the JSON report to ``path``."""
+        path = Path(path)
+        path.write_text(json.dumps(self.report(), indent=2))
+        return path
+
+    def write_prometheus(self, path: Union[str, Path], prefix: str = "scraper") -> Path:
+        """Write the histograms as a Prometheus textfile (e.g. for node_exporter's collector)."""
+        path = Path(path)
+        partial_path = path.with_name(path.name + ".part")
+        partial_path.write_text(self.to_prometheus(prefix))
+        partial_path.replace(path)
+        return path
+
+
+def _escape(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+@contextmanager
+def metric_labels(**labels) -> Iterator[None]:
+    """Attach labels (e.g. city=...) to every span recorded inside the block."""
+    token = _context_labels.set({**(_context_labels.get() or {}), **labels})
+    try:
+        yield
+    finally:
+        _context_labels.reset(token)
+
+
+# Process-wide registry used by scrapers
+_metrics: Optional[StageMetrics] = None
+
+
+def get_metrics() -> StageMetrics:
+    """Return the process-wide metrics registry."""
+    global _metrics
+    if _metrics is None:
+        _metrics = StageMetrics()
+    return _metrics
+
+
+def set_metrics(metrics: StageMetrics) -> None:
+    """Replace the process-wide metrics registry."""
+    global _metrics
+    _metrics = metrics
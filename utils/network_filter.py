@@ -0,0 +1,147 @@
+import json
+from fnmatch import fnmatch
+from typing import Dict, Iterable, List, Optional
+
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.remote.webdriver import WebDriver
+
+# Resources none of the scrapers need to read DOM text
+DEFAULT_BLOCKED_PATTERNS = [
+    # Images
+    "*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*", "*.avif*",
+    # Fonts
+    "*.woff*", "*.ttf*", "*.otf*", "*.eot*",
+    # Audio and video
+    "*.mp4*", "*.webm*", "*.m3u8*", "*.mp3*",
+    # Third-party analytics and ads
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*facebook.net*", "*connect.facebook.com*",
+    "*hotjar.com*", "*clarity.ms*", "*branch.io*",
+]
+
+
+class BlockingProfile:
+    """Network filtering profile applied to a Chrome driver at creation.
+
+    Requests matching a deny pattern are blocked through CDP
+    ``Network.setBlockedURLs``. Allow patterns exempt resources a scraper
+    depends on from the shared deny list, including single URLs covered by
+    a broader deny pattern: they are sent as non-blocking ``urlPatterns``,
+    which Chrome checks before the deny wildcards. Allow patterns therefore
+    use the URLPattern syntax and must be absolute, e.g.
+    ``https://maps.gstatic.com/*``. Chrome versions whose DevTools protocol
+    predates ``urlPatterns`` ignore them and block by the deny list alone.
+    """
+
+    def __init__(
+        self,
+        deny: Optional[Iterable[str]] = None,
+        allow: Optional[Iterable[str]] = None,
+        block_images: bool = True,
+        track_stats: bool = True
+    ):
+        """
+        Initialize blocking profile.
+
+        Args:
+            deny: URL wildcard patterns to block (defaults to DEFAULT_BLOCKED_PATTERNS)
+            allow: Absolute URLPattern strings that must never be blocked
+            block_images: Also disable image loading through Chrome preferences
+            track_stats: Record network events so blocked requests can be counted
+
+        Raises:
+            ValueError: If an allow pattern is not absolute
+        """
+        self.deny = list(DEFAULT_BLOCKED_PATTERNS if deny is None else deny)
+        self.allow = list(allow or [])
+        for pattern in self.allow:
+            if "://" not in pattern:
+                raise ValueError(f"Allow pattern '{pattern}' must be absolute, e.g. 'https://{pattern.strip('*')}*'")
+        self.block_images = block_images
+        self.track_stats = track_stats
+
+    def extend(self, deny: Iterable[str] = (), allow: Iterable[str] = ()) -> "BlockingProfile":
+        """Return a copy of this profile with extra deny and allow patterns."""
+        return BlockingProfile(
+            deny=self.deny + list(deny),
+            allow=self.allow + list(allow),
+            block_images=self.block_images,
+            track_stats=self.track_stats
+        )
+
+    @property
+    def blocked_patterns(self) -> List[str]:
+        """Deny patterns left after removing those covered by an allow pattern."""
+        return [
+            pattern for pattern in self.deny
+            if not any(pattern == allowed or fnmatch(pattern, allowed) for allowed in self.allow)
+        ]
+
+    def allows(self, url: str) -> bool:
+        """Whether ``url`` matches an allow pattern (URLPattern wildcards approximated by fnmatch)."""
+        return any(fnmatch(url, allowed) for allowed in self.allow)
+
+    def blocks(self, url: str) -> bool:
+        """Whether a request for ``url`` is blocked: it matches a deny pattern and no allow pattern."""
+        return any(fnmatch(url, pattern) for pattern in self.blocked_patterns) and not self.allows(url)
+
+    def configure_options(self, options: Options) -> None:
+        """Add the Chrome options this profile needs before the driver starts."""
+        if self.block_images:
+            options.add_experimental_option("prefs", {
+                "profile.managed_default_content_settings.images": 2
+            })
+        if self.track_stats:
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+    def apply(self, driver: WebDriver) -> None:
+        """Install the URL block list on a freshly created driver."""
+        driver.execute_cdp_cmd("Network.enable", {})
+        params = {"urls": self.blocked_patterns}
+        if self.allow:
+            # Checked in order before the deny wildcards; a non-blocking match lets the request through
+            params["urlPatterns"] = [{"urlPattern": pattern, "block": False} for pattern in self.allow]
+        driver.execute_cdp_cmd("Network.setBlockedURLs", params)
+
+
+class NetworkStats:
+    """Counts requests, blocked requests and downloaded bytes from Chrome's performance log."""
+
+    def __init__(self):
+        """Initialize empty counters."""
+        self.requests = 0
+        self.blocked_requests = 0
+        self.bytes_downloaded = 0
+
+    def collect(self, driver: WebDriver) -> None:
+        """Drain the driver's performance log into the counters."""
+        try:
+            entries = driver.get_log("performance")
+        except Exception:
+            # Driver was created without performance logging
+            return
+
+        for entry in entries:
+            message = json.loads(entry["message"])["message"]
+            method = message.get("method")
+            params = message.get("params", {})
+            if method == "Network.loadingFinished":
+                self.requests += 1
+                self.bytes_downloaded += int(params.get("encodedDataLength", 0))
+            elif method == "Network.loadingFailed" and params.get("blockedReason"):
+                self.requests += 1
+                self.blocked_requests += 1
+
+    def as_dict(self) -> Dict[str, int]:
+        """Return counters as a plain dictionary."""
+        return {
+            "requests": self.requests,
+            "blocked_requests": self.blocked_requests,
+            "bytes_downloaded": self.bytes_downloaded
+        }
+
+    def __str__(self) -> str:
+        return (
+            f"{self.requests} requests, {self.blocked_requests} blocked, "
+            f"{self.bytes_downloaded / 1024:.0f} KB downloaded"
+        )
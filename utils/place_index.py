@@ -0,0 +1,157 @@
+import json
+import re
+import sqlite3
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Union
+
+
+def normalize(text: Optional[str]) -> str:
+    """Lowercase, strip accents and punctuation, and collapse whitespace."""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+def place_key(name: str, location: Optional[str] = None) -> str:
+    """
+    Identity of a place across runs: normalized name plus a location fragment.
+
+    Only the first few words of the location are used, so a short card
+    snippet ('12, MG Road') and a longer one still map to the same key.
+    """
+    fragment = " ".join(normalize(location).split()[:4])
+    return f"{normalize(name)}|{fragment}"
+
+
+class PlaceIndex:
+    """Persistent SQLite index of places already scraped, shared across runs.
+
+    Each entry stores the place's last scraped record under a key built from
+    its normalized name and location fragment. Entries fetched within
+    ``max_age_days`` are fresh and let scrapers skip the detail fetch;
+    older ones are re-fetched and refreshed. The database uses WAL mode so
+    several worker processes can share one file. WAL relies on shared
+    memory between the processes, so an index on a network filesystem
+    (NFS, SMB) must be opened with ``wal=False``.
+    """
+
+    def __init__(self, path: Union[str, Path] = "place_index.sqlite", max_age_days: float = 7, wal: bool = True):
+        """
+        Open (or create) a place index.
+
+        Args:
+            path: SQLite database file
+            max_age_days: Age after which an entry is stale and re-fetched
+            wal: Use WAL mode; pass False for a file shared by several
+                machines, which then serialize on the file's locks
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_age_days = max_age_days
+
+        self._conn = sqlite3.connect(self.path, timeout=30)
+        self._conn.execute(f"PRAGMA journal_mode={'WAL' if wal else 'DELETE'}")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS places (
+                source TEXT NOT NULL,
+                key TEXT NOT NULL,
+                record TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                seen_at REAL NOT NULL,
+                PRIMARY KEY (source, key)
+            )
+            """
+        )
+        # Places last listed for each scope (query or city), for detecting removals
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS scope_places (
+                source TEXT NOT NULL,
+                scope TEXT NOT NULL,
+                key TEXT NOT NULL,
+                PRIMARY KEY (source, scope, key)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, source: str, key: str) -> Optional[Dict]:
+        """Return the stored entry with 'record', 'fetched_at' and 'seen_at', fresh or not."""
+        row = self._conn.execute(
+            "SELECT record, fetched_at, seen_at FROM places WHERE source = ? AND key = ?",
+            (source, key)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"record": json.loads(row[0]), "fetched_at": row[1], "seen_at": row[2]}
+
+    def lookup(self, source: str, key: str, now: Optional[float] = None) -> Optional[Dict]:
+        """
+        Return the stored record if it is fresh, marking the place as seen.
+
+        Args:
+            source: Scraper name, e.g. 'google_maps'
+            key: Place key from place_key()
+            now: Current time (defaults to time.time())
+
+        Returns:
+            Stored record, or None if the place is unknown or stale
+        """
+        now = now or time.time()
+        entry = self.get(source, key)
+        if entry is None or now - entry["fetched_at"] > self.max_age_days * 86400:
+            return None
+
+        self._conn.execute(
+            "UPDATE places SET seen_at = ? WHERE source = ? AND key = ?", (now, source, key)
+        )
+        self._conn.commit()
+        return entry["record"]
+
+    def store(self, source: str, key: str, record: Dict, now: Optional[float] = None) -> None:
+        """Insert or refresh a place's record after a full fetch."""
+        now = now or time.time()
+        self._conn.execute(
+            """
+            INSERT INTO places (source, key, record, fetched_at, seen_at) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (source, key) DO UPDATE SET
+                record = excluded.record, fetched_at = excluded.fetched_at, seen_at = excluded.seen_at
+            """,
+            (source, key, json.dumps(record, default=str), now, now)
+        )
+        self._conn.commit()
+
+    def scope_keys(self, source: str, scope: str) -> Set[str]:
+        """Keys of the places listed for ``scope`` by the last scrape."""
+        rows = self._conn.execute(
+            "SELECT key FROM scope_places WHERE source = ? AND scope = ?", (source, scope)
+        )
+        return {row[0] for row in rows}
+
+    def set_scope(self, source: str, scope: str, keys: Iterable[str]) -> None:
+        """Replace the places listed for ``scope``."""
+        with self._conn:
+            self._conn.execute("DELETE FROM scope_places WHERE source = ? AND scope = ?", (source, scope))
+            self._conn.executemany(
+                "INSERT INTO scope_places (source, scope, key) VALUES (?, ?, ?)",
+                [(source, scope, key) for key in keys]
+            )
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM places").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def __enter__(self) -> "PlaceIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
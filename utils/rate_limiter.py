@@ -0,0 +1,127 @@
+import multiprocessing
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+# Requests per second and burst size allowed for each site
+DEFAULT_LIMITS: Dict[str, Tuple[float, float]] = {
+    "google.com": (2.0, 10),
+    "zomato.com": (1.0, 5),
+    "justdial.com": (0.5, 3),
+}
+
+
+class TokenBucket:
+    """Token bucket whose state lives in shared memory.
+
+    The state is a ``multiprocessing.Array`` guarded by its own lock, so one
+    bucket can be shared by threads and, when handed to worker processes at
+    start-up (e.g. through a pool initializer), by processes as well.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        """
+        Initialize token bucket.
+
+        Args:
+            rate: Tokens added per second
+            burst: Maximum number of tokens that can accumulate
+        """
+        if rate <= 0 or burst < 1:
+            raise ValueError("Rate must be positive and burst at least 1")
+        self.rate = rate
+        self.burst = burst
+        # [available tokens, monotonic time of last update]
+        self._state = multiprocessing.Array('d', [burst, time.monotonic()])
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Block until ``tokens`` are available and consume them.
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._state.get_lock():
+                now = time.monotonic()
+                available = min(
+                    self.burst,
+                    self._state[0] + (now - self._state[1]) * self.rate
+                )
+                self._state[1] = now
+                if available >= tokens:
+                    self._state[0] = available - tokens
+                    return waited
+                self._state[0] = available
+                delay = (tokens - available) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class HostRateLimiter:
+    """Rate limiter holding one token bucket per host."""
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, float]]] = None):
+        """
+        Initialize per-host rate limiter.
+
+        Args:
+            limits: Mapping of host suffix (e.g. 'google.com') to
+                (requests per second, burst); defaults to DEFAULT_LIMITS
+        """
+        limits = DEFAULT_LIMITS if limits is None else limits
+        self.buckets = {
+            host.lower(): TokenBucket(rate, burst)
+            for host, (rate, burst) in limits.items()
+        }
+
+    def _bucket_for(self, url_or_host: str) -> Optional[TokenBucket]:
+        """Find the bucket whose host suffix matches the URL or host name."""
+        host = urlparse(url_or_host).hostname if "//" in url_or_host else url_or_host
+        host = (host or "").lower()
+        for suffix, bucket in self.buckets.items():
+            if host == suffix or host.endswith("." + suffix):
+                return bucket
+        return None
+
+    def acquire(self, url_or_host: str, tokens: float = 1.0) -> float:
+        """
+        Wait for permission to hit a host; hosts without a limit pass straight through.
+
+        Args:
+            url_or_host: Full URL or bare host name
+            tokens: Cost of the request (navigation, click, scroll = 1)
+
+        Returns:
+            Seconds spent waiting
+        """
+        bucket = self._bucket_for(url_or_host)
+        return bucket.acquire(tokens) if bucket else 0.0
+
+
+def parse_limit(spec: str) -> Tuple[str, Tuple[float, float]]:
+    """Parse a 'host=rate[:burst]' command line value."""
+    host, _, value = spec.partition("=")
+    rate, _, burst = value.partition(":")
+    if not host or not rate:
+        raise ValueError(f"Invalid rate limit '{spec}', expected host=rate[:burst]")
+    rate = float(rate)
+    return host, (rate, float(burst) if burst else max(1.0, rate))
+
+
+_rate_limiter: Optional[HostRateLimiter] = None
+
+
+def get_rate_limiter() -> HostRateLimiter:
+    """Return the process-wide rate limiter, creating it with default limits."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = HostRateLimiter()
+    return _rate_limiter
+
+
+def set_rate_limiter(limiter: HostRateLimiter) -> None:
+    """Install a shared rate limiter, e.g. one inherited from a parent process."""
+    global _rate_limiter
+    _rate_limiter = limiter
@@ -0,0 +1,51 @@
+import os
+from pathlib import Path
+from typing import List, Union
+
+import pandas as pd
+
+
+class CsvResultSink:
+    """Streams result batches into one combined CSV as they complete.
+
+    Rows are appended to ``<path>.part`` under a fixed column schema with the
+    header written once, and flushed after every batch so memory stays bounded
+    by a single batch. ``finalize`` atomically renames the file into place.
+    """
+
+    def __init__(self, path: Union[str, Path], columns: List[str]):
+        """
+        Open a streaming CSV sink.
+
+        Args:
+            path: Final combined CSV path
+            columns: Column schema; extra columns are dropped, missing ones left empty
+        """
+        self.path = Path(path)
+        self.columns = list(columns)
+        self.partial_path = self.path.with_name(self.path.name + ".part")
+        self.rows = 0
+
+        self._file = open(self.partial_path, "w", newline="", encoding="utf-8")
+        pd.DataFrame(columns=self.columns).to_csv(self._file, index=False)
+        self._file.flush()
+
+    def write(self, df: pd.DataFrame) -> None:
+        """Append one batch of results and flush it to disk."""
+        if df is None or df.empty:
+            return
+        df.reindex(columns=self.columns).to_csv(self._file, header=False, index=False)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.rows += len(df)
+
+    def finalize(self) -> Path:
+        """Close the sink and atomically move the combined file into place."""
+        self._file.close()
+        os.replace(self.partial_path, self.path)
+        return self.path
+
+    def discard(self) -> None:
+        """Close the sink and remove the partial file."""
+        self._file.close()
+        self.partial_path.unlink(missing_ok=True)
@@ -0,0 +1,120 @@
+import random
+from typing import Callable, Dict, NamedTuple, Optional, Tuple, TypeVar
+
+from selenium.common.exceptions import WebDriverException
+from tenacity import RetryCallState, Retrying, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
+
+from utils.metrics import get_metrics
+
+T = TypeVar("T")
+
+
+class RetryPolicy(NamedTuple):
+    """How often an operation is attempted and how long to back off in between."""
+
+    # Total attempts, including the first
+    attempts: int
+    # Backoff before the second attempt in seconds; doubles per attempt, plus up to as much jitter
+    initial: float
+    # Longest single backoff in seconds
+    maximum: float
+
+
+# Policies per operation; 'city' paces the batch runner's deferred re-runs of failed cities,
+# and 'tile' the re-runs of a tiled city's failed tiles
+DEFAULT_POLICIES: Dict[str, RetryPolicy] = {
+    "driver_start": RetryPolicy(3, 2.0, 30.0),
+    "search": RetryPolicy(3, 1.0, 10.0),
+    "details": RetryPolicy(2, 0.5, 4.0),
+    "navigation": RetryPolicy(3, 1.0, 15.0),
+    "city": RetryPolicy(2, 30.0, 120.0),
+    "tile": RetryPolicy(2, 5.0, 60.0),
+}
+
+# Transient browser, timeout and network failures; anything else is a bug and fails at once
+RETRYABLE_ERRORS: Tuple[type, ...] = (WebDriverException, TimeoutError, ConnectionError)
+
+
+class RetryPolicies:
+    """Retry policies per operation, with exponential backoff and jitter.
+
+    Retries back off ``initial * 2**(n-1)`` seconds plus up to ``initial``
+    seconds of random jitter, capped at ``maximum``, so workers that failed
+    together do not retry in lockstep. Every backoff is recorded under the
+    'retry' stage.
+    """
+
+    def __init__(self, policies: Optional[Dict[str, RetryPolicy]] = None):
+        """
+        Initialize retry policies.
+
+        Args:
+            policies: Policies overriding DEFAULT_POLICIES by operation name
+        """
+        self.policies = dict(DEFAULT_POLICIES)
+        self.policies.update(policies or {})
+
+    def get(self, operation: str) -> RetryPolicy:
+        """Policy for ``operation``; unknown operations are attempted once."""
+        return self.policies.get(operation, RetryPolicy(1, 0.0, 0.0))
+
+    def delay(self, operation: str, attempt: int) -> float:
+        """Backoff in seconds after failed attempt number ``attempt`` (1-based)."""
+        policy = self.get(operation)
+        return min(policy.initial * 2 ** (attempt - 1) + random.uniform(0, policy.initial), policy.maximum)
+
+    def retrying(self, operation: str, source: str = "") -> Retrying:
+        """Tenacity controller retrying RETRYABLE_ERRORS under the operation's policy."""
+        policy = self.get(operation)
+
+        def before_sleep(state: RetryCallState) -> None:
+            error = state.outcome.exception()
+            # Selenium messages carry a stack trace after the first line
+            message = str(error).strip().splitlines()[0] if str(error).strip() else type(error).__name__
+            print(
+                f"Retrying {operation} in {state.next_action.sleep:.1f}s after attempt "
+                f"{state.attempt_number}/{policy.attempts} failed: {message}"
+            )
+            get_metrics().observe("retry", state.next_action.sleep, source, operation=operation)
+
+        return Retrying(
+            stop=stop_after_attempt(max(1, policy.attempts)),
+            wait=wait_exponential_jitter(initial=policy.initial, max=policy.maximum, jitter=policy.initial),
+            retry=retry_if_exception_type(RETRYABLE_ERRORS),
+            before_sleep=before_sleep,
+            reraise=True
+        )
+
+    def call(self, operation: str, function: Callable[..., T], *args, source: str = "", **kwargs) -> T:
+        """Call ``function``, retrying transient failures under the operation's policy."""
+        return self.retrying(operation, source)(function, *args, **kwargs)
+
+
+def parse_policy(spec: str) -> Tuple[str, RetryPolicy]:
+    """Parse an 'operation=attempts[:initial[:maximum]]' command line value."""
+    operation, _, value = spec.partition("=")
+    parts = value.split(":") if value else []
+    if not operation or not parts or len(parts) > 3:
+        raise ValueError(f"Invalid retry policy '{spec}', expected operation=attempts[:initial[:maximum]]")
+    default = DEFAULT_POLICIES.get(operation, RetryPolicy(1, 1.0, 10.0))
+    attempts = int(parts[0])
+    initial = float(parts[1]) if len(parts) > 1 else default.initial
+    maximum = float(parts[2]) if len(parts) > 2 else max(default.maximum, initial)
+    return operation, RetryPolicy(attempts, initial, maximum)
+
+
+_retry_policies: Optional[RetryPolicies] = None
+
+
+def get_retry_policies() -> RetryPolicies:
+    """Return the process-wide retry policies, creating the defaults."""
+    global _retry_policies
+    if _retry_policies is None:
+        _retry_policies = RetryPolicies()
+    return _retry_policies
+
+
+def set_retry_policies(policies: RetryPolicies) -> None:
+    """Install retry policies, e.g. ones configured on the command line and passed to workers."""
+    global _retry_policies
+    _retry_policies = policies
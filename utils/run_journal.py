@@ -0,0 +1,104 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+# City outcomes recorded in the journal
+DONE = "done"
+EMPTY = "empty"
+FAILED = "failed"
+
+
+class RunJournal:
+    """Append-only JSON-lines journal of per-city outcomes for a batch run.
+
+    Every finished city is appended and fsynced immediately, so a crashed
+    run can be resumed from the same file: the latest entry per city wins.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open (or create) a run journal.
+
+        Args:
+            path: Journal file; existing entries are loaded for resuming
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.entries: Dict[str, Dict] = {}
+        # When the run began; kept across resumes so its outputs stay together
+        self.started_at = time.strftime("%Y-%m-%d %H:%M:%S")
+
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A torn last line from a crash is ignored
+                        continue
+                    if not self.entries:
+                        self.started_at = entry.get("started_at", entry["recorded_at"])
+                    self.entries[entry["city"]] = entry
+
+    def record(
+        self,
+        city: str,
+        status: str,
+        output_file: Optional[Union[str, Path]] = None,
+        rows: int = 0,
+        error: Optional[str] = None
+    ) -> None:
+        """
+        Durably record a city's outcome.
+
+        Args:
+            city: City name from the input file
+            status: DONE, EMPTY or FAILED
+            output_file: Per-city results file for DONE cities
+            rows: Number of result rows written
+            error: Error message for FAILED cities
+        """
+        entry = {
+            "city": city,
+            "status": status,
+            "output_file": str(output_file) if output_file else None,
+            "rows": rows,
+            "error": error,
+            "recorded_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "started_at": self.started_at
+        }
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.entries[city] = entry
+
+    @property
+    def run_date(self) -> str:
+        """Date the run began as YYYY-MM-DD, also when it is resumed on a later day."""
+        return self.started_at[:10]
+
+    def is_complete(self, city: str) -> bool:
+        """Whether a city finished with results whose file still exists."""
+        entry = self.entries.get(city)
+        return bool(
+            entry and entry["status"] == DONE
+            and entry["output_file"] and Path(entry["output_file"]).exists()
+        )
+
+    def completed_files(self) -> List[Path]:
+        """Per-city output files of every completed city, in journal order."""
+        return [
+            Path(entry["output_file"])
+            for city, entry in self.entries.items()
+            if self.is_complete(city)
+        ]
+
+    def unfinished_cities(self) -> List[str]:
+        """Cities whose latest outcome was empty or failed."""
+        return [city for city, entry in self.entries.items() if entry["status"] != DONE]
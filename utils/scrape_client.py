@@ -0,0 +1,111 @@
+from typing import Any, Dict, Optional
+
+import pandas as pd
+import requests
+
+from utils.cleaning import COLUMN_CLEANERS, clean_results
+from utils.scrape_jobs import DONE, FAILED, JobRejected
+
+
+def _frame(df: pd.DataFrame, scraper: str) -> pd.DataFrame:
+    """Restore the cleaned dtypes lost in JSON transport."""
+    if df.empty or scraper not in COLUMN_CLEANERS:
+        return df
+    return clean_results(df, scraper)
+
+
+class RemoteJob:
+    """Snapshot of a job running in the scrape service, shaped like ScrapeJob."""
+
+    def __init__(self, state: Dict[str, Any]):
+        """
+        Wrap a job state returned by the service.
+
+        Args:
+            state: ScrapeJob.to_dict() output
+        """
+        self.id = state["id"]
+        self.scraper = state["scraper"]
+        self.query = state["query"]
+        self.params = state["params"]
+        self.status = state["status"]
+        self.cached = state["cached"]
+        self.progress = state["progress"]
+        self.total = state["total"]
+        self.error = state["error"]
+        self._elapsed = state["elapsed"]
+        self._listings = state.get("listings") or []
+        self.result: Optional[pd.DataFrame] = None
+        if "result" in state:
+            result = state["result"]
+            self.result = _frame(pd.DataFrame(result["data"], columns=result["columns"]), self.scraper)
+
+    @property
+    def done(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    def partial(self) -> pd.DataFrame:
+        """Listings collected so far, cleaned like the final result."""
+        return _frame(pd.DataFrame(self._listings), self.scraper)
+
+    def elapsed(self) -> float:
+        """Seconds since submission, as of this snapshot."""
+        return self._elapsed
+
+
+class ScrapeServiceClient:
+    """Submits scrapes to a running scrape service and polls their jobs.
+
+    Has the ``submit``/``get`` interface of ScrapeJobManager, so the
+    webapp can use either.
+    """
+
+    def __init__(self, url: str, timeout: float = 10):
+        """
+        Initialize client.
+
+        Args:
+            url: Base URL of the service, e.g. 'http://127.0.0.1:8765'
+            timeout: Seconds to wait for each request
+        """
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def submit(self, scraper: str, query: str, total: Optional[int] = None, **params) -> RemoteJob:
+        """
+        Submit a scrape; identical running or cached scrapes are shared by the service.
+
+        Raises:
+            JobRejected: If the service queue is full
+            ValueError: If the service does not know the scraper
+        """
+        response = self.session.post(
+            f"{self.url}/jobs",
+            json={"scraper": scraper, "query": query, "total": total, "params": params},
+            timeout=self.timeout
+        )
+        if response.status_code == 429:
+            raise JobRejected(response.json()["error"])
+        if response.status_code == 400:
+            raise ValueError(response.json()["error"])
+        response.raise_for_status()
+        return RemoteJob(response.json())
+
+    def get(self, job_id: Optional[str]) -> Optional[RemoteJob]:
+        """Return the current state of a job with its partial listings, or None if unknown."""
+        if not job_id:
+            return None
+        response = self.session.get(
+            f"{self.url}/jobs/{job_id}", params={"partial": 1}, timeout=self.timeout
+        )
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return RemoteJob(response.json())
+
+    def stats(self) -> Dict[str, int]:
+        """Running, queued and cached scrape counts of the service."""
+        response = self.session.get(f"{self.url}/health", timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
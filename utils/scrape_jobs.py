@@ -0,0 +1,246 @@
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+from cachetools import TTLCache
+
+from utils.cleaning import COLUMN_CLEANERS, clean_results
+
+# Job states
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Runs one scrape: (query, params, report) -> results, calling report(listing) as listings arrive
+Runner = Callable[[str, Dict, Callable[[Dict], None]], pd.DataFrame]
+
+
+class JobRejected(Exception):
+    """Raised when the job queue is full and a new scrape cannot be admitted."""
+
+
+def job_key(scraper: str, query: str, params: Optional[Dict] = None) -> Tuple:
+    """Cache key of a scrape: scraper, normalized query and sorted parameters."""
+    return (scraper, " ".join(query.lower().split()), tuple(sorted((params or {}).items())))
+
+
+class ScrapeJob:
+    """One background scrape with its progress, partial listings and result."""
+
+    def __init__(self, scraper: str, query: str, params: Dict, total: Optional[int] = None):
+        """
+        Create a pending job.
+
+        Args:
+            scraper: Scraper name, also the cleaning source, e.g. 'google_maps'
+            query: Search query or city
+            params: Scraper parameters, e.g. the number of pages
+            total: Expected number of listings, if known, for progress bars
+        """
+        self.id = uuid.uuid4().hex
+        self.scraper = scraper
+        self.query = query
+        self.params = dict(params)
+        self.key = job_key(scraper, query, params)
+        self.total = total
+        self.status = PENDING
+        self.cached = False
+        self.result: Optional[pd.DataFrame] = None
+        self.error: Optional[str] = None
+        self.submitted_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._listings: List[Dict] = []
+        self._lock = threading.Lock()
+
+    @property
+    def done(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    @property
+    def progress(self) -> int:
+        """Number of listings collected so far."""
+        return len(self._listings)
+
+    def report(self, listing: Dict) -> None:
+        """Record a listing as soon as the scraper extracted it."""
+        with self._lock:
+            self._listings.append(dict(listing))
+
+    def partial(self) -> pd.DataFrame:
+        """Listings collected so far, cleaned like the final result."""
+        with self._lock:
+            df = pd.DataFrame(self._listings)
+        if df.empty or self.scraper not in COLUMN_CLEANERS:
+            return df
+        return clean_results(df, self.scraper)
+
+    def elapsed(self) -> float:
+        """Seconds since submission, or the job's total duration once finished."""
+        return (self.finished_at or time.time()) - self.submitted_at
+
+    def to_dict(self, partial: bool = False) -> Dict[str, Any]:
+        """
+        JSON-serializable view of the job, e.g. for the scrape service.
+
+        Args:
+            partial: Include the raw listings collected so far under 'listings'
+
+        Returns:
+            Job state, with the result (in pandas 'split' orientation) once done
+        """
+        state = {
+            "id": self.id,
+            "scraper": self.scraper,
+            "query": self.query,
+            "params": self.params,
+            "status": self.status,
+            "cached": self.cached,
+            "progress": self.progress,
+            "total": self.total,
+            "error": self.error,
+            "elapsed": round(self.elapsed(), 1),
+        }
+        if partial:
+            with self._lock:
+                state["listings"] = list(self._listings)
+        if self.status == DONE and self.result is not None:
+            state["result"] = json.loads(self.result.to_json(orient="split", index=False))
+        return state
+
+
+class ScrapeJobManager:
+    """Runs scrapes on background threads and caches finished results.
+
+    Meant to be shared by every session of the webapp: at most
+    ``max_workers`` scrapes (browsers) run at once, further jobs queue.
+    Successful results are cached by (scraper, query, parameters) for
+    ``ttl`` seconds, so repeated queries return at once, and a query
+    that is already running is joined instead of scraped twice. With
+    ``max_pending`` set, new scrapes are rejected once that many are
+    waiting for a worker.
+    """
+
+    def __init__(
+        self,
+        runners: Dict[str, Runner],
+        max_workers: int = 2,
+        ttl: float = 3600,
+        cache_size: int = 128,
+        max_pending: Optional[int] = None
+    ):
+        """
+        Initialize the job manager.
+
+        Args:
+            runners: Scrape function per scraper name
+            max_workers: Maximum number of concurrent scrapes
+            ttl: Seconds a finished result stays cached
+            cache_size: Maximum number of cached results
+            max_pending: Maximum number of queued scrapes (None for no limit)
+        """
+        self.runners = runners
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scrape-job")
+        self._cache: TTLCache = TTLCache(maxsize=cache_size, ttl=ttl)
+        self._jobs: Dict[str, ScrapeJob] = {}
+        self._active: Dict[Tuple, ScrapeJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, scraper: str, query: str, total: Optional[int] = None, **params) -> ScrapeJob:
+        """
+        Start a scrape, or return a cached or already running one.
+
+        Args:
+            scraper: Key in ``runners``
+            query: Search query or city
+            total: Expected number of listings, if known
+            **params: Scraper parameters; part of the cache key
+
+        Returns:
+            The job; ``job.cached`` is set if the result came from the cache
+
+        Raises:
+            JobRejected: If the queue already holds ``max_pending`` scrapes
+        """
+        if scraper not in self.runners:
+            raise ValueError(f"Unknown scraper '{scraper}', expected one of {list(self.runners)}")
+
+        key = job_key(scraper, query, params)
+        with self._lock:
+            self._prune()
+            if key in self._active:
+                return self._active[key]
+
+            job = ScrapeJob(scraper, query, params, total)
+            self._jobs[job.id] = job
+            cached = self._cache.get(key)
+            if cached is not None:
+                job.result = cached
+                job.status = DONE
+                job.cached = True
+                job.finished_at = job.submitted_at
+                return job
+
+            if self.max_pending is not None and len(self._active) >= self.max_workers + self.max_pending:
+                del self._jobs[job.id]
+                raise JobRejected(f"{len(self._active)} scrapes are already running or queued")
+            self._active[key] = job
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: Optional[str]) -> Optional[ScrapeJob]:
+        """Return a job by id, or None if it is unknown or expired."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def invalidate(self, scraper: str, query: str, **params) -> None:
+        """Drop a cached result so the next submit scrapes again."""
+        with self._lock:
+            self._cache.pop(job_key(scraper, query, params), None)
+
+    def stats(self) -> Dict[str, int]:
+        """Numbers of running, queued and cached scrapes."""
+        with self._lock:
+            running = sum(1 for job in self._active.values() if job.status == RUNNING)
+            return {
+                "running": running,
+                "queued": len(self._active) - running,
+                "cached": len(self._cache),
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+            }
+
+    def _run(self, job: ScrapeJob) -> None:
+        """Run a job on a worker thread and cache its result."""
+        job.status = RUNNING
+        try:
+            result = self.runners[job.scraper](job.query, job.params, job.report)
+            job.result = result if result is not None else pd.DataFrame()
+            job.status = DONE
+        except Exception as e:
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                self._active.pop(job.key, None)
+                # Empty results are usually a block or a typo, so they are not cached
+                if job.status == DONE and not job.result.empty:
+                    self._cache[job.key] = job.result
+
+    def _prune(self) -> None:
+        """Forget finished jobs older than the cache TTL."""
+        cutoff = time.time() - self.ttl
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.done and job.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    def shutdown(self) -> None:
+        """Stop accepting jobs and wait for running scrapes to finish."""
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,141 @@
+import math
+import time
+from collections import deque
+from typing import Callable, NamedTuple
+
+
+class FeedState(NamedTuple):
+    """What an infinite-scroll feed currently shows."""
+
+    # Number of items rendered so far (or any measure that grows as items load)
+    count: int
+    # The page shows an end-of-list marker
+    end: bool = False
+
+
+class ScrollController:
+    """Adaptive scroll pacing for infinite-scroll feeds.
+
+    Each round scrolls once and polls the feed until new items appear, the
+    page shows an end-of-list marker, or the round times out. The timeout
+    follows the observed item latency (a multiple of its recent p90), backs
+    off while rounds stay empty, and the number of empty rounds tolerated
+    before giving up grows with the slowest load seen. Fast feeds are
+    therefore read without fixed sleeps, and slow ones are not abandoned
+    after a guessed number of attempts.
+    """
+
+    def __init__(
+        self,
+        initial_timeout: float = 3.0,
+        min_timeout: float = 0.5,
+        max_timeout: float = 10.0,
+        safety: float = 2.0,
+        backoff: float = 1.5,
+        min_idle_rounds: int = 2,
+        max_idle_rounds: int = 5,
+        poll_interval: float = 0.1,
+        window: int = 20
+    ):
+        """
+        Initialize controller for one feed.
+
+        Args:
+            initial_timeout: Round timeout before any latency was observed
+            min_timeout: Lower bound of the round timeout
+            max_timeout: Upper bound of the round timeout
+            safety: Round timeout as a multiple of the recent p90 latency
+            backoff: Timeout growth factor per consecutive empty round
+            min_idle_rounds: Fewest consecutive empty rounds before giving up
+            max_idle_rounds: Most consecutive empty rounds before giving up
+            poll_interval: Seconds between feed checks within a round
+            window: Number of recent latencies the timeout is based on
+        """
+        self.initial_timeout = initial_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.safety = safety
+        self.backoff = backoff
+        self.min_idle_rounds = min_idle_rounds
+        self.max_idle_rounds = max_idle_rounds
+        self.poll_interval = poll_interval
+        self.latencies = deque(maxlen=window)
+        self.slowest = 0.0
+        self.idle_rounds = 0
+        self.rounds = 0
+        self.end_reached = False
+
+    def _base_timeout(self) -> float:
+        if not self.latencies:
+            return self.initial_timeout
+        ordered = sorted(self.latencies)
+        p90 = ordered[min(len(ordered) - 1, int(0.9 * len(ordered)))]
+        return min(max(self.safety * p90, self.min_timeout), self.max_timeout)
+
+    def timeout(self) -> float:
+        """Seconds to wait for new items in the next round."""
+        return min(self._base_timeout() * self.backoff ** self.idle_rounds, self.max_timeout)
+
+    def idle_limit(self) -> int:
+        """Consecutive empty rounds tolerated, enough to outlast the slowest load seen."""
+        needed = math.ceil(self.slowest / self._base_timeout()) + 1 if self.latencies else self.min_idle_rounds
+        return min(max(needed, self.min_idle_rounds), self.max_idle_rounds)
+
+    @property
+    def done(self) -> bool:
+        """Whether the feed is exhausted: an end marker was seen or rounds stayed empty."""
+        return self.end_reached or self.idle_rounds >= self.idle_limit()
+
+    def record(self, before: FeedState, after: FeedState, waited: float) -> None:
+        """
+        Account for one round, for callers that poll the feed themselves.
+
+        Args:
+            before: Feed state before scrolling
+            after: Feed state when the round ended
+            waited: Seconds from scrolling to the end of the round
+        """
+        self.rounds += 1
+        if after.count > before.count:
+            self.latencies.append(waited)
+            self.slowest = max(self.slowest, waited)
+            self.idle_rounds = 0
+        else:
+            self.idle_rounds += 1
+        self.end_reached = self.end_reached or after.end
+
+    def fail(self) -> None:
+        """Count a round that could not run, e.g. because the page errored, as empty."""
+        self.rounds += 1
+        self.idle_rounds += 1
+
+    def finished(self, before: FeedState, state: FeedState, started: float) -> bool:
+        """Whether a round that started at ``started`` (time.monotonic()) can stop polling."""
+        return state.count > before.count or state.end or time.monotonic() - started >= self.timeout()
+
+    def advance(
+        self,
+        scroll: Callable[[], None],
+        probe: Callable[[], FeedState],
+        sleep: Callable[[float], None] = time.sleep
+    ) -> FeedState:
+        """
+        Run one round: scroll, then poll until new items, the end marker or the timeout.
+
+        Args:
+            scroll: Scrolls the feed once
+            probe: Returns the current FeedState
+            sleep: Sleep function used between polls
+
+        Returns:
+            Feed state at the end of the round
+        """
+        before = probe()
+        scroll()
+        started = time.monotonic()
+        state = probe()
+        while not self.finished(before, state, started):
+            sleep(self.poll_interval)
+            state = probe()
+        self.record(before, state, time.monotonic() - started)
+        return state
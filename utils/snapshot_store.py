@@ -0,0 +1,115 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+
+class SnapshotStore:
+    """Content-addressed, gzip-compressed store of scraped HTML.
+
+    HTML blobs are stored once under ``objects/`` by their SHA-256 digest.
+    Each scrape (a scraper name plus a key such as the query or city) has a
+    JSON-lines manifest listing the snapshots it recorded in order, which is
+    what replay mode walks. Objects and manifests not written or reused
+    within ``ttl_days`` are evicted.
+    """
+
+    def __init__(self, root: Union[str, Path] = ".snapshots", ttl_days: float = 30):
+        """
+        Open a snapshot store.
+
+        Args:
+            root: Store directory
+            ttl_days: Age after which unused snapshots are evicted
+        """
+        self.root = Path(root)
+        self.ttl_days = ttl_days
+        (self.root / "objects").mkdir(parents=True, exist_ok=True)
+        (self.root / "manifests").mkdir(parents=True, exist_ok=True)
+
+    def _object_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / f"{digest}.html.gz"
+
+    def _manifest_path(self, scraper: str, key: str) -> Path:
+        slug = re.sub(r"[^\w-]+", "_", key.lower()).strip("_")[:60]
+        suffix = hashlib.sha1(key.encode("utf-8")).hexdigest()[:8]
+        return self.root / "manifests" / scraper / f"{slug}-{suffix}.jsonl"
+
+    def put(self, html: str) -> str:
+        """Store HTML (deduplicated by content) and return its digest."""
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+
+        if path.exists():
+            # Refresh the TTL of content seen again
+            os.utime(path)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            partial_path = path.with_name(path.name + ".part")
+            with gzip.open(partial_path, "wb", compresslevel=6) as f:
+                f.write(data)
+            os.replace(partial_path, path)
+        return digest
+
+    def get(self, digest: str) -> str:
+        """Load stored HTML by digest."""
+        with gzip.open(self._object_path(digest), "rb") as f:
+            return f.read().decode("utf-8")
+
+    def start(self, scraper: str, key: str) -> None:
+        """Begin recording a scrape, replacing any earlier manifest for it."""
+        path = self._manifest_path(scraper, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("", encoding="utf-8")
+
+    def record(self, scraper: str, key: str, kind: str, html: str, **meta) -> str:
+        """
+        Store a snapshot and append it to the scrape's manifest.
+
+        Args:
+            scraper: Scraper name, e.g. 'google_maps'
+            key: Scrape identifier, e.g. the query or city
+            kind: Snapshot type the scraper's replay understands ('card', 'page'...)
+            html: HTML to store
+            **meta: Extra JSON-serialisable fields needed for replay
+
+        Returns:
+            Digest of the stored HTML
+        """
+        digest = self.put(html)
+        entry = {"kind": kind, "digest": digest, "recorded_at": time.time(), **meta}
+        with open(self._manifest_path(scraper, key), "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        return digest
+
+    def entries(self, scraper: str, key: str) -> List[Dict]:
+        """Manifest entries of a recorded scrape, in recording order."""
+        path = self._manifest_path(scraper, key)
+        if not path.exists():
+            return []
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def has(self, scraper: str, key: str) -> bool:
+        """Whether a scrape has been recorded."""
+        return bool(self.entries(scraper, key))
+
+    def evict(self, now: Optional[float] = None) -> int:
+        """
+        Remove objects and manifests older than the TTL.
+
+        Returns:
+            Number of files removed
+        """
+        cutoff = (now or time.time()) - self.ttl_days * 86400
+        removed = 0
+        for path in list(self.root.glob("objects/*/*.html.gz")) + list(self.root.glob("manifests/*/*.jsonl")):
+            if path.stat().st_mtime < cutoff:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
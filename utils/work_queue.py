@@ -0,0 +1,462 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Union
+
+try:
+    import fcntl
+except ImportError:
+    # Windows has no POSIX locks; only the file backend needs them
+    fcntl = None
+
+# Work item states
+QUEUED = "queued"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+
+class WorkItem(NamedTuple):
+    """A leased unit of work.
+
+    ``attempt`` fences the lease: once an expired lease is handed to another
+    worker, heartbeats and completions carrying the old attempt are refused.
+    """
+
+    key: str
+    payload: Dict
+    attempt: int
+    worker: str
+
+
+class WorkQueue(ABC):
+    """Shared queue of keyed work items leased by workers on any node.
+
+    Workers lease one item at a time for ``visibility_timeout`` seconds and
+    extend the lease with heartbeats while working on it. An item whose
+    lease runs out (its worker crashed or lost the shared storage) becomes
+    visible to other workers again, until it has used ``max_attempts``.
+    Lease deadlines use each node's wall clock, so node clocks must agree
+    to well within the visibility timeout.
+    """
+
+    @abstractmethod
+    def publish(self, payloads: Dict[str, Dict], max_attempts: int = 3) -> int:
+        """
+        Add work items; existing keys are kept, except failed ones which are queued again.
+
+        Args:
+            payloads: JSON-serializable payload by item key
+            max_attempts: Leases an item may use before it is marked failed
+
+        Returns:
+            Number of items queued
+        """
+
+    @abstractmethod
+    def lease(self, worker: str, visibility_timeout: float) -> Optional[WorkItem]:
+        """Lease the oldest available item for ``worker``, or return None if there is none."""
+
+    @abstractmethod
+    def heartbeat(self, item: WorkItem, visibility_timeout: float) -> bool:
+        """Extend a lease; False if the lease was lost to another worker."""
+
+    @abstractmethod
+    def complete(self, item: WorkItem, result: Dict) -> bool:
+        """Mark a leased item done with its JSON-serializable result; False if the lease was lost."""
+
+    @abstractmethod
+    def fail(self, item: WorkItem, error: str, delay: float = 0.0) -> bool:
+        """
+        Give up a lease after an error.
+
+        The item is queued again, visible after ``delay`` seconds, or marked
+        failed once it used all its attempts.
+
+        Returns:
+            False if the lease was lost to another worker
+        """
+
+    @abstractmethod
+    def items(self) -> List[Dict]:
+        """All items with their key, payload, status, attempts, result and error."""
+
+    def counts(self) -> Dict[str, int]:
+        """Number of items in each state."""
+        counts = {QUEUED: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        for item in self.items():
+            counts[item["status"]] += 1
+        return counts
+
+    def pending(self) -> int:
+        """Items still queued or leased."""
+        counts = self.counts()
+        return counts[QUEUED] + counts[LEASED]
+
+    def close(self) -> None:
+        """Release the backend's resources."""
+
+    def __enter__(self) -> "WorkQueue":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class SqliteWorkQueue(WorkQueue):
+    """Work queue in one SQLite file.
+
+    Leases are taken in ``BEGIN IMMEDIATE`` transactions, so concurrent
+    workers never lease the same item. The rollback journal is used rather
+    than WAL, which needs shared memory and does not work on network file
+    systems.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open (or create) a queue.
+
+        Args:
+            path: SQLite database file on storage shared by all nodes
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Transactions are managed explicitly so leases can take the write lock up front
+        self._conn = sqlite3.connect(self.path, timeout=60, isolation_level=None, check_same_thread=False)
+        # Lease heartbeats run on their own thread and share the connection
+        self._lock = threading.Lock()
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS work_items (
+                key TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                worker TEXT,
+                attempt INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL,
+                available_at REAL NOT NULL,
+                lease_expires REAL,
+                result TEXT,
+                error TEXT,
+                seq INTEGER NOT NULL
+            )
+            """
+        )
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def publish(self, payloads: Dict[str, Dict], max_attempts: int = 3) -> int:
+        now = time.time()
+        queued = 0
+        with self._transaction() as conn:
+            seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM work_items").fetchone()[0]
+            for key, payload in payloads.items():
+                row = conn.execute("SELECT status FROM work_items WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    seq += 1
+                    conn.execute(
+                        "INSERT INTO work_items (key, payload, status, max_attempts, available_at, seq) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (key, json.dumps(payload), QUEUED, max_attempts, now, seq)
+                    )
+                elif row[0] == FAILED:
+                    conn.execute(
+                        "UPDATE work_items SET status = ?, attempt = 0, max_attempts = ?, available_at = ?, "
+                        "worker = NULL, lease_expires = NULL, error = NULL WHERE key = ?",
+                        (QUEUED, max_attempts, now, key)
+                    )
+                else:
+                    continue
+                queued += 1
+        return queued
+
+    def lease(self, worker: str, visibility_timeout: float) -> Optional[WorkItem]:
+        now = time.time()
+        with self._transaction() as conn:
+            # Expired leases that used every attempt will not be retried
+            conn.execute(
+                "UPDATE work_items SET status = ?, error = 'Lease expired' "
+                "WHERE status = ? AND lease_expires <= ? AND attempt >= max_attempts",
+                (FAILED, LEASED, now)
+            )
+            row = conn.execute(
+                "SELECT key, payload, attempt FROM work_items "
+                "WHERE (status = ? AND available_at <= ?) OR (status = ? AND lease_expires <= ?) "
+                "ORDER BY seq LIMIT 1",
+                (QUEUED, now, LEASED, now)
+            ).fetchone()
+            if row is None:
+                return None
+            key, payload, attempt = row
+            conn.execute(
+                "UPDATE work_items SET status = ?, worker = ?, attempt = ?, lease_expires = ? WHERE key = ?",
+                (LEASED, worker, attempt + 1, now + visibility_timeout, key)
+            )
+        return WorkItem(key, json.loads(payload), attempt + 1, worker)
+
+    def _update_lease(self, item: WorkItem, assignments: str, values: tuple) -> bool:
+        """Apply an update if ``item`` still holds its lease."""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                f"UPDATE work_items SET {assignments} WHERE key = ? AND status = ? AND worker = ? AND attempt = ?",
+                values + (item.key, LEASED, item.worker, item.attempt)
+            )
+        return cursor.rowcount == 1
+
+    def heartbeat(self, item: WorkItem, visibility_timeout: float) -> bool:
+        return self._update_lease(item, "lease_expires = ?", (time.time() + visibility_timeout,))
+
+    def complete(self, item: WorkItem, result: Dict) -> bool:
+        return self._update_lease(
+            item, "status = ?, result = ?, error = NULL, lease_expires = NULL", (DONE, json.dumps(result))
+        )
+
+    def fail(self, item: WorkItem, error: str, delay: float = 0.0) -> bool:
+        return self._update_lease(
+            item,
+            "status = CASE WHEN attempt >= max_attempts THEN ? ELSE ? END, "
+            "error = ?, available_at = ?, lease_expires = NULL",
+            (FAILED, QUEUED, error, time.time() + delay)
+        )
+
+    def items(self) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, payload, status, attempt, result, error FROM work_items ORDER BY seq"
+            ).fetchall()
+        return [
+            {
+                "key": key,
+                "payload": json.loads(payload),
+                "status": status,
+                "attempts": attempt,
+                "result": json.loads(result) if result else None,
+                "error": error,
+            }
+            for key, payload, status, attempt, result, error in rows
+        ]
+
+    def counts(self) -> Dict[str, int]:
+        counts = {QUEUED: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        with self._lock:
+            counts.update(self._conn.execute("SELECT status, COUNT(*) FROM work_items GROUP BY status").fetchall())
+        return counts
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class FileWorkQueue(WorkQueue):
+    """Work queue in one JSON file guarded by a lock file.
+
+    Every operation takes an exclusive POSIX lock on ``<path>.lock``
+    (``lockf``, which NFS also honours), reads the whole queue, and
+    atomically replaces the file when it changed. Simple and dependency
+    free, but each operation rewrites the file, so it suits queues of up
+    to a few thousand items.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open (or create) a queue.
+
+        Args:
+            path: JSON queue file on storage shared by all nodes
+
+        Raises:
+            RuntimeError: On platforms without POSIX file locks, e.g. Windows
+        """
+        if fcntl is None:
+            raise RuntimeError("The 'file' queue backend needs POSIX file locks (fcntl); use the 'sqlite' backend here")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        # POSIX locks are held per process, so threads of one process also need a lock
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _locked(self, write: bool = True) -> Iterator[Dict[str, Dict]]:
+        """Yield the items by key under the lock; changes are saved when ``write`` is set."""
+        with self._lock, open(self.lock_path, "a") as lock:
+            fcntl.lockf(lock, fcntl.LOCK_EX)
+            try:
+                items: Dict[str, Dict] = {}
+                if self.path.exists():
+                    with open(self.path, encoding="utf-8") as f:
+                        items = json.load(f)
+                yield items
+                if write:
+                    partial_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+                    with open(partial_path, "w", encoding="utf-8") as f:
+                        json.dump(items, f)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(partial_path, self.path)
+            finally:
+                fcntl.lockf(lock, fcntl.LOCK_UN)
+
+    def publish(self, payloads: Dict[str, Dict], max_attempts: int = 3) -> int:
+        now = time.time()
+        queued = 0
+        with self._locked() as items:
+            for key, payload in payloads.items():
+                item = items.get(key)
+                if item is not None and item["status"] != FAILED:
+                    continue
+                items[key] = {
+                    "payload": payload,
+                    "status": QUEUED,
+                    "worker": None,
+                    "attempt": 0,
+                    "max_attempts": max_attempts,
+                    "available_at": now,
+                    "lease_expires": None,
+                    "result": None,
+                    "error": None,
+                }
+                queued += 1
+        return queued
+
+    def lease(self, worker: str, visibility_timeout: float) -> Optional[WorkItem]:
+        now = time.time()
+        with self._locked() as items:
+            # Dicts keep insertion order, so the oldest available item comes first
+            for key, item in items.items():
+                expired = item["status"] == LEASED and item["lease_expires"] <= now
+                if expired and item["attempt"] >= item["max_attempts"]:
+                    item.update(status=FAILED, error="Lease expired")
+                elif expired or (item["status"] == QUEUED and item["available_at"] <= now):
+                    item.update(
+                        status=LEASED, worker=worker, attempt=item["attempt"] + 1,
+                        lease_expires=now + visibility_timeout
+                    )
+                    return WorkItem(key, item["payload"], item["attempt"], worker)
+        return None
+
+    @contextmanager
+    def _leased(self, item: WorkItem) -> Iterator[Optional[Dict]]:
+        """Yield the stored item if ``item`` still holds its lease, else None."""
+        with self._locked() as items:
+            stored = items.get(item.key)
+            owned = (
+                stored is not None and stored["status"] == LEASED
+                and stored["worker"] == item.worker and stored["attempt"] == item.attempt
+            )
+            yield stored if owned else None
+
+    def heartbeat(self, item: WorkItem, visibility_timeout: float) -> bool:
+        with self._leased(item) as stored:
+            if stored is not None:
+                stored["lease_expires"] = time.time() + visibility_timeout
+        return stored is not None
+
+    def complete(self, item: WorkItem, result: Dict) -> bool:
+        with self._leased(item) as stored:
+            if stored is not None:
+                stored.update(status=DONE, result=result, error=None, lease_expires=None)
+        return stored is not None
+
+    def fail(self, item: WorkItem, error: str, delay: float = 0.0) -> bool:
+        with self._leased(item) as stored:
+            if stored is not None:
+                stored.update(
+                    status=FAILED if stored["attempt"] >= stored["max_attempts"] else QUEUED,
+                    error=error, available_at=time.time() + delay, lease_expires=None
+                )
+        return stored is not None
+
+    def items(self) -> List[Dict]:
+        with self._locked(write=False) as items:
+            return [
+                {
+                    "key": key,
+                    "payload": item["payload"],
+                    "status": item["status"],
+                    "attempts": item["attempt"],
+                    "result": item["result"],
+                    "error": item["error"],
+                }
+                for key, item in items.items()
+            ]
+
+
+# Queue backends by name
+QUEUE_BACKENDS = {
+    "sqlite": SqliteWorkQueue,
+    "file": FileWorkQueue,
+}
+
+
+def open_queue(path: Union[str, Path], backend: Optional[str] = None) -> WorkQueue:
+    """
+    Open a work queue.
+
+    Args:
+        path: Queue file on shared storage
+        backend: 'sqlite' or 'file'; by default '.json' files use the file
+            backend and anything else SQLite
+    """
+    if backend is None:
+        backend = "file" if Path(path).suffix == ".json" else "sqlite"
+    if backend not in QUEUE_BACKENDS:
+        raise ValueError(f"Unknown queue backend '{backend}', expected one of {', '.join(QUEUE_BACKENDS)}")
+    return QUEUE_BACKENDS[backend](path)
+
+
+class LeaseKeeper:
+    """Heartbeats a lease from a background thread while its item is worked on.
+
+    Use as a context manager around the work; ``lost`` turns true if a
+    heartbeat finds the lease taken over, and the result should then be
+    dropped.
+    """
+
+    def __init__(self, queue: WorkQueue, item: WorkItem, visibility_timeout: float):
+        """
+        Initialize keeper.
+
+        Args:
+            queue: Queue the item was leased from
+            item: Leased item
+            visibility_timeout: Lease extension per heartbeat; heartbeats
+                are sent every third of it
+        """
+        self.queue = queue
+        self.item = item
+        self.visibility_timeout = visibility_timeout
+        self.lost = False
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.visibility_timeout / 3):
+            try:
+                if not self.queue.heartbeat(self.item, self.visibility_timeout):
+                    self.lost = True
+                    return
+            except Exception as e:
+                # Shared storage hiccups are retried on the next beat; the lease may still hold
+                print(f"Heartbeat for {self.item.key} failed: {str(e)}")
+
+    def __enter__(self) -> "LeaseKeeper":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stopped.set()
+        self._thread.join()
@@ -1,12 +1,71 @@
+import os
 import streamlit as st
 import pandas as pd
 from io import BytesIO
-from scrapers.justdial_scraper import JustDialScraper
-from scrapers.google_maps_scraper import GoogleMapsScraper
-from scrapers.zomato_scraper import ZomatoBakeryScraper
+from typing import Callable, Optional, Union
+from scrape_service import build_runners
+from utils.arrow_output import to_parquet_bytes
+from utils.scrape_client import ScrapeServiceClient
+from utils.scrape_jobs import FAILED, JobRejected, ScrapeJobManager
 
-def download_results(df: pd.DataFrame, filename: str) -> None:
-    """Create a download button for DataFrame results."""
+# Scrape service to submit jobs to (see scrape_service.py); without it scrapes run in this process
+SCRAPE_SERVICE_URL = os.environ.get("SCRAPE_SERVICE_URL")
+
+# Scrapes running at once across all sessions, and how long results are reused
+MAX_CONCURRENT_SCRAPES = 2
+RESULT_TTL = 3600
+
+@st.cache_resource
+def get_job_manager() -> Union[ScrapeServiceClient, ScrapeJobManager]:
+    """Job manager shared by every session of the app."""
+    if SCRAPE_SERVICE_URL:
+        return ScrapeServiceClient(SCRAPE_SERVICE_URL)
+    return ScrapeJobManager(build_runners(), max_workers=MAX_CONCURRENT_SCRAPES, ttl=RESULT_TTL)
+
+@st.fragment(run_every=1.0)
+def show_progress(job_id: str) -> None:
+    """Refresh a running job's progress and partial results every second."""
+    job = get_job_manager().get(job_id)
+    if job is None or job.done:
+        # Rerun the whole page to show the final results with their filters
+        st.rerun()
+
+    if job.total:
+        st.progress(min(job.progress / job.total, 1.0), text=f"Scraped {job.progress} of {job.total}")
+    else:
+        st.write(f"Scraping data... {job.progress} listings so far ({job.elapsed():.0f}s)")
+
+    partial = job.partial()
+    if not partial.empty:
+        st.dataframe(partial)
+
+def show_job(state_key: str, render: Callable[[pd.DataFrame], None], empty_message: str) -> None:
+    """Show the session's job for a scraper: live progress while running, results once done."""
+    job = get_job_manager().get(st.session_state.get(state_key))
+    if job is None:
+        return
+    if not job.done:
+        show_progress(job.id)
+    elif job.status == FAILED:
+        st.error(f"An error occurred: {job.error}")
+    elif job.result is None or job.result.empty:
+        st.warning(empty_message)
+    else:
+        if job.cached:
+            st.caption("Showing cached results of an identical earlier scrape.")
+        render(job.result)
+
+def submit_job(state_key: str, scraper: str, query: str, total: Optional[int] = None, **params) -> None:
+    """Start a background scrape and remember it in the session."""
+    try:
+        st.session_state[state_key] = get_job_manager().submit(scraper, query, total=total, **params).id
+    except JobRejected as e:
+        st.warning(f"{str(e)}. Please try again in a few minutes.")
+    except Exception as e:
+        st.error(f"An error occurred: {str(e)}")
+
+def download_results(df: pd.DataFrame, filename: str, source: str) -> None:
+    """Create CSV and typed Parquet download buttons for DataFrame results."""
     csv_buffer = BytesIO()
     df.to_csv(csv_buffer, index=False)
     csv_buffer.seek(0)
@@ -16,6 +75,12 @@ def download_results(df: pd.DataFrame, filename: str) -> None:
         filename,
         "text/csv"
     )
+    st.download_button(
+        "Download Parquet",
+        to_parquet_bytes(df, source),
+        filename.rsplit(".", 1)[0] + ".parquet",
+        "application/vnd.apache.parquet"
+    )
 
 st.title("Web Scraper")
 st.write("Choose a platform and enter search details")
@@ -32,22 +97,17 @@ if scraper_option == "Justdial":
 
     if st.button("Scrape Data"):
         if query:
-            with st.spinner("Scraping data..."):
-                try:
-                    scraper = JustDialScraper()
-                    df = scraper.scrape(query, num_pages)
-                    
-                    if df is not None and not df.empty:
-                        st.success("Scraping completed successfully!")
-                        st.dataframe(df)
-                        download_results(df, "justdial_results.csv")
-                    else:
-                        st.warning("No data found.")
-                except Exception as e:
-                    st.error(f"An error occurred: {str(e)}")
+            submit_job("justdial_job", "justdial", query, num_pages=int(num_pages))
         else:
             st.warning("Please enter a search query.")
 
+    def render_justdial(df: pd.DataFrame) -> None:
+        st.success("Scraping completed successfully!")
+        st.dataframe(df)
+        download_results(df, "justdial_results.csv", "justdial")
+
+    show_job("justdial_job", render_justdial, "No data found.")
+
 elif scraper_option == "Google Maps":
     st.info("Note: Google Maps typically returns a maximum of 100-115 results per query.")
     
@@ -74,42 +134,39 @@ elif scraper_option == "Google Maps":
 
     if st.button("Scrape Data"):
         if query:
-            with st.spinner("Scraping data... This may take a while for all results"):
-                try:
-                    scraper = GoogleMapsScraper()
-                    # Pass None as num_results to get all available data
-                    df = scraper.scrape(query, num_results) if num_results else scraper.scrape(query)
-                    
-                    if df is not None and not df.empty:
-                        st.success("Scraping completed successfully!")
-
-                        # Filter by minimum rating
-                        if min_rating > 0:
-                            filtered_df = df[df['Rating'] >= min_rating]
-                            
-                            # Show filtered results info
-                            st.write(
-                                f"Showing {len(filtered_df)} results with rating ≥ "
-                                f"{min_rating} (out of {len(df)} total)"
-                            )
-                            
-                            # Display filtered results
-                            st.dataframe(filtered_df)
-                            download_results(
-                                filtered_df,
-                                "google_maps_filtered_results.csv"
-                            )
-                        else:
-                            # Show all results if no minimum rating
-                            st.dataframe(df)
-                            download_results(df, "google_maps_results.csv")
-                    else:
-                        st.warning("No data found.")
-                except Exception as e:
-                    st.error(f"An error occurred: {str(e)}")
+            limit = int(num_results) if num_results else None
+            submit_job("google_maps_job", "google_maps", query, total=limit, num_results=limit)
         else:
             st.warning("Please enter a search query.")
 
+    # Filtering re-uses the finished job's results, so moving the slider is instant
+    def render_google_maps(df: pd.DataFrame) -> None:
+        st.success("Scraping completed successfully!")
+
+        # Filter by minimum rating
+        if min_rating > 0:
+            filtered_df = df[df['Rating'] >= min_rating]
+
+            # Show filtered results info
+            st.write(
+                f"Showing {len(filtered_df)} results with rating ≥ "
+                f"{min_rating} (out of {len(df)} total)"
+            )
+
+            # Display filtered results
+            st.dataframe(filtered_df)
+            download_results(
+                filtered_df,
+                "google_maps_filtered_results.csv",
+                "google_maps"
+            )
+        else:
+            # Show all results if no minimum rating
+            st.dataframe(df)
+            download_results(df, "google_maps_results.csv", "google_maps")
+
+    show_job("google_maps_job", render_google_maps, "No data found.")
+
 elif scraper_option == "Zomato Bakeries":
     city = st.text_input("Enter city name:", "")
     
@@ -138,32 +195,30 @@ elif scraper_option == "Zomato Bakeries":
 
     if st.button("Scrape Zomato Bakeries"):
         if city:
-            with st.spinner("Scraping Zomato Bakeries..."):
-                try:
-                    scraper = ZomatoBakeryScraper(city)
-                    df = scraper.scrape()
-
-                    if df is not None and not df.empty:
-                        # Filter by selected price categories
-                        filtered_df = df[df['Price Category'].isin(price_categories)]
-
-                        st.success(f"Scraped {len(df)} bakeries in {city}!")
-                        
-                        # Show filtered results info
-                        st.write(
-                            f"Showing {len(filtered_df)} results in selected price "
-                            f"categories (out of {len(df)} total)"
-                        )
-
-                        # Display filtered results
-                        st.dataframe(filtered_df)
-                        download_results(
-                            filtered_df,
-                            f"{city}_zomato_bakeries.csv"
-                        )
-                    else:
-                        st.warning("No bakeries found.")
-                except Exception as e:
-                    st.error(f"An error occurred: {str(e)}")
+            submit_job("zomato_job", "zomato", city)
         else:
-            st.warning("Please enter a city name.")
\ No newline at end of file
+            st.warning("Please enter a city name.")
+
+    def render_zomato(df: pd.DataFrame) -> None:
+        job_city = get_job_manager().get(st.session_state["zomato_job"]).query
+
+        # Filter by selected price categories
+        filtered_df = df[df['Price Category'].isin(price_categories)]
+
+        st.success(f"Scraped {len(df)} bakeries in {job_city}!")
+
+        # Show filtered results info
+        st.write(
+            f"Showing {len(filtered_df)} results in selected price "
+            f"categories (out of {len(df)} total)"
+        )
+
+        # Display filtered results
+        st.dataframe(filtered_df)
+        download_results(
+            filtered_df,
+            f"{job_city}_zomato_bakeries.csv",
+            "zomato"
+        )
+
+    show_job("zomato_job", render_zomato, "No bakeries found.")
\ No newline at end of file